@@ -5,7 +5,12 @@ from sqlalchemy import pool
 
 from alembic import context
 from infrastructure.database.base import Base
-from infrastructure.database.models import UserModel, TaskModel
+from infrastructure.database.models import (
+    UserModel,
+    TaskModel,
+    RevokedTokenModel,
+    UserTaskCountersModel,
+)
 from infrastructure.config.database import database_config
 
 # this is the Alembic Config object, which provides
@@ -0,0 +1,31 @@
+"""Add token_version to users
+
+Revision ID: 3b1f9c2d4e5a
+Revises: 7cf674d6c533
+Create Date: 2026-10-16 09:12:41.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b1f9c2d4e5a'
+down_revision: Union[str, Sequence[str], None] = '7cf674d6c533'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'users',
+        sa.Column('token_version', sa.Integer(), server_default='0', nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'token_version')
@@ -0,0 +1,39 @@
+"""Add revoked_tokens table
+
+Revision ID: 5d8e2a7c9b14
+Revises: 3b1f9c2d4e5a
+Create Date: 2026-10-16 10:03:27.114902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d8e2a7c9b14'
+down_revision: Union[str, Sequence[str], None] = '3b1f9c2d4e5a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('revoked_tokens',
+    sa.Column('jti', sa.String(length=64), nullable=False),
+    sa.Column('user_id', sa.UUID(as_uuid=False), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('revoked_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('jti')
+    )
+    op.create_index('ix_revoked_tokens_expires_at', 'revoked_tokens', ['expires_at'], unique=False)
+    op.create_index('ix_revoked_tokens_revoked_at', 'revoked_tokens', ['revoked_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_revoked_tokens_revoked_at', table_name='revoked_tokens')
+    op.drop_index('ix_revoked_tokens_expires_at', table_name='revoked_tokens')
+    op.drop_table('revoked_tokens')
@@ -0,0 +1,42 @@
+"""Add covering index for credential lookups by email
+
+Revision ID: 8a4c6e1f2b73
+Revises: 5d8e2a7c9b14
+Create Date: 2026-10-16 11:24:05.337816
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8a4c6e1f2b73'
+down_revision: Union[str, Sequence[str], None] = '5d8e2a7c9b14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_users_email_credentials',
+        'users',
+        ['email'],
+        unique=False,
+        postgresql_include=[
+            'id',
+            'username',
+            'hashed_password',
+            'is_active',
+            'token_version',
+            'created_at',
+            'updated_at',
+        ],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_email_credentials', table_name='users')
@@ -0,0 +1,51 @@
+"""Add full-text search vector to tasks
+
+Revision ID: a9d4e2b7c315
+Revises: f5a3c8e6d217
+Create Date: 2026-10-16 16:21:37.540918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9d4e2b7c315'
+down_revision: Union[str, Sequence[str], None] = 'f5a3c8e6d217'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A stored generated column keeps the vector in step with title and
+    # description on every write, including COPY; adding it rewrites the table
+    op.add_column(
+        'tasks',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+                "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        'ix_tasks_search_vector',
+        'tasks',
+        ['search_vector'],
+        unique=False,
+        postgresql_using='gin',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_search_vector', table_name='tasks')
+    op.drop_column('tasks', 'search_vector')
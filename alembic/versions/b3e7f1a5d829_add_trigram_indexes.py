@@ -0,0 +1,55 @@
+"""Add trigram indexes for substring matching
+
+Revision ID: b3e7f1a5d829
+Revises: a9d4e2b7c315
+Create Date: 2026-10-16 17:02:11.804365
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3e7f1a5d829'
+down_revision: Union[str, Sequence[str], None] = 'a9d4e2b7c315'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index(
+        'ix_tasks_title_trgm',
+        'tasks',
+        ['title'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'title': 'gin_trgm_ops'},
+    )
+    op.create_index(
+        'ix_users_email_trgm',
+        'users',
+        ['email'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'email': 'gin_trgm_ops'},
+    )
+    op.create_index(
+        'ix_users_username_trgm',
+        'users',
+        ['username'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'username': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # The extension is left installed; other objects may have come to use it
+    op.drop_index('ix_users_username_trgm', table_name='users')
+    op.drop_index('ix_users_email_trgm', table_name='users')
+    op.drop_index('ix_tasks_title_trgm', table_name='tasks')
@@ -0,0 +1,53 @@
+"""Add task keyset pagination indexes
+
+Revision ID: c7d2f4a9e813
+Revises: 8a4c6e1f2b73
+Create Date: 2026-10-16 13:02:47.905113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7d2f4a9e813'
+down_revision: Union[str, Sequence[str], None] = '8a4c6e1f2b73'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_tasks_user_created_id',
+        'tasks',
+        ['user_id', sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False,
+    )
+    op.create_index(
+        'ix_tasks_user_pending_created_id',
+        'tasks',
+        ['user_id', sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False,
+        postgresql_where=sa.text('completed IS false'),
+    )
+    op.create_index(
+        'ix_tasks_user_completed_sort_id',
+        'tasks',
+        [
+            'user_id',
+            sa.text('coalesce(updated_at, created_at) DESC'),
+            sa.text('id DESC'),
+        ],
+        unique=False,
+        postgresql_where=sa.text('completed IS true'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_user_completed_sort_id', table_name='tasks')
+    op.drop_index('ix_tasks_user_pending_created_id', table_name='tasks')
+    op.drop_index('ix_tasks_user_created_id', table_name='tasks')
@@ -0,0 +1,41 @@
+"""Add keyset indexes for sorting tasks by update time and title
+
+Revision ID: d6c2a8f4e951
+Revises: b3e7f1a5d829
+Create Date: 2026-10-16 18:10:46.271593
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd6c2a8f4e951'
+down_revision: Union[str, Sequence[str], None] = 'b3e7f1a5d829'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_tasks_user_modified_id',
+        'tasks',
+        [
+            'user_id',
+            sa.text('coalesce(updated_at, created_at) DESC'),
+            sa.text('id DESC'),
+        ],
+        unique=False,
+    )
+    op.create_index(
+        'ix_tasks_user_title_id', 'tasks', ['user_id', 'title', 'id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_user_title_id', table_name='tasks')
+    op.drop_index('ix_tasks_user_modified_id', table_name='tasks')
@@ -0,0 +1,119 @@
+"""Add user task counters
+
+Revision ID: e41b7d9c2a56
+Revises: c7d2f4a9e813
+Create Date: 2026-10-16 14:21:08.316472
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e41b7d9c2a56'
+down_revision: Union[str, Sequence[str], None] = 'c7d2f4a9e813'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COUNTERS_FUNCTION = """
+CREATE OR REPLACE FUNCTION apply_user_task_counters() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO user_task_counters AS c (user_id, total, completed)
+        SELECT user_id, count(*), count(*) FILTER (WHERE completed)
+        FROM new_rows GROUP BY user_id ORDER BY user_id
+        ON CONFLICT (user_id) DO UPDATE
+        SET total = c.total + EXCLUDED.total,
+            completed = c.completed + EXCLUDED.completed;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE user_task_counters AS c
+        SET total = c.total - d.total, completed = c.completed - d.completed
+        FROM (
+            SELECT user_id, count(*) AS total,
+                   count(*) FILTER (WHERE completed) AS completed
+            FROM old_rows GROUP BY user_id
+        ) AS d
+        WHERE c.user_id = d.user_id;
+    ELSE
+        -- Deltas can be negative, so they must not be proposed as new rows:
+        -- CHECK constraints apply to those before ON CONFLICT is resolved
+        UPDATE user_task_counters AS c
+        SET total = c.total + d.total, completed = c.completed + d.completed
+        FROM (
+            SELECT user_id, sum(total) AS total, sum(completed) AS completed
+            FROM (
+                SELECT user_id, 1 AS total, completed::int AS completed
+                FROM new_rows
+                UNION ALL
+                SELECT user_id, -1, -completed::int FROM old_rows
+            ) AS changes
+            GROUP BY user_id
+            HAVING sum(total) <> 0 OR sum(completed) <> 0
+        ) AS d
+        WHERE c.user_id = d.user_id;
+        -- Owners without a counters row yet start from their actual counts
+        INSERT INTO user_task_counters (user_id, total, completed)
+        SELECT t.user_id, count(*), count(*) FILTER (WHERE t.completed)
+        FROM tasks AS t
+        WHERE t.user_id IN (SELECT user_id FROM new_rows)
+          AND NOT EXISTS (
+              SELECT 1 FROM user_task_counters AS c WHERE c.user_id = t.user_id
+          )
+        GROUP BY t.user_id
+        ORDER BY t.user_id
+        ON CONFLICT (user_id) DO NOTHING;
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+
+TRIGGERS = {
+    'INSERT': 'REFERENCING NEW TABLE AS new_rows',
+    'UPDATE': 'REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows',
+    'DELETE': 'REFERENCING OLD TABLE AS old_rows',
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'user_task_counters',
+        sa.Column('user_id', sa.UUID(as_uuid=False), nullable=False),
+        sa.Column('total', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('completed', sa.Integer(), server_default='0', nullable=False),
+        sa.CheckConstraint('total >= 0', name='ck_user_task_counters_total'),
+        sa.CheckConstraint(
+            'completed >= 0 AND completed <= total',
+            name='ck_user_task_counters_completed',
+        ),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id'),
+    )
+    # Block task writes until the triggers exist and the backfill is done,
+    # so no change is counted twice or missed
+    op.execute('LOCK TABLE tasks IN SHARE ROW EXCLUSIVE MODE')
+    op.execute(COUNTERS_FUNCTION)
+    for operation, transition_tables in TRIGGERS.items():
+        op.execute(
+            f'CREATE TRIGGER tasks_counters_{operation.lower()} '
+            f'AFTER {operation} ON tasks {transition_tables} '
+            'FOR EACH STATEMENT EXECUTE FUNCTION apply_user_task_counters()'
+        )
+    op.execute(
+        'INSERT INTO user_task_counters (user_id, total, completed) '
+        'SELECT u.id, count(t.id), count(t.id) FILTER (WHERE t.completed) '
+        'FROM users AS u LEFT JOIN tasks AS t ON t.user_id = u.id '
+        'GROUP BY u.id'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for operation in reversed(list(TRIGGERS)):
+        op.execute(f'DROP TRIGGER tasks_counters_{operation.lower()} ON tasks')
+    op.execute('DROP FUNCTION apply_user_task_counters()')
+    op.drop_table('user_task_counters')
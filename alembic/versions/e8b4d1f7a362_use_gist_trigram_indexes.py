@@ -0,0 +1,83 @@
+"""Use GiST trigram indexes so substring matches come back closest first
+
+Revision ID: e8b4d1f7a362
+Revises: d6c2a8f4e951
+Create Date: 2026-10-16 19:24:37.518206
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8b4d1f7a362'
+down_revision: Union[str, Sequence[str], None] = 'd6c2a8f4e951'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # btree_gist lets tasks.user_id lead a GiST index next to the title
+    op.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+    op.drop_index('ix_users_username_trgm', table_name='users')
+    op.drop_index('ix_users_email_trgm', table_name='users')
+    op.drop_index('ix_tasks_title_trgm', table_name='tasks')
+    op.create_index(
+        'ix_tasks_user_title_trgm',
+        'tasks',
+        ['user_id', 'title'],
+        unique=False,
+        postgresql_using='gist',
+        postgresql_ops={'title': 'gist_trgm_ops'},
+    )
+    op.create_index(
+        'ix_users_email_trgm',
+        'users',
+        ['email'],
+        unique=False,
+        postgresql_using='gist',
+        postgresql_ops={'email': 'gist_trgm_ops'},
+    )
+    op.create_index(
+        'ix_users_username_trgm',
+        'users',
+        ['username'],
+        unique=False,
+        postgresql_using='gist',
+        postgresql_ops={'username': 'gist_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # The extension is left installed; other objects may have come to use it
+    op.drop_index('ix_users_username_trgm', table_name='users')
+    op.drop_index('ix_users_email_trgm', table_name='users')
+    op.drop_index('ix_tasks_user_title_trgm', table_name='tasks')
+    op.create_index(
+        'ix_tasks_title_trgm',
+        'tasks',
+        ['title'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'title': 'gin_trgm_ops'},
+    )
+    op.create_index(
+        'ix_users_email_trgm',
+        'users',
+        ['email'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'email': 'gin_trgm_ops'},
+    )
+    op.create_index(
+        'ix_users_username_trgm',
+        'users',
+        ['username'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'username': 'gin_trgm_ops'},
+    )
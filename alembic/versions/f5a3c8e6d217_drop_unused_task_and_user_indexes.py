@@ -0,0 +1,42 @@
+"""Drop indexes superseded by query-shaped indexes
+
+Revision ID: f5a3c8e6d217
+Revises: e41b7d9c2a56
+Create Date: 2026-10-16 15:04:52.118240
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5a3c8e6d217'
+down_revision: Union[str, Sequence[str], None] = 'e41b7d9c2a56'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Every task query filters on user_id and orders by (created_at, id) or
+    # the completion time, served by the ix_tasks_user_*_id indexes from
+    # c7d2f4a9e813; these only cost writes. Email lookups use the unique
+    # ix_users_email or the ix_users_email_credentials covering index.
+    op.drop_index('ix_tasks_user_id', table_name='tasks')
+    op.drop_index('ix_tasks_user_completed', table_name='tasks')
+    op.drop_index('ix_tasks_created_at', table_name='tasks')
+    op.drop_index('ix_users_email_active', table_name='users')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(
+        'ix_users_email_active', 'users', ['email', 'is_active'], unique=False
+    )
+    op.create_index('ix_tasks_created_at', 'tasks', ['created_at'], unique=False)
+    op.create_index(
+        'ix_tasks_user_completed', 'tasks', ['user_id', 'completed'], unique=False
+    )
+    op.create_index('ix_tasks_user_id', 'tasks', ['user_id'], unique=False)
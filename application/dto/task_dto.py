@@ -1,8 +1,12 @@
+import os
 from datetime import datetime
 from typing import List, Optional
 
 from pydantic import BaseModel, Field
 
+# Largest batch accepted by the /tasks/bulk endpoints
+BULK_MAX_TASKS = int(os.getenv("TASK_BULK_MAX_SIZE", "5000"))
+
 
 class TaskCreateDTO(BaseModel):
     title: str = Field(..., min_length=1, max_length=200, description="Task title")
@@ -11,6 +15,33 @@ class TaskCreateDTO(BaseModel):
     )
 
 
+class TaskBulkCreateDTO(BaseModel):
+    tasks: List[TaskCreateDTO] = Field(
+        ...,
+        min_length=1,
+        max_length=BULK_MAX_TASKS,
+        description="Tasks to create, in order",
+    )
+
+
+class TaskBulkCreateResponseDTO(BaseModel):
+    ids: List[str] = Field(..., description="IDs of the created tasks, in order")
+    created_count: int = Field(..., description="Number of tasks created")
+
+
+class TaskImportErrorDTO(BaseModel):
+    row: int = Field(..., description="Line (NDJSON) or record (CSV) number")
+    error: str = Field(..., description="Why the row was skipped")
+
+
+class TaskImportResponseDTO(BaseModel):
+    imported_count: int = Field(..., description="Number of tasks created")
+    error_count: int = Field(..., description="Number of rows skipped")
+    errors: List[TaskImportErrorDTO] = Field(
+        ..., description="The first skipped rows and their errors"
+    )
+
+
 class TaskUpdateDTO(BaseModel):
     title: Optional[str] = Field(
         None, min_length=1, max_length=200, description="Task title"
@@ -21,6 +52,33 @@ class TaskUpdateDTO(BaseModel):
     completed: Optional[bool] = Field(None, description="Task completion status")
 
 
+class TaskBulkUpdateDTO(BaseModel):
+    ids: List[str] = Field(
+        ..., min_length=1, max_length=BULK_MAX_TASKS, description="Tasks to update"
+    )
+    title: Optional[str] = Field(
+        None, min_length=1, max_length=200, description="Task title"
+    )
+    description: Optional[str] = Field(
+        None, max_length=1000, description="Task description"
+    )
+    completed: Optional[bool] = Field(None, description="Task completion status")
+
+
+class TaskBulkCompleteDTO(BaseModel):
+    ids: Optional[List[str]] = Field(
+        None,
+        min_length=1,
+        max_length=BULK_MAX_TASKS,
+        description="Tasks to complete; every pending task if omitted",
+    )
+
+
+class TaskBulkUpdateResponseDTO(BaseModel):
+    updated_ids: List[str] = Field(..., description="IDs of the tasks that changed")
+    updated_count: int = Field(..., description="Number of tasks that changed")
+
+
 class TaskResponseDTO(BaseModel):
     id: str = Field(..., description="Task ID")
     title: str = Field(..., description="Task title")
@@ -32,7 +90,26 @@ class TaskResponseDTO(BaseModel):
 
 class TaskListResponseDTO(BaseModel):
     tasks: List[TaskResponseDTO] = Field(..., description="List of tasks")
-    total_count: int = Field(..., description="Total number of tasks")
+    total_count: Optional[int] = Field(
+        None, description="Number of tasks matching the filter, if counted"
+    )
+    completed_count: Optional[int] = Field(
+        None, description="Number of completed tasks, if counted"
+    )
+    pending_count: Optional[int] = Field(
+        None, description="Number of pending tasks, if counted"
+    )
     page: int = Field(..., description="Current page number")
     page_size: int = Field(..., description="Page size")
     has_next: bool = Field(..., description="Whether there are more pages")
+    next_cursor: Optional[str] = Field(
+        None, description="Opaque cursor for the next page, if there is one"
+    )
+
+
+class TaskSearchResponseDTO(BaseModel):
+    tasks: List[TaskResponseDTO] = Field(..., description="Matching tasks, best first")
+    has_next: bool = Field(..., description="Whether more matches follow")
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor for the next page of matches"
+    )
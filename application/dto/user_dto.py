@@ -33,3 +33,7 @@ class TokenResponseDTO(BaseModel):
 
 class TokenRefreshDTO(BaseModel):
     refresh_token: str = Field(..., description="Refresh token")
+
+
+class LogoutDTO(BaseModel):
+    refresh_token: Optional[str] = Field(None, description="Refresh token to revoke")
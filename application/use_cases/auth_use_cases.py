@@ -1,7 +1,10 @@
+from datetime import datetime, timezone
 from typing import Any, Dict, Optional
 
 from application.dto.user_dto import TokenResponseDTO, UserCreateDTO, UserLoginDTO
+from domain.entities.revoked_token import RevokedToken
 from domain.entities.user import User
+from domain.repositories.revoked_token_repository import RevokedTokenRepository
 from domain.repositories.user_repository import UserRepository
 from domain.value_objects.email import Email
 from domain.value_objects.password import Password
@@ -16,15 +19,19 @@ class AuthUseCases:
         user_repository: UserRepository,
         password_service: PasswordService,
         jwt_service: JWTService,
+        revoked_token_repository: Optional[RevokedTokenRepository] = None,
     ):
         self.user_repository = user_repository
         self.password_service = password_service
         self.jwt_service = jwt_service
+        self.revoked_token_repository = revoked_token_repository
 
     async def register_user(self, user_data: UserCreateDTO) -> Dict[str, Any]:
         """Register a new user"""
-        # Check if user already exists
         email = Email(user_data.email)
+
+        # Turn away taken values before paying for a password hash; the
+        # insert below still settles races between concurrent signups
         if await self.user_repository.exists_by_email(email):
             raise ValueError("User with this email already exists")
 
@@ -33,20 +40,23 @@ class AuthUseCases:
 
         # Validate password and create user
         password = Password(user_data.password)
-        hashed_password = self.password_service.hash_password(password)
+        hashed_password = await self.password_service.hash_password_async(password)
 
         user = User.create(
             email=email, username=user_data.username, hashed_password=hashed_password
         )
 
-        # Save user to repository
-        created_user = await self.user_repository.create(user)
+        # Save user to repository; a duplicate that slipped past the checks
+        # above is detected by the insert itself
+        created_user = await self.user_repository.create_unique(user)
 
         # Generate tokens
         access_token = self.jwt_service.create_access_token(
-            created_user.id, created_user.username
+            created_user.id, created_user.username, created_user.token_version
+        )
+        refresh_token = self.jwt_service.create_refresh_token(
+            created_user.id, created_user.token_version
         )
-        refresh_token = self.jwt_service.create_refresh_token(created_user.id)
 
         return {
             "user": {
@@ -67,24 +77,29 @@ class AuthUseCases:
     async def login_user(self, login_data: UserLoginDTO) -> Dict[str, Any]:
         """Login user and return tokens"""
         email = Email(login_data.email)
-        user = await self.user_repository.get_by_email(email)
+        user = await self.user_repository.get_credentials_by_email(email)
 
         if not user or not user.is_active:
             raise ValueError("Invalid email or password")
 
-        if not self.password_service.verify_password(
+        if not await self.password_service.verify_password_async(
             login_data.password, user.hashed_password
         ):
             raise ValueError("Invalid email or password")
 
-        # Generate tokens
-        access_token = self.jwt_service.create_access_token(user.id, user.username)
-        refresh_token = self.jwt_service.create_refresh_token(user.id)
+        # Generate tokens; credentials carry the stored ID unwrapped
+        user_id = UserId(user.id)
+        access_token = self.jwt_service.create_access_token(
+            user_id, user.username, user.token_version
+        )
+        refresh_token = self.jwt_service.create_refresh_token(
+            user_id, user.token_version
+        )
 
         return {
             "user": {
-                "id": str(user.id),
-                "email": str(user.email),
+                "id": user.id,
+                "email": str(email),
                 "username": user.username,
                 "is_active": user.is_active,
                 "created_at": user.created_at,
@@ -95,8 +110,26 @@ class AuthUseCases:
                 refresh_token=refresh_token,
                 expires_in=self.jwt_service.access_token_expire_minutes * 60,
             ),
+            "rehash_needed": self.password_service.needs_update(user.hashed_password),
         }
 
+    async def rehash_password(self, user_id: UserId, plain_password: str) -> bool:
+        """Re-hash a user's password with the current hashing policy"""
+        user = await self.user_repository.get_by_id(user_id)
+        if not user or not self.password_service.needs_update(user.hashed_password):
+            return False
+
+        # Verify again in case the password changed since the login
+        verified, new_hash = await self.password_service.verify_and_update_async(
+            plain_password, user.hashed_password
+        )
+        if not verified or not new_hash:
+            return False
+
+        user.update_password(new_hash)
+        await self.user_repository.update(user)
+        return True
+
     async def refresh_token(self, refresh_token: str) -> TokenResponseDTO:
         """Refresh access token using refresh token"""
         payload = self.jwt_service.verify_token(refresh_token, "refresh")
@@ -112,9 +145,15 @@ class AuthUseCases:
             user = await self.user_repository.get_by_id(user_id)
             if not user or not user.is_active:
                 raise ValueError("User not found or inactive")
+            # Logging out everywhere bumps the version, retiring refresh
+            # tokens issued before it along with the access tokens
+            if payload.get("ver", 0) != user.token_version:
+                raise ValueError("Refresh token has been revoked")
 
             # Generate new access token
-            access_token = self.jwt_service.create_access_token(user.id, user.username)
+            access_token = self.jwt_service.create_access_token(
+                user.id, user.username, user.token_version
+            )
 
             return TokenResponseDTO(
                 access_token=access_token,
@@ -124,6 +163,40 @@ class AuthUseCases:
         except ValueError:
             raise ValueError("Invalid refresh token")
 
+    async def logout(
+        self, access_token: Optional[str], refresh_token: Optional[str] = None
+    ) -> int:
+        """Revoke the given tokens so they are rejected before they expire"""
+        if self.revoked_token_repository is None:
+            raise RuntimeError("Token revocation store is not configured")
+
+        revoked = 0
+        for token, token_type in ((access_token, "access"), (refresh_token, "refresh")):
+            if not token:
+                continue
+            payload = self.jwt_service.verify_token(token, token_type)
+            if not payload or not payload.get("jti"):
+                continue
+
+            await self.revoked_token_repository.add(
+                RevokedToken(
+                    jti=payload["jti"],
+                    user_id=UserId(payload["sub"]),
+                    expires_at=datetime.fromtimestamp(payload["exp"], tz=timezone.utc),
+                )
+            )
+            revoked += 1
+        return revoked
+
+    async def revoke_all_tokens(self, user_id: UserId) -> None:
+        """Revoke every access and refresh token issued to the user so far"""
+        user = await self.user_repository.get_by_id(user_id)
+        if not user:
+            raise ValueError("User not found")
+
+        user.revoke_tokens()
+        await self.user_repository.update(user)
+
     async def get_current_user(self, user_id: UserId) -> Optional[User]:
         """Get current user by ID"""
         return await self.user_repository.get_by_id(user_id)
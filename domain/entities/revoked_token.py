@@ -0,0 +1,15 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+from domain.value_objects.user_id import UserId
+
+
+@dataclass(frozen=True)
+class RevokedToken:
+    jti: str
+    user_id: UserId
+    expires_at: datetime
+    revoked_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    def is_expired(self, now: datetime) -> bool:
+        return self.expires_at <= now
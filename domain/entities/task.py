@@ -20,32 +20,38 @@ class Task:
     def create(
         cls, user_id: UserId, title: str, description: Optional[str] = None
     ) -> "Task":
-        if not title or len(title.strip()) == 0:
-            raise ValueError("Task title cannot be empty")
-        if len(title) > 200:
-            raise ValueError("Task title cannot exceed 200 characters")
-        if description and len(description) > 1000:
-            raise ValueError("Task description cannot exceed 1000 characters")
+        title = cls.validate_title(title)
+        description = cls.validate_description(description)
 
         return cls(
             id=TaskId.generate(),
             user_id=user_id,
-            title=title.strip(),
-            description=description.strip() if description else None,
+            title=title,
+            description=description,
         )
 
-    def update_title(self, new_title: str) -> None:
-        if not new_title or len(new_title.strip()) == 0:
+    @staticmethod
+    def validate_title(title: Optional[str]) -> str:
+        """Check a title against the task rules and return it normalized"""
+        if not title or len(title.strip()) == 0:
             raise ValueError("Task title cannot be empty")
-        if len(new_title) > 200:
+        if len(title) > 200:
             raise ValueError("Task title cannot exceed 200 characters")
-        self.title = new_title.strip()
+        return title.strip()
+
+    @staticmethod
+    def validate_description(description: Optional[str]) -> Optional[str]:
+        """Check a description against the task rules and return it normalized"""
+        if description and len(description) > 1000:
+            raise ValueError("Task description cannot exceed 1000 characters")
+        return description.strip() if description else None
+
+    def update_title(self, new_title: str) -> None:
+        self.title = self.validate_title(new_title)
         self.updated_at = datetime.now(timezone.utc)
 
     def update_description(self, new_description: Optional[str]) -> None:
-        if new_description and len(new_description) > 1000:
-            raise ValueError("Task description cannot exceed 1000 characters")
-        self.description = new_description.strip() if new_description else None
+        self.description = self.validate_description(new_description)
         self.updated_at = datetime.now(timezone.utc)
 
     def mark_completed(self) -> None:
@@ -13,6 +13,7 @@ class User:
     username: str
     hashed_password: str
     is_active: bool = True
+    token_version: int = 0
     created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: Optional[datetime] = None
 
@@ -48,3 +49,34 @@ class User:
     def activate(self) -> None:
         self.is_active = True
         self.updated_at = datetime.now(timezone.utc)
+
+    def revoke_tokens(self) -> None:
+        """Invalidate every access token issued with the current version"""
+        self.token_version += 1
+        self.updated_at = datetime.now(timezone.utc)
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Lightweight identity of an authenticated user"""
+
+    id: UserId
+    username: str
+    is_active: bool = True
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(id=user.id, username=user.username, is_active=user.is_active)
+
+
+@dataclass(frozen=True)
+class UserCredentials:
+    """Login projection of a user, read straight from storage without validation"""
+
+    id: str
+    username: str
+    hashed_password: str
+    is_active: bool
+    token_version: int
+    created_at: datetime
+    updated_at: Optional[datetime] = None
@@ -0,0 +1,25 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import List, Optional
+
+from domain.entities.revoked_token import RevokedToken
+
+
+class RevokedTokenRepository(ABC):
+
+    @abstractmethod
+    async def add(self, token: RevokedToken) -> None:
+        """Record a revoked token"""
+        pass
+
+    @abstractmethod
+    async def list_active(
+        self, revoked_since: Optional[datetime] = None
+    ) -> List[RevokedToken]:
+        """List unexpired revoked tokens, optionally only those revoked since a time"""
+        pass
+
+    @abstractmethod
+    async def delete_expired(self, now: datetime) -> int:
+        """Delete revocations of tokens that have expired anyway"""
+        pass
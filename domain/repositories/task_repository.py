@@ -1,11 +1,29 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from dataclasses import dataclass
+from datetime import datetime
+from typing import AsyncIterator, List, Optional
 
 from domain.entities.task import Task
+from domain.value_objects.task_changes import TaskChanges
+from domain.value_objects.task_counts import TaskCounts
+from domain.value_objects.task_cursor import TaskCursor, TaskSearchCursor
 from domain.value_objects.task_id import TaskId
 from domain.value_objects.user_id import UserId
 
 
+@dataclass
+class TaskPage:
+    tasks: List[Task]
+    next_cursor: Optional[TaskCursor] = None
+    counts: Optional[TaskCounts] = None
+
+
+@dataclass
+class TaskSearchPage:
+    tasks: List[Task]
+    next_cursor: Optional[TaskSearchCursor] = None
+
+
 class TaskRepository(ABC):
 
     @abstractmethod
@@ -13,11 +31,26 @@ class TaskRepository(ABC):
         """Create a new task"""
         pass
 
+    @abstractmethod
+    async def create_many(self, tasks: List[Task]) -> List[TaskId]:
+        """Create tasks in bulk, returning their IDs in input order"""
+        pass
+
     @abstractmethod
     async def get_by_id(self, task_id: TaskId) -> Optional[Task]:
         """Get task by ID"""
         pass
 
+    @abstractmethod
+    async def get_owned(self, task_id: TaskId, user_id: UserId) -> Optional[Task]:
+        """Get a task by ID if it belongs to the user"""
+        pass
+
+    @abstractmethod
+    async def exists(self, task_id: TaskId) -> bool:
+        """Check whether a task exists, whoever owns it"""
+        pass
+
     @abstractmethod
     async def get_by_user_id(
         self, user_id: UserId, limit: int = 100, offset: int = 0
@@ -25,16 +58,83 @@ class TaskRepository(ABC):
         """Get all tasks for a specific user with pagination"""
         pass
 
+    @abstractmethod
+    async def get_page(
+        self,
+        user_id: UserId,
+        limit: int = 20,
+        completed: Optional[bool] = None,
+        after: Optional[TaskCursor] = None,
+        offset: int = 0,
+        with_counts: bool = False,
+        sort: Optional[str] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        updated_since: Optional[datetime] = None,
+    ) -> TaskPage:
+        """Get the page of a user's tasks after a cursor, optionally with counts
+
+        Raises ValueError for sorts and filters that no index serves.
+        """
+        pass
+
+    @abstractmethod
+    async def search(
+        self,
+        user_id: UserId,
+        query: str,
+        limit: int = 20,
+        after: Optional[TaskSearchCursor] = None,
+    ) -> TaskSearchPage:
+        """Full-text search of a user's tasks, best matches first"""
+        pass
+
+    @abstractmethod
+    async def search_by_title(
+        self, user_id: UserId, fragment: str, limit: int = 10
+    ) -> List[Task]:
+        """Get a user's tasks whose title contains a fragment, closest first"""
+        pass
+
     @abstractmethod
     async def update(self, task: Task) -> Task:
         """Update an existing task"""
         pass
 
+    @abstractmethod
+    async def update_owned(
+        self, task_id: TaskId, user_id: UserId, changes: TaskChanges
+    ) -> Optional[Task]:
+        """Apply changes to a task if it belongs to the user"""
+        pass
+
+    @abstractmethod
+    async def update_many(
+        self,
+        user_id: UserId,
+        changes: TaskChanges,
+        task_ids: Optional[List[TaskId]] = None,
+    ) -> List[TaskId]:
+        """Apply changes to the user's tasks, or to the given ones only"""
+        pass
+
     @abstractmethod
     async def delete(self, task_id: TaskId) -> bool:
         """Delete a task by ID"""
         pass
 
+    @abstractmethod
+    async def delete_owned(self, task_id: TaskId, user_id: UserId) -> bool:
+        """Delete a task if it belongs to the user"""
+        pass
+
+    @abstractmethod
+    def stream_by_user_id(
+        self, user_id: UserId, completed: Optional[bool] = None, batch_size: int = 500
+    ) -> AsyncIterator[List[Task]]:
+        """Stream all of a user's tasks, newest first, in batches"""
+        pass
+
     @abstractmethod
     async def count_by_user_id(self, user_id: UserId) -> int:
         """Count tasks for a specific user"""
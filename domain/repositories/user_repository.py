@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
 from typing import List, Optional
 
-from domain.entities.user import User
+from domain.entities.user import User, UserCredentials
 from domain.value_objects.email import Email
 from domain.value_objects.user_id import UserId
 
@@ -13,6 +13,11 @@ class UserRepository(ABC):
         """Create a new user"""
         pass
 
+    @abstractmethod
+    async def create_unique(self, user: User) -> User:
+        """Create a new user, raising ValueError if the email or username is taken"""
+        pass
+
     @abstractmethod
     async def get_by_id(self, user_id: UserId) -> Optional[User]:
         """Get user by ID"""
@@ -23,11 +28,23 @@ class UserRepository(ABC):
         """Get user by email"""
         pass
 
+    @abstractmethod
+    async def get_credentials_by_email(self, email: Email) -> Optional[UserCredentials]:
+        """Get the fields needed to authenticate a user by email"""
+        pass
+
     @abstractmethod
     async def get_by_username(self, username: str) -> Optional[User]:
         """Get user by username"""
         pass
 
+    @abstractmethod
+    async def search_by_email_or_username(
+        self, fragment: str, limit: int = 20
+    ) -> List[User]:
+        """Get users whose email or username contains a fragment, closest first"""
+        pass
+
     @abstractmethod
     async def update(self, user: User) -> User:
         """Update an existing user"""
@@ -43,6 +60,11 @@ class UserRepository(ABC):
         """List all users with pagination"""
         pass
 
+    @abstractmethod
+    async def get_token_version(self, user_id: UserId) -> Optional[int]:
+        """Get the token version of an active user"""
+        pass
+
     @abstractmethod
     async def exists_by_email(self, email: Email) -> bool:
         """Check if user exists by email"""
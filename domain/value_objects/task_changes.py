@@ -0,0 +1,34 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping
+
+from domain.entities.task import Task
+
+
+@dataclass(frozen=True)
+class TaskChanges:
+    """Field edits applied to many tasks at once, checked by the Task rules"""
+
+    values: Dict[str, Any]
+
+    @classmethod
+    def from_fields(cls, fields: Mapping[str, Any]) -> "TaskChanges":
+        values: Dict[str, Any] = {}
+        for name, value in fields.items():
+            if name == "title":
+                values["title"] = Task.validate_title(value)
+            elif name == "description":
+                values["description"] = Task.validate_description(value)
+            elif name == "completed":
+                if value is None:
+                    raise ValueError("Task completion status must be true or false")
+                values["completed"] = bool(value)
+            else:
+                raise ValueError(f"Unknown task field: {name}")
+        if not values:
+            raise ValueError("No task changes given")
+        return cls(values)
+
+    @property
+    def only_completion(self) -> bool:
+        """Whether the edit just marks tasks completed or incomplete"""
+        return set(self.values) == {"completed"}
@@ -0,0 +1,24 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class TaskCounts:
+    """Number of a user's tasks, in total and by status"""
+
+    total: int = 0
+    completed: int = 0
+
+    def __post_init__(self):
+        if self.completed < 0 or self.completed > self.total:
+            raise ValueError("Completed count must be between 0 and the total")
+
+    @property
+    def pending(self) -> int:
+        return self.total - self.completed
+
+    def matching(self, completed: Optional[bool] = None) -> int:
+        """Count of the tasks a listing with this completed filter covers"""
+        if completed is None:
+            return self.total
+        return self.completed if completed else self.pending
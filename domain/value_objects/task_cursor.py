@@ -0,0 +1,76 @@
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Union
+
+from domain.entities.task import Task
+
+# Orders a task listing can be sorted in; dates newest first, titles A to Z
+TASK_SORTS = ("created_at", "updated_at", "title")
+
+
+def default_sort(completed: Optional[bool] = None) -> str:
+    """Completed tasks are listed by completion time, everything else by
+    creation time"""
+    return "updated_at" if completed else "created_at"
+
+
+@dataclass(frozen=True)
+class TaskCursor:
+    """Position in a user's task listing, just after the given task
+
+    A cursor belongs to one listing, identified by its completed filter and
+    sort; ``sort`` defaults to the filter's default order.
+    """
+
+    sort_key: Union[datetime, str]
+    task_id: str
+    completed: Optional[bool] = None
+    sort: Optional[str] = None
+
+    def __post_init__(self):
+        if self.sort is None:
+            object.__setattr__(self, "sort", default_sort(self.completed))
+        if self.sort not in TASK_SORTS:
+            raise ValueError(f"Unknown task sort: {self.sort}")
+
+    @classmethod
+    def after(
+        cls, task: Task, completed: Optional[bool] = None, sort: Optional[str] = None
+    ) -> "TaskCursor":
+        # Ties are broken by ID; tasks never updated count as modified when
+        # they were created
+        sort = sort or default_sort(completed)
+        if sort == "title":
+            sort_key = task.title
+        elif sort == "updated_at":
+            sort_key = task.updated_at or task.created_at
+        else:
+            sort_key = task.created_at
+        return cls(
+            sort_key=sort_key, task_id=str(task.id), completed=completed, sort=sort
+        )
+
+
+@dataclass(frozen=True)
+class TaskSearchCursor:
+    """Position in ranked search results, just after the given task
+
+    A cursor belongs to the search for one text, identified by a digest of it;
+    resuming a different search from it would skip arbitrary results.
+    """
+
+    rank: float
+    task_id: str
+    query_digest: str
+
+    @staticmethod
+    def digest(query: str) -> str:
+        return hashlib.sha256(query.encode()).hexdigest()[:16]
+
+    @classmethod
+    def after(cls, rank: float, task_id: str, query: str) -> "TaskSearchCursor":
+        return cls(rank=rank, task_id=task_id, query_digest=cls.digest(query))
+
+    def matches(self, query: str) -> bool:
+        return self.query_digest == self.digest(query)
@@ -0,0 +1,92 @@
+import asyncio
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+
+
+class AdmissionRejectedError(Exception):
+    """Raised when work is shed because the controller is saturated"""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Server is busy, please retry later")
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """Limit concurrent work and shed callers once a short wait queue is full"""
+
+    def __init__(
+        self, max_concurrent: int, max_waiting: int, max_wait_seconds: float = 1.0
+    ):
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        if max_waiting < 0:
+            raise ValueError("max_waiting cannot be negative")
+        self.max_concurrent = max_concurrent
+        self.max_waiting = max_waiting
+        self.max_wait_seconds = max_wait_seconds
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Metrics
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+        self._held_seconds_total = 0.0
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        semaphore = self._get_semaphore()
+        if not semaphore.locked():
+            await semaphore.acquire()
+        elif self.waiting >= self.max_waiting:
+            self._reject()
+        else:
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(semaphore.acquire(), self.max_wait_seconds)
+            except asyncio.TimeoutError:
+                self._reject()
+            finally:
+                self.waiting -= 1
+
+        self.active += 1
+        self.admitted += 1
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._held_seconds_total += time.perf_counter() - started
+            self.active -= 1
+            semaphore.release()
+
+    def retry_after(self) -> int:
+        """Estimate in seconds how long the current backlog takes to drain"""
+        completed = self.admitted - self.active
+        average = self._held_seconds_total / completed if completed else 0.0
+        backlog = self.active + self.waiting
+        return max(1, math.ceil(backlog * average / self.max_concurrent))
+
+    def _reject(self) -> None:
+        self.rejected += 1
+        raise AdmissionRejectedError(self.retry_after())
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_waiting": self.max_waiting,
+            "max_wait_seconds": self.max_wait_seconds,
+            "active": self.active,
+            "queue_depth": self.waiting,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+        }
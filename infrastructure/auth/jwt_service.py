@@ -1,50 +1,124 @@
+import hashlib
 import os
+import time
+import uuid
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, Optional
 
 from jose import JWTError, jwt
 
 from domain.value_objects.user_id import UserId
+from infrastructure.auth.revocation import revocation_list
+from infrastructure.auth.signing_keys import ASYMMETRIC_ALGORITHMS, KeyRing
+from infrastructure.cache.ttl_cache import TTLCache
 
 
 class JWTService:
-    def __init__(self):
+    def __init__(self, key_ring: Optional[KeyRing] = None):
         self.secret_key = os.getenv(
             "JWT_SECRET_KEY", "your-secret-key-change-this-in-production"
         )
-        self.algorithm = "HS256"
+        # With RS256/ES256 tokens carry a "kid" header and anyone holding the
+        # published public keys can verify them without calling this API
+        self.algorithm = os.getenv("JWT_ALGORITHM", "HS256")
+        if key_ring is None and self.algorithm in ASYMMETRIC_ALGORITHMS:
+            key_ring = KeyRing.from_directory(
+                os.getenv("JWT_KEYS_DIR", "keys"),
+                self.algorithm,
+                os.getenv("JWT_ACTIVE_KID") or None,
+            )
+        self.key_ring = key_ring
+        if key_ring is not None:
+            self.algorithm = key_ring.active.algorithm
         self.access_token_expire_minutes = int(
             os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
         )
         self.refresh_token_expire_days = int(
             os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "7")
         )
+        # When enabled, the auth middleware trusts the claims embedded in
+        # access tokens instead of loading the user row on every request
+        self.stateless_access_tokens = (
+            os.getenv("JWT_STATELESS_ACCESS_TOKENS", "false").lower() == "true"
+        )
+        # Verified payloads keyed by token digest; entries never outlive "exp"
+        self._verified_tokens: TTLCache[bytes, Dict[str, Any]] = TTLCache(
+            max_size=int(os.getenv("JWT_VERIFY_CACHE_SIZE", "10000")),
+            ttl_seconds=float(os.getenv("JWT_VERIFY_CACHE_TTL_SECONDS", "1800")),
+        )
+        self.revocation_list = revocation_list
 
-    def create_access_token(self, user_id: UserId, username: str) -> str:
+    def create_access_token(
+        self, user_id: UserId, username: str, token_version: int = 0
+    ) -> str:
         expire = datetime.now(timezone.utc) + timedelta(minutes=self.access_token_expire_minutes)
         to_encode = {
             "sub": str(user_id),
             "username": username,
+            "active": True,
+            "ver": token_version,
             "exp": expire,
             "type": "access",
+            "jti": uuid.uuid4().hex,
         }
-        return jwt.encode(to_encode, self.secret_key, algorithm=self.algorithm)
+        return self._encode(to_encode)
 
-    def create_refresh_token(self, user_id: UserId) -> str:
+    def create_refresh_token(self, user_id: UserId, token_version: int = 0) -> str:
         expire = datetime.now(timezone.utc) + timedelta(days=self.refresh_token_expire_days)
-        to_encode = {"sub": str(user_id), "exp": expire, "type": "refresh"}
-        return jwt.encode(to_encode, self.secret_key, algorithm=self.algorithm)
+        to_encode = {
+            "sub": str(user_id),
+            "ver": token_version,
+            "exp": expire,
+            "type": "refresh",
+            "jti": uuid.uuid4().hex,
+        }
+        return self._encode(to_encode)
 
     def verify_token(
         self, token: str, token_type: str = "access"
     ) -> Optional[Dict[str, Any]]:
-        try:
-            payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
-            if payload.get("type") != token_type:
+        key = hashlib.sha256(token.encode()).digest()
+        payload = self._verified_tokens.get(key)
+        if payload is None:
+            try:
+                payload = self._decode(token)
+            except JWTError:
                 return None
-            return payload
-        except JWTError:
+            expires_at = payload.get("exp")
+            if isinstance(expires_at, (int, float)):
+                self._verified_tokens.set(
+                    key, payload, ttl_seconds=expires_at - time.time()
+                )
+
+        if payload.get("type") != token_type:
+            return None
+        if self.revocation_list.is_revoked(payload.get("jti")):
             return None
+        return dict(payload)
+
+    def _encode(self, claims: Dict[str, Any]) -> str:
+        if self.key_ring is None:
+            return jwt.encode(claims, self.secret_key, algorithm=self.algorithm)
+        key = self.key_ring.active
+        return jwt.encode(
+            claims, key.private_key, algorithm=key.algorithm, headers={"kid": key.kid}
+        )
+
+    def _decode(self, token: str) -> Dict[str, Any]:
+        if self.key_ring is None:
+            return jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+        kid = jwt.get_unverified_header(token).get("kid")
+        key = self.key_ring.get(kid)
+        if key is None:
+            raise JWTError(f"Unknown signing key: {kid}")
+        return jwt.decode(token, key.public_key, algorithms=[key.algorithm])
+
+    def jwks(self) -> Dict[str, Any]:
+        """Public verification keys; empty when tokens use a shared secret"""
+        return self.key_ring.jwks() if self.key_ring is not None else {"keys": []}
+
+    def cache_stats(self) -> Dict[str, float]:
+        return self._verified_tokens.stats()
 
     def get_user_id_from_token(self, token: str) -> Optional[UserId]:
         payload = self.verify_token(token)
@@ -57,17 +131,5 @@ class JWTService:
                     return None
         return None
 
-    def refresh_access_token(self, refresh_token: str) -> Optional[str]:
-        payload = self.verify_token(refresh_token, "refresh")
-        if payload:
-            user_id_str = payload.get("sub")
-            if user_id_str:
-                try:
-                    user_id = UserId(user_id_str)
-                    return self.create_access_token(user_id, "")
-                except ValueError:
-                    return None
-        return None
-
 
 jwt_service = JWTService()
@@ -1,11 +1,95 @@
+import asyncio
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
 from passlib.context import CryptContext
+from passlib.registry import get_crypt_handler
 
 from domain.value_objects.password import Password
+from infrastructure.auth.admission import AdmissionController
+
+T = TypeVar("T")
+
+
+@lru_cache(maxsize=8)
+def _context_from_config(config: str) -> CryptContext:
+    return CryptContext.from_string(config)
+
+
+def _hash_with_config(config: str, secret: str) -> str:
+    return _context_from_config(config).hash(secret)
+
+
+def _verify_with_config(config: str, secret: str, hashed: str) -> bool:
+    return _context_from_config(config).verify(secret, hashed)
+
+
+def _verify_and_update_with_config(
+    config: str, secret: str, hashed: str
+) -> Tuple[bool, Optional[str]]:
+    return _context_from_config(config).verify_and_update(secret, hashed)
+
+
+def _timed(func: Callable[..., T], *args: Any) -> Tuple[T, float]:
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+
+SCHEME = "bcrypt"
+# Lowest cost calibration may pick
+MIN_ROUNDS = 10
 
 
 class PasswordService:
-    def __init__(self):
-        self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    def __init__(
+        self,
+        executor_kind: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        max_wait_seconds: Optional[float] = None,
+    ):
+        self.scheme = SCHEME
+        self.rounds: Optional[int] = None
+        rounds = os.getenv("PASSWORD_HASH_ROUNDS")
+        self.configure(int(rounds) if rounds else None)
+
+        # bcrypt releases the GIL, so threads hash in parallel; a process pool
+        # is available for hashing schemes that do not
+        self.executor_kind = executor_kind or os.getenv(
+            "PASSWORD_HASH_EXECUTOR", "thread"
+        )
+        if self.executor_kind not in ("thread", "process"):
+            raise ValueError("Password hash executor must be 'thread' or 'process'")
+        self.max_workers = max_workers or int(
+            os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1))
+        )
+        self.max_queue = (
+            max_queue
+            if max_queue is not None
+            else int(os.getenv("PASSWORD_HASH_MAX_QUEUE", str(2 * self.max_workers)))
+        )
+        self._executor: Optional[Executor] = None
+
+        # One hash per pool worker runs at a time; a short queue absorbs bursts
+        # and anything beyond it is shed instead of starving other endpoints
+        self.admission = AdmissionController(
+            max_concurrent=self.max_workers,
+            max_waiting=self.max_queue,
+            max_wait_seconds=(
+                max_wait_seconds
+                if max_wait_seconds is not None
+                else float(os.getenv("PASSWORD_HASH_MAX_WAIT_MS", "1000")) / 1000
+            ),
+        )
+
+        # Metrics
+        self._completed = 0
+        self._hash_seconds_total = 0.0
+        self._hash_seconds_max = 0.0
 
     def hash_password(self, password: Password) -> str:
         return self.pwd_context.hash(password.value)
@@ -16,5 +100,103 @@ class PasswordService:
     def needs_update(self, hashed_password: str) -> bool:
         return self.pwd_context.needs_update(hashed_password)
 
+    def configure(self, rounds: Optional[int] = None) -> None:
+        """Use the given cost for new hashes and flag hashes with a lower cost"""
+        # Only a floor: hosts that calibrate to different costs accept each
+        # other's hashes instead of rehashing them back and forth on login
+        settings: Dict[str, Any] = {}
+        if rounds is not None:
+            for option in ("default_rounds", "min_rounds"):
+                settings[f"{self.scheme}__{option}"] = rounds
+        self.pwd_context = CryptContext(
+            schemes=[self.scheme], deprecated="auto", **settings
+        )
+        self._context_config = self.pwd_context.to_string()
+        self.rounds = rounds
+
+    def calibrate(self, target_ms: float, min_rounds: Optional[int] = None) -> int:
+        """Pick the highest cost whose hash time fits the latency budget"""
+        handler = get_crypt_handler(self.scheme)
+        rounds = max(min_rounds or MIN_ROUNDS, handler.min_rounds)
+        best = rounds
+        while rounds <= handler.max_rounds:
+            started = time.perf_counter()
+            handler.using(rounds=rounds).hash("calibration-probe")
+            elapsed_ms = 1000 * (time.perf_counter() - started)
+            if elapsed_ms > target_ms:
+                break
+            best = rounds
+            rounds += 1
+
+        self.configure(best)
+        return best
+
+    async def hash_password_async(self, password: Password) -> str:
+        """Hash a password on the worker pool without blocking the event loop"""
+        return await self._run(_hash_with_config, self._context_config, password.value)
+
+    async def verify_password_async(
+        self, plain_password: str, hashed_password: str
+    ) -> bool:
+        """Verify a password on the worker pool without blocking the event loop"""
+        return await self._run(
+            _verify_with_config, self._context_config, plain_password, hashed_password
+        )
+
+    async def verify_and_update_async(
+        self, plain_password: str, hashed_password: str
+    ) -> Tuple[bool, Optional[str]]:
+        """Verify a password and return a new hash if the stored one is outdated"""
+        return await self._run(
+            _verify_and_update_with_config,
+            self._context_config,
+            plain_password,
+            hashed_password,
+        )
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        """Run hashing work on the pool; raises AdmissionRejectedError when busy"""
+        loop = asyncio.get_running_loop()
+        async with self.admission.admit():
+            result, elapsed = await loop.run_in_executor(
+                self._get_executor(), _timed, func, *args
+            )
+
+        self._completed += 1
+        self._hash_seconds_total += elapsed
+        self._hash_seconds_max = max(self._hash_seconds_max, elapsed)
+        return result
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="password-hash"
+                )
+        return self._executor
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "scheme": self.scheme,
+            "rounds": self.rounds,
+            "executor": self.executor_kind,
+            "max_workers": self.max_workers,
+            **self.admission.stats(),
+            "completed": self._completed,
+            "avg_hash_ms": (
+                round(1000 * self._hash_seconds_total / self._completed, 2)
+                if self._completed
+                else 0.0
+            ),
+            "max_hash_ms": round(1000 * self._hash_seconds_max, 2),
+        }
+
 
 password_service = PasswordService()
@@ -0,0 +1,41 @@
+import os
+from typing import Optional
+
+from domain.entities.user import User
+from domain.value_objects.user_id import UserId
+from infrastructure.cache.ttl_cache import TTLCache
+
+
+class PrincipalCache(TTLCache[UserId, User]):
+    """Cache of active users resolved from access tokens, keyed by UserId"""
+
+    def get_active(self, user_id: UserId) -> Optional[User]:
+        user = self.get(user_id)
+        if user is not None and not user.is_active:
+            # The cached entity was deactivated in-process; drop it
+            self.invalidate(user_id)
+            return None
+        return user
+
+    def put(self, user: User) -> None:
+        if user.is_active:
+            self.set(user.id, user)
+        else:
+            self.invalidate(user.id)
+
+
+# Both caches are per process. Invalidation on update, logout-all or
+# deactivation only clears the worker that made the change; other workers
+# keep serving their entry until the TTL expires, which bounds how long a
+# revoked principal or token version is still accepted there. Refreshing
+# tokens always checks the stored token version.
+principal_cache = PrincipalCache(
+    max_size=int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000")),
+    ttl_seconds=float(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60")),
+)
+
+# Per-user token versions used to revoke stateless access tokens
+token_version_cache: TTLCache[UserId, int] = TTLCache(
+    max_size=int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000")),
+    ttl_seconds=float(os.getenv("TOKEN_VERSION_CACHE_TTL_SECONDS", "30")),
+)
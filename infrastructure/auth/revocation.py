@@ -0,0 +1,71 @@
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from domain.repositories.revoked_token_repository import RevokedTokenRepository
+
+
+class TokenRevocationList:
+    """In-memory hashed set of revoked token IDs mirrored from the revocation store
+
+    Lookups are O(1) and exact, so the hot path never needs the database.
+    Each worker keeps its own copy: revocations made locally apply at once and
+    revocations made by other workers arrive with the next ``sync``.
+    """
+
+    def __init__(self, sync_interval_seconds: float = 5.0):
+        self.sync_interval_seconds = sync_interval_seconds
+        self._expires_at: Dict[str, datetime] = {}
+        self._watermark: Optional[datetime] = None
+        self.checks = 0
+        self.rejections = 0
+
+    def revoke(self, jti: str, expires_at: datetime) -> None:
+        self._expires_at[jti] = expires_at
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        self.checks += 1
+        if jti is None or jti not in self._expires_at:
+            return False
+        self.rejections += 1
+        return True
+
+    async def sync(self, repository: RevokedTokenRepository) -> int:
+        """Load revocations recorded since the last sync and drop expired ones"""
+        # Re-read a short overlap so revocations committed slightly out of
+        # order with their revoked_at timestamps are not missed
+        since = (
+            self._watermark - timedelta(seconds=self.sync_interval_seconds)
+            if self._watermark is not None
+            else None
+        )
+        tokens = await repository.list_active(revoked_since=since)
+        for token in tokens:
+            self.revoke(token.jti, token.expires_at)
+            if self._watermark is None or token.revoked_at > self._watermark:
+                self._watermark = token.revoked_at
+
+        self.prune(datetime.now(timezone.utc))
+        return len(tokens)
+
+    def prune(self, now: datetime) -> None:
+        """Forget revocations of tokens that have expired anyway"""
+        for jti, expires_at in list(self._expires_at.items()):
+            if expires_at <= now:
+                self._expires_at.pop(jti, None)
+
+    def __len__(self) -> int:
+        return len(self._expires_at)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "size": len(self._expires_at),
+            "checks": self.checks,
+            "rejections": self.rejections,
+            "sync_interval_seconds": self.sync_interval_seconds,
+        }
+
+
+revocation_list = TokenRevocationList(
+    sync_interval_seconds=float(os.getenv("TOKEN_REVOCATION_SYNC_SECONDS", "5"))
+)
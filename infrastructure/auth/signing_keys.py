@@ -0,0 +1,119 @@
+import argparse
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+from jose import jwk
+from jose.backends.base import Key
+
+# EdDSA is not implemented by python-jose; ES256 gives compact signatures
+ASYMMETRIC_ALGORITHMS = ("RS256", "ES256")
+
+
+@dataclass(frozen=True)
+class SigningKey:
+    kid: str
+    algorithm: str
+    private_key: Key = field(repr=False)
+    public_key: Key = field(repr=False)
+
+    @classmethod
+    def from_pem(cls, kid: str, algorithm: str, pem: str) -> "SigningKey":
+        private_key = jwk.construct(pem, algorithm)
+        return cls(kid, algorithm, private_key, private_key.public_key())
+
+    def public_jwk(self) -> Dict[str, Any]:
+        return {
+            **self.public_key.to_dict(),
+            "kid": self.kid,
+            "use": "sig",
+            "alg": self.algorithm,
+        }
+
+
+class KeyRing:
+    """Signing keys by ``kid``: one signs new tokens, all verify existing ones
+
+    Rotating means adding a key and making it active while the previous key
+    stays in the ring until tokens signed with it have expired.
+    """
+
+    def __init__(self, keys: Dict[str, SigningKey], active_kid: str):
+        if active_kid not in keys:
+            raise ValueError(f"Active signing key '{active_kid}' is not loaded")
+        self._keys = dict(keys)
+        self.active = keys[active_kid]
+        self._jwks = {"keys": [key.public_jwk() for key in self._keys.values()]}
+
+    @classmethod
+    def from_directory(
+        cls, path: str, algorithm: str, active_kid: Optional[str] = None
+    ) -> "KeyRing":
+        """Load ``<kid>.pem`` files; by default the last kid in sort order signs"""
+        if algorithm not in ASYMMETRIC_ALGORITHMS:
+            raise ValueError(
+                f"Signing algorithm must be one of {', '.join(ASYMMETRIC_ALGORITHMS)}"
+            )
+        keys = {
+            pem_file.stem: SigningKey.from_pem(
+                pem_file.stem, algorithm, pem_file.read_text()
+            )
+            for pem_file in sorted(Path(path).glob("*.pem"))
+        }
+        if not keys:
+            raise ValueError(f"No signing keys found in {path}")
+        return cls(keys, active_kid or list(keys)[-1])
+
+    def get(self, kid: Optional[str]) -> Optional[SigningKey]:
+        return self._keys.get(kid) if kid else None
+
+    def jwks(self) -> Dict[str, Any]:
+        """Public keys as a JSON Web Key Set"""
+        return self._jwks
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+def generate_private_key_pem(algorithm: str) -> str:
+    if algorithm == "RS256":
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    elif algorithm == "ES256":
+        private_key = ec.generate_private_key(ec.SECP256R1())
+    else:
+        raise ValueError(
+            f"Signing algorithm must be one of {', '.join(ASYMMETRIC_ALGORITHMS)}"
+        )
+    return private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+
+
+def main() -> None:  # pragma: no cover
+    parser = argparse.ArgumentParser(description="Generate a JWT signing key")
+    parser.add_argument("kid", help="Key ID, e.g. the current date (2026-10-16)")
+    parser.add_argument(
+        "--algorithm",
+        default="RS256",
+        choices=ASYMMETRIC_ALGORITHMS,
+    )
+    parser.add_argument("--keys-dir", default=os.getenv("JWT_KEYS_DIR", "keys"))
+    args = parser.parse_args()
+
+    keys_dir = Path(args.keys_dir)
+    keys_dir.mkdir(parents=True, exist_ok=True)
+    pem_file = keys_dir / f"{args.kid}.pem"
+    if pem_file.exists():
+        parser.error(f"{pem_file} already exists")
+    pem_file.write_text(generate_private_key_pem(args.algorithm))
+    pem_file.chmod(0o600)
+    print(f"Wrote {pem_file}")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -1,10 +1,23 @@
 import os
-from typing import AsyncGenerator
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, AsyncIterator
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.orm import sessionmaker
 
+from infrastructure.config.database import database_config
+from infrastructure.database.engine import create_engine_from_config, log_engine_settings
+from infrastructure.database.replicas import (
+    COMMIT_LSN_QUERY,
+    CONSISTENCY_TOKEN_HEADER,
+    ReplicaPool,
+    RoutingSession,
+    make_consistency_token,
+    parse_consistency_token,
+)
+
 def get_database_url():
     """Get database URL with fallback to test database if TESTING is set."""
     if os.getenv("TESTING"):
@@ -21,18 +34,62 @@ DATABASE_URL = get_database_url()
 
 Base = declarative_base()
 
-engine = create_async_engine(
-    DATABASE_URL, echo=True, future=True  # Set to False in production
+engine = create_engine_from_config(database_config, DATABASE_URL)
+
+replica_pool = ReplicaPool(
+    [
+        create_engine_from_config(database_config, url)
+        for url in database_config.replica_urls
+    ],
+    max_lag_seconds=database_config.replica_max_lag_seconds,
+)
+
+async_session_maker = sessionmaker(
+    engine,
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    expire_on_commit=False,
 )
 
-async_session_maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+# Connections from this engine open READ ONLY transactions; the setting is
+# reset when they return to the shared pool
+read_only_engine = engine.execution_options(
+    postgresql_readonly=True,
+    postgresql_deferrable=database_config.read_only_deferrable,
+)
+
+read_session_maker = sessionmaker(
+    read_only_engine,
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    expire_on_commit=False,
+)
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+def _route_reads_to_replicas(session: AsyncSession, request: Request) -> None:
+    # Only requests that cannot write may read from a replica
+    if replica_pool and request.method in SAFE_METHODS:
+        session.info["replicas"] = replica_pool
+        session.info["consistency_token"] = parse_consistency_token(
+            request.headers.get(CONSISTENCY_TOKEN_HEADER)
+        )
 
 
-async def get_session() -> AsyncGenerator[AsyncSession, None]:  # pragma: no cover
+async def get_session(
+    request: Request,
+) -> AsyncGenerator[AsyncSession, None]:  # pragma: no cover
     async with async_session_maker() as session:
+        _route_reads_to_replicas(session, request)
         try:
             yield session
             await session.commit()
+            if replica_pool and request.method not in SAFE_METHODS:
+                # Taken only after the commit, so any replica that has
+                # replayed up to it contains this request's writes
+                lsn = await session.scalar(COMMIT_LSN_QUERY)
+                request.state.consistency_token = make_consistency_token(lsn)
         except Exception:
             await session.rollback()
             raise
@@ -40,6 +97,25 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:  # pragma: no cov
             await session.close()
 
 
+@asynccontextmanager
+async def read_session_scope(
+    request: Request,
+) -> AsyncIterator[AsyncSession]:  # pragma: no cover
+    """Read-only session opened outside dependencies, e.g. by a streamed body"""
+    async with read_session_maker() as session:
+        _route_reads_to_replicas(session, request)
+        # Closing rolls back the read-only transaction, which is all it needs
+        yield session
+
+
+async def get_read_session(
+    request: Request,
+) -> AsyncGenerator[AsyncSession, None]:  # pragma: no cover
+    """Session for handlers that only read; it is never committed"""
+    async with read_session_scope(request) as session:
+        yield session
+
+
 async def create_tables():  # pragma: no cover
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
@@ -48,3 +124,15 @@ async def create_tables():  # pragma: no cover
 async def drop_tables():  # pragma: no cover
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
+
+
+def log_database_settings():  # pragma: no cover
+    log_engine_settings(database_config, engine.url)
+    for replica in replica_pool.replicas:
+        log_engine_settings(database_config, replica.engine.url)
+
+
+async def dispose_engines():  # pragma: no cover
+    await engine.dispose()
+    for replica in replica_pool.replicas:
+        await replica.engine.dispose()
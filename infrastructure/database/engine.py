@@ -0,0 +1,40 @@
+import logging
+from typing import Union
+
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from infrastructure.config.database import DatabaseConfig
+
+logger = logging.getLogger(__name__)
+
+
+def create_engine_from_config(config: DatabaseConfig, url: str) -> AsyncEngine:
+    """Build the async engine from the configured pool and driver settings"""
+    return create_async_engine(url, future=True, **config.engine_options())
+
+
+def log_engine_settings(config: DatabaseConfig, url: Union[str, URL]) -> None:
+    """Log the settings an engine built by ``create_engine_from_config`` uses
+
+    Called at application startup rather than when the engine is built, which
+    happens on import, before logging is configured.
+    """
+    options = config.engine_options()
+    connect_args = options["connect_args"]
+    logger.info(
+        "Database engine for %s (profile=%s): pool_size=%d max_overflow=%d "
+        "pool_timeout=%ds pool_recycle=%ds pool_pre_ping=%s echo=%s "
+        "statement_cache_size=%d connect_timeout=%.1fs command_timeout=%.1fs",
+        make_url(url).render_as_string(hide_password=True),
+        config.profile,
+        options["pool_size"],
+        options["max_overflow"],
+        options["pool_timeout"],
+        options["pool_recycle"],
+        options["pool_pre_ping"],
+        options["echo"],
+        connect_args["statement_cache_size"],
+        connect_args["timeout"],
+        connect_args["command_timeout"],
+    )
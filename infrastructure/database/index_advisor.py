@@ -0,0 +1,305 @@
+import argparse
+import asyncio
+import json
+import sys
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from domain.entities.task import Task
+from domain.entities.user import User
+from domain.value_objects.email import Email
+from domain.value_objects.task_changes import TaskChanges
+from domain.value_objects.task_cursor import TaskCursor
+from infrastructure.repositories.task_repository_impl import TaskRepositoryImpl
+from infrastructure.repositories.user_repository_impl import UserRepositoryImpl
+
+# Plan nodes that mean no index matches the query shape
+FLAGGED_NODE_TYPES = ("Seq Scan", "Sort", "Incremental Sort")
+
+# Steps ranking their matches by relevance, so only scans are flagged for
+# these: the GIN index behind search finds the rows but cannot return them
+# in order, and the user lookup sorts the few candidates its two trigram
+# indexes return
+RANKED_STEPS = frozenset(
+    {
+        "TaskRepositoryImpl.search",
+        "UserRepositoryImpl.search_by_email_or_username",
+    }
+)
+
+
+@dataclass(frozen=True)
+class CapturedStatement:
+    label: str
+    statement: str
+    parameters: Any
+
+
+@dataclass(frozen=True)
+class PlanFinding:
+    label: str
+    node_type: str
+    detail: str
+
+    def __str__(self) -> str:
+        return f"{self.label}: {self.node_type} {self.detail}".rstrip()
+
+
+def _walk(node: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    yield node
+    for child in node.get("Plans", []):
+        yield from _walk(child)
+
+
+def find_plan_problems(
+    label: str,
+    plan: Dict[str, Any],
+    flagged: Tuple[str, ...] = FLAGGED_NODE_TYPES,
+) -> List[PlanFinding]:
+    """Sequential scans and sorts in an ``EXPLAIN (FORMAT JSON)`` plan"""
+    findings = []
+    for node in _walk(plan["Plan"]):
+        node_type = node["Node Type"]
+        if node_type not in flagged:
+            continue
+        if node_type == "Seq Scan":
+            detail = f"on {node.get('Relation Name', '?')}"
+        else:
+            detail = f"by {', '.join(node.get('Sort Key', []))}"
+        findings.append(PlanFinding(label, node_type, detail))
+    return findings
+
+
+class StatementRecorder:
+    """Collects the SQL the repositories send, tagged with the current step"""
+
+    def __init__(self):
+        self.label: Optional[str] = None
+        self.statements: List[CapturedStatement] = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        if self.label is not None and not executemany:
+            self.statements.append(CapturedStatement(self.label, statement, parameters))
+
+
+async def _drain(batches: AsyncIterator[Any]) -> None:
+    async for _ in batches:
+        pass
+
+
+def _repository_steps(
+    session: AsyncSession,
+) -> List[Tuple[str, Callable[[], Awaitable[Any]]]]:
+    """One call to every repository method, against a throwaway user"""
+    users = UserRepositoryImpl(session)
+    tasks = TaskRepositoryImpl(session)
+    suffix = uuid.uuid4().hex[:12]
+    user = User.create(
+        Email(f"index-advisor-{suffix}@example.com"), f"advisor_{suffix}", "unused"
+    )
+    task = Task.create(user.id, "Index advisor")
+    now = datetime.now(timezone.utc)
+    cursor = TaskCursor(now, str(task.id))
+    completed_cursor = TaskCursor(now, str(task.id), True)
+    modified_cursor = TaskCursor(now, str(task.id), sort="updated_at")
+    title_cursor = TaskCursor(task.title, str(task.id), sort="title")
+
+    return [
+        ("UserRepositoryImpl.create_unique", lambda: users.create_unique(user)),
+        ("UserRepositoryImpl.get_by_id", lambda: users.get_by_id(user.id)),
+        ("UserRepositoryImpl.get_by_email", lambda: users.get_by_email(user.email)),
+        (
+            "UserRepositoryImpl.get_credentials_by_email",
+            lambda: users.get_credentials_by_email(user.email),
+        ),
+        (
+            "UserRepositoryImpl.get_by_username",
+            lambda: users.get_by_username(user.username),
+        ),
+        (
+            "UserRepositoryImpl.exists_by_email",
+            lambda: users.exists_by_email(user.email),
+        ),
+        (
+            "UserRepositoryImpl.exists_by_username",
+            lambda: users.exists_by_username(user.username),
+        ),
+        (
+            "UserRepositoryImpl.get_token_version",
+            lambda: users.get_token_version(user.id),
+        ),
+        (
+            "UserRepositoryImpl.search_by_email_or_username",
+            lambda: users.search_by_email_or_username("advisor"),
+        ),
+        ("UserRepositoryImpl.update", lambda: users.update(user)),
+        ("UserRepositoryImpl.list_all", lambda: users.list_all()),
+        ("TaskRepositoryImpl.create", lambda: tasks.create(task)),
+        (
+            "TaskRepositoryImpl.create_many",
+            lambda: tasks.create_many([Task.create(user.id, "Index advisor bulk")]),
+        ),
+        ("TaskRepositoryImpl.get_by_id", lambda: tasks.get_by_id(task.id)),
+        ("TaskRepositoryImpl.get_owned", lambda: tasks.get_owned(task.id, user.id)),
+        ("TaskRepositoryImpl.exists", lambda: tasks.exists(task.id)),
+        ("TaskRepositoryImpl.get_by_user_id", lambda: tasks.get_by_user_id(user.id)),
+        (
+            "TaskRepositoryImpl.get_page",
+            lambda: tasks.get_page(user.id, with_counts=True),
+        ),
+        (
+            "TaskRepositoryImpl.get_page(completed=False, after)",
+            lambda: tasks.get_page(user.id, completed=False, after=cursor),
+        ),
+        (
+            "TaskRepositoryImpl.get_page(completed=True, after)",
+            lambda: tasks.get_page(user.id, completed=True, after=completed_cursor),
+        ),
+        (
+            "TaskRepositoryImpl.get_page(created range)",
+            lambda: tasks.get_page(
+                user.id, created_after=now - timedelta(days=7), created_before=now
+            ),
+        ),
+        (
+            "TaskRepositoryImpl.get_page(sort=updated_at, updated_since, after)",
+            lambda: tasks.get_page(
+                user.id,
+                after=modified_cursor,
+                sort="updated_at",
+                updated_since=now - timedelta(days=7),
+            ),
+        ),
+        (
+            "TaskRepositoryImpl.get_page(sort=title, after)",
+            lambda: tasks.get_page(user.id, after=title_cursor, sort="title"),
+        ),
+        (
+            "TaskRepositoryImpl.stream_by_user_id",
+            lambda: _drain(tasks.stream_by_user_id(user.id)),
+        ),
+        (
+            "TaskRepositoryImpl.count_by_user_id",
+            lambda: tasks.count_by_user_id(user.id),
+        ),
+        (
+            "TaskRepositoryImpl.get_completed_by_user_id",
+            lambda: tasks.get_completed_by_user_id(user.id),
+        ),
+        (
+            "TaskRepositoryImpl.get_pending_by_user_id",
+            lambda: tasks.get_pending_by_user_id(user.id),
+        ),
+        (
+            "TaskRepositoryImpl.search",
+            lambda: tasks.search(user.id, "index advisor"),
+        ),
+        (
+            "TaskRepositoryImpl.search_by_title",
+            lambda: tasks.search_by_title(user.id, "advis"),
+        ),
+        ("TaskRepositoryImpl.update", lambda: tasks.update(task)),
+        (
+            "TaskRepositoryImpl.update_owned",
+            lambda: tasks.update_owned(
+                task.id, user.id, TaskChanges.from_fields({"completed": True})
+            ),
+        ),
+        (
+            "TaskRepositoryImpl.update_many",
+            lambda: tasks.update_many(
+                user.id, TaskChanges.from_fields({"title": "Advised"}), [task.id]
+            ),
+        ),
+        (
+            "TaskRepositoryImpl.update_many(completed=True)",
+            lambda: tasks.update_many(
+                user.id, TaskChanges.from_fields({"completed": True})
+            ),
+        ),
+        (
+            "TaskRepositoryImpl.delete_owned",
+            lambda: tasks.delete_owned(task.id, user.id),
+        ),
+        ("TaskRepositoryImpl.delete", lambda: tasks.delete(task.id)),
+        ("UserRepositoryImpl.delete", lambda: users.delete(user.id)),
+    ]
+
+
+async def advise(session: AsyncSession) -> List[PlanFinding]:
+    """Explain every repository statement and report what no index serves
+
+    The workload runs in a transaction that is rolled back. Sequential scans
+    are disabled while explaining so tiny development tables do not hide a
+    missing index behind a cheap full scan.
+    """
+    connection = await session.connection()
+    sync_engine = connection.engine.sync_engine
+    recorder = StatementRecorder()
+    event.listen(sync_engine, "before_cursor_execute", recorder)
+    try:
+        for label, step in _repository_steps(session):
+            recorder.label = label
+            await step()
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", recorder)
+
+    findings = []
+    try:
+        await session.execute(text("SET LOCAL enable_seqscan = off"))
+        for captured in recorder.statements:
+            result = await connection.exec_driver_sql(
+                f"EXPLAIN (FORMAT JSON) {captured.statement}", captured.parameters
+            )
+            plan = result.scalar_one()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            flagged = (
+                ("Seq Scan",) if captured.label in RANKED_STEPS else FLAGGED_NODE_TYPES
+            )
+            findings.extend(find_plan_problems(captured.label, plan[0], flagged))
+    finally:
+        await session.rollback()
+    return findings
+
+
+async def _advise() -> List[PlanFinding]:  # pragma: no cover
+    from infrastructure.database.base import async_session_maker, dispose_engines
+
+    try:
+        async with async_session_maker() as session:
+            return await advise(session)
+    finally:
+        await dispose_engines()
+
+
+def main() -> None:  # pragma: no cover
+    argparse.ArgumentParser(
+        description="Report repository queries that scan or sort without an index"
+    ).parse_args()
+
+    findings = asyncio.run(_advise())
+    for finding in findings:
+        print(finding)
+    if findings:
+        sys.exit(1)
+    print("Every repository statement is served by an index")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -1,12 +1,32 @@
 import uuid
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, String, Text
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import (
+    DDL,
+    Boolean,
+    CheckConstraint,
+    Column,
+    Computed,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    event,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 
 from infrastructure.database.base import Base
 
+# Text search configuration for the stored task vectors and search queries
+TASK_SEARCH_CONFIG = "english"
+
+# Trigram operator class behind the substring (ILIKE) indexes; GiST rather
+# than GIN so the indexes also return matches closest first (``<->``)
+TRIGRAM_OPS = "gist_trgm_ops"
+
 
 class UserModel(Base):
     __tablename__ = "users"
@@ -18,6 +38,7 @@ class UserModel(Base):
     username = Column(String(50), unique=True, nullable=False, index=True)
     hashed_password = Column(String(255), nullable=False)
     is_active = Column(Boolean, default=True, nullable=False)
+    token_version = Column(Integer, default=0, server_default="0", nullable=False)
     created_at = Column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
@@ -27,7 +48,35 @@ class UserModel(Base):
         "TaskModel", back_populates="user", cascade="all, delete-orphan"
     )
 
-    __table_args__ = (Index("ix_users_email_active", "email", "is_active"),)
+    __table_args__ = (
+        Index(
+            "ix_users_email_credentials",
+            "email",
+            postgresql_include=[
+                "id",
+                "username",
+                "hashed_password",
+                "is_active",
+                "token_version",
+                "created_at",
+                "updated_at",
+            ],
+        ),
+        # Substring lookups for support tooling; exact matches keep using the
+        # unique indexes
+        Index(
+            "ix_users_email_trgm",
+            "email",
+            postgresql_using="gist",
+            postgresql_ops={"email": TRIGRAM_OPS},
+        ),
+        Index(
+            "ix_users_username_trgm",
+            "username",
+            postgresql_using="gist",
+            postgresql_ops={"username": TRIGRAM_OPS},
+        ),
+    )
 
 
 class TaskModel(Base):
@@ -46,11 +95,218 @@ class TaskModel(Base):
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Maintained by Postgres; deferred so task reads do not carry it around
+    search_vector = deferred(
+        Column(
+            TSVECTOR,
+            Computed(
+                f"setweight(to_tsvector('{TASK_SEARCH_CONFIG}', "
+                "coalesce(title, '')), 'A') || "
+                f"setweight(to_tsvector('{TASK_SEARCH_CONFIG}', "
+                "coalesce(description, '')), 'B')",
+                persisted=True,
+            ),
+        )
+    )
 
     user = relationship("UserModel", back_populates="tasks")
 
+
+# Time of a task's last change, falling back to its creation for rows never
+# updated; completed tasks are listed by it as their completion time
+modified_sort_key = func.coalesce(TaskModel.updated_at, TaskModel.created_at)
+
+# Keyset pagination indexes, one per listing of GET /tasks. Each leads with
+# user_id, so they also serve the foreign key and per-user lookups
+Index(
+    "ix_tasks_user_created_id",
+    TaskModel.user_id,
+    TaskModel.created_at.desc(),
+    TaskModel.id.desc(),
+)
+Index(
+    "ix_tasks_user_pending_created_id",
+    TaskModel.user_id,
+    TaskModel.created_at.desc(),
+    TaskModel.id.desc(),
+    postgresql_where=TaskModel.completed.is_(False),
+)
+Index(
+    "ix_tasks_user_completed_sort_id",
+    TaskModel.user_id,
+    modified_sort_key.desc(),
+    TaskModel.id.desc(),
+    postgresql_where=TaskModel.completed.is_(True),
+)
+Index(
+    "ix_tasks_user_modified_id",
+    TaskModel.user_id,
+    modified_sort_key.desc(),
+    TaskModel.id.desc(),
+)
+Index("ix_tasks_user_title_id", TaskModel.user_id, TaskModel.title, TaskModel.id)
+
+# btree_gin lets user_id share the GIN index, so a common term only reads
+# the searching user's matches instead of every tenant's
+Index(
+    "ix_tasks_user_search_vector",
+    TaskModel.user_id,
+    TaskModel.search_vector,
+    postgresql_using="gin",
+)
+Index(
+    "ix_tasks_user_title_trgm",
+    TaskModel.user_id,
+    TaskModel.title,
+    postgresql_using="gist",
+    postgresql_ops={"title": TRIGRAM_OPS},
+)
+
+# The trigram operator classes, and btree_gist/btree_gin for the user_id
+# columns of GiST and GIN indexes, must exist before create_all builds the
+# indexes; migrations create the extensions for everything else
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS btree_gist").execute_if(dialect="postgresql"),
+)
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS btree_gin").execute_if(dialect="postgresql"),
+)
+
+
+class UserTaskCountersModel(Base):
+    """Per-user task totals, kept exact by triggers on the tasks table"""
+
+    __tablename__ = "user_task_counters"
+
+    user_id = Column(
+        UUID(as_uuid=False),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    total = Column(Integer, default=0, server_default="0", nullable=False)
+    completed = Column(Integer, default=0, server_default="0", nullable=False)
+
+    __table_args__ = (
+        CheckConstraint("total >= 0", name="ck_user_task_counters_total"),
+        CheckConstraint(
+            "completed >= 0 AND completed <= total",
+            name="ck_user_task_counters_completed",
+        ),
+    )
+
+
+# Statement-level triggers apply one grouped delta per user and statement, so
+# bulk writes touch each counters row once, in user order to avoid deadlocks.
+# Updates that change neither the owner nor the completed flag write nothing.
+TASK_COUNTERS_FUNCTION = """
+CREATE OR REPLACE FUNCTION apply_user_task_counters() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO user_task_counters AS c (user_id, total, completed)
+        SELECT user_id, count(*), count(*) FILTER (WHERE completed)
+        FROM new_rows GROUP BY user_id ORDER BY user_id
+        ON CONFLICT (user_id) DO UPDATE
+        SET total = c.total + EXCLUDED.total,
+            completed = c.completed + EXCLUDED.completed;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE user_task_counters AS c
+        SET total = c.total - d.total, completed = c.completed - d.completed
+        FROM (
+            SELECT user_id, count(*) AS total,
+                   count(*) FILTER (WHERE completed) AS completed
+            FROM old_rows GROUP BY user_id
+        ) AS d
+        WHERE c.user_id = d.user_id;
+    ELSE
+        -- Deltas can be negative, so they must not be proposed as new rows:
+        -- CHECK constraints apply to those before ON CONFLICT is resolved
+        UPDATE user_task_counters AS c
+        SET total = c.total + d.total, completed = c.completed + d.completed
+        FROM (
+            SELECT user_id, sum(total) AS total, sum(completed) AS completed
+            FROM (
+                SELECT user_id, 1 AS total, completed::int AS completed
+                FROM new_rows
+                UNION ALL
+                SELECT user_id, -1, -completed::int FROM old_rows
+            ) AS changes
+            GROUP BY user_id
+            HAVING sum(total) <> 0 OR sum(completed) <> 0
+        ) AS d
+        WHERE c.user_id = d.user_id;
+        -- Owners without a counters row yet start from their actual counts
+        INSERT INTO user_task_counters (user_id, total, completed)
+        SELECT t.user_id, count(*), count(*) FILTER (WHERE t.completed)
+        FROM tasks AS t
+        WHERE t.user_id IN (SELECT user_id FROM new_rows)
+          AND NOT EXISTS (
+              SELECT 1 FROM user_task_counters AS c WHERE c.user_id = t.user_id
+          )
+        GROUP BY t.user_id
+        ORDER BY t.user_id
+        ON CONFLICT (user_id) DO NOTHING;
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+
+TASK_COUNTERS_TRIGGERS = {
+    "INSERT": "REFERENCING NEW TABLE AS new_rows",
+    "UPDATE": "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows",
+    "DELETE": "REFERENCING OLD TABLE AS old_rows",
+}
+
+
+def _task_counters_ddl():
+    """Statements installing the counters function and its triggers"""
+    yield DDL(TASK_COUNTERS_FUNCTION)
+    for operation, transition_tables in TASK_COUNTERS_TRIGGERS.items():
+        trigger = f"tasks_counters_{operation.lower()}"
+        yield DDL(f"DROP TRIGGER IF EXISTS {trigger} ON tasks")
+        yield DDL(
+            f"CREATE TRIGGER {trigger} AFTER {operation} ON tasks "
+            f"{transition_tables} FOR EACH STATEMENT "
+            "EXECUTE FUNCTION apply_user_task_counters()"
+        )
+
+
+# Installed after create_all so test and development databases get the
+# triggers too; migrations install them for everything else
+for _ddl in _task_counters_ddl():
+    event.listen(Base.metadata, "after_create", _ddl.execute_if(dialect="postgresql"))
+event.listen(
+    Base.metadata,
+    "after_drop",
+    DDL("DROP FUNCTION IF EXISTS apply_user_task_counters()").execute_if(
+        dialect="postgresql"
+    ),
+)
+
+
+class RevokedTokenModel(Base):
+    __tablename__ = "revoked_tokens"
+
+    jti = Column(String(64), primary_key=True)
+    user_id = Column(
+        UUID(as_uuid=False), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    revoked_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
     __table_args__ = (
-        Index("ix_tasks_user_id", "user_id"),
-        Index("ix_tasks_user_completed", "user_id", "completed"),
-        Index("ix_tasks_created_at", "created_at"),
+        Index("ix_revoked_tokens_revoked_at", "revoked_at"),
+        Index("ix_revoked_tokens_expires_at", "expires_at"),
     )
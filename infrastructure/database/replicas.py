@@ -0,0 +1,191 @@
+import asyncio
+import itertools
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import Select, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Sent after writes and echoed back by clients that need to read their writes
+CONSISTENCY_TOKEN_HEADER = "X-Consistency-Token"
+
+# The WAL position a replica has replayed up to, as a byte offset, and the
+# seconds since the last transaction it replayed. The lag only decides health;
+# read-your-writes relies on the position. A server that is not a standby
+# reports its own WAL position and no lag.
+PROBE_QUERY = text(
+    "SELECT CASE WHEN pg_is_in_recovery() "
+    "THEN pg_last_wal_replay_lsn() ELSE pg_current_wal_lsn() END - '0/0'::pg_lsn, "
+    "CASE WHEN pg_is_in_recovery() AND "
+    "pg_last_wal_receive_lsn() IS DISTINCT FROM pg_last_wal_replay_lsn() "
+    "THEN EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+# Each half of a pg_lsn is a 32-bit word
+_WORD = 0xFFFFFFFF
+
+# Run on the primary after a commit; every record of the committed
+# transaction lies before this position
+COMMIT_LSN_QUERY = text("SELECT pg_current_wal_insert_lsn() - '0/0'::pg_lsn")
+
+
+@dataclass
+class Replica:
+    name: str
+    engine: AsyncEngine
+    healthy: bool = False
+    lag_seconds: float = 0.0
+    # WAL position the replica had replayed at the last probe; it only grows
+    replayed_lsn: int = 0
+    reads: int = 0
+    failures: int = 0
+
+
+class ReplicaPool:
+    """Read replicas with health and lag tracked by a periodic probe"""
+
+    def __init__(
+        self,
+        engines: Sequence[AsyncEngine],
+        max_lag_seconds: float = 5.0,
+        probe_timeout_seconds: float = 2.0,
+    ):
+        self.replicas: List[Replica] = [
+            Replica(make_url(engine.url).render_as_string(hide_password=True), engine)
+            for engine in engines
+        ]
+        self.max_lag_seconds = max_lag_seconds
+        self.probe_timeout_seconds = probe_timeout_seconds
+        self._round_robin = itertools.count()
+        self.primary_fallbacks = 0
+
+    def choose(self, consistency_token: Optional[int] = None) -> Optional[Replica]:
+        """Pick a healthy replica, or None if reads must go to the primary
+
+        With a consistency token only replicas known to have replayed the
+        primary's WAL up to that position qualify, so a client reads its own
+        writes.
+        """
+        candidates = [
+            replica
+            for replica in self.replicas
+            if replica.healthy
+            and (consistency_token is None or replica.replayed_lsn >= consistency_token)
+        ]
+        if not candidates:
+            self.primary_fallbacks += 1
+            return None
+
+        replica = candidates[next(self._round_robin) % len(candidates)]
+        replica.reads += 1
+        return replica
+
+    async def probe(self) -> None:
+        await asyncio.gather(*(self._probe(replica) for replica in self.replicas))
+
+    async def _probe(self, replica: Replica) -> None:
+        try:
+            async with replica.engine.connect() as conn:
+                result = await asyncio.wait_for(
+                    conn.execute(PROBE_QUERY), self.probe_timeout_seconds
+                )
+                replayed_lsn, lag = result.one()
+        except Exception as e:
+            if replica.healthy:
+                logger.warning(
+                    "Replica %s failed its health probe: %s", replica.name, e
+                )
+            replica.healthy = False
+            replica.failures += 1
+            return
+
+        replica.lag_seconds = float(lag or 0)
+        replica.replayed_lsn = max(replica.replayed_lsn, int(replayed_lsn or 0))
+        healthy = replica.lag_seconds <= self.max_lag_seconds
+        if replica.healthy and not healthy:
+            logger.warning(
+                "Replica %s is %.1fs behind, routing reads elsewhere",
+                replica.name,
+                replica.lag_seconds,
+            )
+        replica.healthy = healthy
+
+    def __len__(self) -> int:
+        return len(self.replicas)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_lag_seconds": self.max_lag_seconds,
+            "primary_fallbacks": self.primary_fallbacks,
+            "replicas": [
+                {
+                    "name": replica.name,
+                    "healthy": replica.healthy,
+                    "lag_seconds": round(replica.lag_seconds, 3),
+                    "reads": replica.reads,
+                    "failures": replica.failures,
+                }
+                for replica in self.replicas
+            ],
+        }
+
+
+def parse_consistency_token(value: Optional[str]) -> Optional[int]:
+    """Read a client's consistency token, ignoring malformed values
+
+    Tokens are WAL positions in Postgres' ``pg_lsn`` notation, e.g.
+    ``16/B374D848``.
+    """
+    if not value:
+        return None
+    high, separator, low = value.partition("/")
+    try:
+        high_word, low_word = int(high, 16), int(low, 16)
+    except ValueError:
+        return None
+    if not separator or not (0 <= high_word <= _WORD and 0 <= low_word <= _WORD):
+        return None
+    return (high_word << 32) + low_word
+
+
+def make_consistency_token(lsn: int) -> str:
+    return f"{lsn >> 32:X}/{lsn & _WORD:X}"
+
+
+class RoutingSession(Session):
+    """Session that sends plain reads to a replica and everything else to the primary
+
+    Replica routing is opt-in per session: it applies only when
+    ``info["replicas"]`` holds a ReplicaPool. Once a session writes, runs raw
+    SQL or finds no suitable replica, it stays on the primary so it keeps
+    seeing its own changes.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        replica = self._replica_for(clause)
+        if replica is not None:
+            return replica.engine.sync_engine
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+
+    def _replica_for(self, clause: Any) -> Optional[Replica]:
+        pool: Optional[ReplicaPool] = self.info.get("replicas")
+        if pool is None or self.info.get("use_primary") or self._flushing:
+            return None
+        if not isinstance(clause, Select):
+            self.info["use_primary"] = True
+            return None
+
+        # Stick to one replica so the request reads a single consistent view
+        replica = self.info.get("replica")
+        if replica is None:
+            replica = pool.choose(self.info.get("consistency_token"))
+            if replica is None:
+                self.info["use_primary"] = True
+                return None
+            self.info["replica"] = replica
+        return replica
@@ -0,0 +1,66 @@
+import argparse
+import asyncio
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Recount from the tasks table and rewrite only the rows that drifted
+REPAIR_QUERY = """
+INSERT INTO user_task_counters AS c (user_id, total, completed)
+SELECT u.id, count(t.id), count(t.id) FILTER (WHERE t.completed)
+FROM users AS u
+LEFT JOIN tasks AS t ON t.user_id = u.id
+{where}
+GROUP BY u.id
+ORDER BY u.id
+ON CONFLICT (user_id) DO UPDATE
+SET total = EXCLUDED.total, completed = EXCLUDED.completed
+WHERE (c.total, c.completed) IS DISTINCT FROM (EXCLUDED.total, EXCLUDED.completed)
+"""
+
+
+async def repair_task_counters(
+    session: AsyncSession, user_id: Optional[str] = None
+) -> int:
+    """Backfill or correct task counters, returning how many rows changed
+
+    Task writes are blocked until the session commits so no trigger delta
+    lands between the recount and the rewrite.
+    """
+    await session.execute(text("LOCK TABLE tasks IN SHARE MODE"))
+    if user_id is None:
+        stmt = text(REPAIR_QUERY.format(where=""))
+    else:
+        stmt = text(
+            REPAIR_QUERY.format(where="WHERE u.id = CAST(:user_id AS uuid)")
+        ).bindparams(user_id=user_id)
+    result = await session.execute(stmt)
+    return result.rowcount
+
+
+async def _repair(user_id: Optional[str]) -> int:  # pragma: no cover
+    from infrastructure.database.base import async_session_maker, dispose_engines
+
+    try:
+        async with async_session_maker() as session:
+            repaired = await repair_task_counters(session, user_id)
+            await session.commit()
+        return repaired
+    finally:
+        await dispose_engines()
+
+
+def main() -> None:  # pragma: no cover
+    parser = argparse.ArgumentParser(
+        description="Recompute per-user task counters from the tasks table"
+    )
+    parser.add_argument("--user-id", help="Repair a single user only")
+    args = parser.parse_args()
+
+    repaired = asyncio.run(_repair(args.user_id))
+    print(f"Repaired {repaired} task counter row(s)")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
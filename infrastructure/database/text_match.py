@@ -0,0 +1,36 @@
+import re
+
+# LIKE's default escape character, so patterns need no ESCAPE clause
+LIKE_ESCAPE = "\\"
+
+# pg_trgm only extracts trigrams from runs of letters and digits this long;
+# a pattern without one cannot use a trigram index and scans every row
+TRIGRAM_LENGTH = 3
+_TRIGRAM_WORD = re.compile(r"[^\W_]{%d}" % TRIGRAM_LENGTH)
+
+
+def contains_pattern(fragment: str) -> str:
+    """A LIKE/ILIKE pattern matching ``fragment`` literally anywhere in a value
+
+    Wildcards in the fragment are escaped, so ``50%`` does not match ``500``.
+    """
+    escaped = (
+        fragment.replace(LIKE_ESCAPE, LIKE_ESCAPE * 2)
+        .replace("%", LIKE_ESCAPE + "%")
+        .replace("_", LIKE_ESCAPE + "_")
+    )
+    return f"%{escaped}%"
+
+
+def trigram_pattern(fragment: str) -> str:
+    """``contains_pattern`` for lookups that must be served by a trigram index
+
+    Raises ``ValueError`` unless the fragment has at least three letters or
+    digits in a row.
+    """
+    if not _TRIGRAM_WORD.search(fragment):
+        raise ValueError(
+            f"Search text must contain at least {TRIGRAM_LENGTH} letters or "
+            "digits in a row"
+        )
+    return contains_pattern(fragment)
@@ -0,0 +1,106 @@
+import base64
+import hashlib
+import hmac
+import os
+from datetime import datetime
+from typing import List
+
+from domain.value_objects.task_cursor import TaskCursor, TaskSearchCursor
+
+_FILTERS = {None: "a", True: "c", False: "p"}
+_FILTERS_BY_CODE = {code: completed for completed, code in _FILTERS.items()}
+# Search cursors use their own code so they cannot resume a listing
+_SEARCH = "s"
+
+
+class CursorCodec:
+    """Serialize task cursors into opaque, tamper-proof strings
+
+    Clients get no readable sort keys and cannot forge positions; a cursor
+    also records which listing it belongs to.
+    """
+
+    def __init__(self, secret_key: str):
+        self._secret_key = secret_key.encode()
+
+    def encode(self, cursor: TaskCursor) -> str:
+        sort_key = cursor.sort_key
+        if isinstance(sort_key, datetime):
+            sort_key = sort_key.isoformat()
+        # The sort key goes last as titles may contain the separator
+        return self._seal(
+            _FILTERS[cursor.completed], cursor.sort, cursor.task_id, sort_key
+        )
+
+    def decode(self, token: str) -> TaskCursor:
+        """Parse a cursor, raising ValueError if it is malformed or tampered with"""
+        try:
+            code, sort, task_id, sort_key = self._open(token, 4)
+            if sort != "title":
+                sort_key = datetime.fromisoformat(sort_key)
+            return TaskCursor(
+                sort_key=sort_key,
+                task_id=task_id,
+                completed=_FILTERS_BY_CODE[code],
+                sort=sort,
+            )
+        except (KeyError, ValueError):
+            raise ValueError("Invalid cursor")
+
+    def encode_search(self, cursor: TaskSearchCursor) -> str:
+        return self._seal(
+            _SEARCH, repr(cursor.rank), cursor.query_digest, cursor.task_id
+        )
+
+    def decode_search(self, token: str) -> TaskSearchCursor:
+        """Parse a search cursor, raising ValueError like decode"""
+        try:
+            code, rank, query_digest, task_id = self._open(token, 4)
+            if code != _SEARCH:
+                raise ValueError("Not a search cursor")
+            return TaskSearchCursor(
+                rank=float(rank), task_id=task_id, query_digest=query_digest
+            )
+        except ValueError:
+            raise ValueError("Invalid cursor")
+
+    def _seal(self, *fields: str) -> str:
+        payload = "|".join(fields).encode()
+        return f"{_b64encode(payload)}.{_b64encode(self._sign(payload))}"
+
+    def _open(self, token: str, field_count: int) -> List[str]:
+        try:
+            encoded_payload, encoded_signature = token.split(".")
+            payload = _b64decode(encoded_payload)
+            signature = _b64decode(encoded_signature)
+        except ValueError:
+            raise ValueError("Invalid cursor")
+        if not hmac.compare_digest(signature, self._sign(payload)):
+            raise ValueError("Invalid cursor")
+        # UnicodeDecodeError is a ValueError too
+        fields = payload.decode().split("|", field_count - 1)
+        if len(fields) != field_count:
+            raise ValueError("Invalid cursor")
+        return fields
+
+    def _sign(self, payload: bytes) -> bytes:
+        return hmac.new(self._secret_key, payload, hashlib.sha256).digest()[:16]
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(data: str) -> bytes:
+    try:
+        return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+cursor_codec = CursorCodec(
+    os.getenv(
+        "CURSOR_SECRET_KEY",
+        os.getenv("JWT_SECRET_KEY", "your-secret-key-change-this-in-production"),
+    )
+)
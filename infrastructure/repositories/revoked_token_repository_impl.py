@@ -0,0 +1,74 @@
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import delete, event, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from domain.entities.revoked_token import RevokedToken
+from domain.repositories.revoked_token_repository import RevokedTokenRepository
+from domain.value_objects.user_id import UserId
+from infrastructure.auth.revocation import revocation_list
+from infrastructure.database.models import RevokedTokenModel
+
+# Session.info key of the revocations waiting for their transaction to commit
+PENDING_REVOCATIONS = "pending_revocations"
+
+
+def _apply_pending_revocations(session: Session) -> None:
+    for token in session.info.pop(PENDING_REVOCATIONS, []):
+        revocation_list.revoke(token.jti, token.expires_at)
+
+
+def _drop_pending_revocations(session: Session) -> None:
+    session.info.pop(PENDING_REVOCATIONS, None)
+
+
+event.listen(Session, "after_commit", _apply_pending_revocations)
+event.listen(Session, "after_rollback", _drop_pending_revocations)
+
+
+class RevokedTokenRepositoryImpl(RevokedTokenRepository):  # pragma: no cover
+    def __init__(self, session: AsyncSession):  # pragma: no cover
+        self.session = session
+
+    def _model_to_entity(self, model: RevokedTokenModel) -> RevokedToken:
+        return RevokedToken(
+            jti=model.jti,
+            user_id=UserId(model.user_id),
+            expires_at=model.expires_at,
+            revoked_at=model.revoked_at,
+        )
+
+    async def add(self, token: RevokedToken) -> None:
+        stmt = (
+            insert(RevokedTokenModel)
+            .values(
+                jti=token.jti,
+                user_id=str(token.user_id),
+                expires_at=token.expires_at,
+            )
+            .on_conflict_do_nothing(index_elements=[RevokedTokenModel.jti])
+        )
+        await self.session.execute(stmt)
+        # Reject the token in this worker as soon as the revocation commits,
+        # so a failed commit cannot leave it revoked here only; other workers
+        # pick it up on their next sync
+        self.session.info.setdefault(PENDING_REVOCATIONS, []).append(token)
+
+    async def list_active(
+        self, revoked_since: Optional[datetime] = None
+    ) -> List[RevokedToken]:
+        stmt = select(RevokedTokenModel).where(
+            RevokedTokenModel.expires_at > func.now()
+        )
+        if revoked_since is not None:
+            stmt = stmt.where(RevokedTokenModel.revoked_at >= revoked_since)
+        result = await self.session.execute(stmt)
+        return [self._model_to_entity(model) for model in result.scalars().all()]
+
+    async def delete_expired(self, now: datetime) -> int:
+        stmt = delete(RevokedTokenModel).where(RevokedTokenModel.expires_at <= now)
+        result = await self.session.execute(stmt)
+        return result.rowcount
@@ -1,13 +1,95 @@
-from typing import List, Optional
+import os
+import uuid
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
 
-from sqlalchemy import delete, func, select, update
+from sqlalchemy import (
+    Float,
+    and_,
+    any_,
+    bindparam,
+    case,
+    delete,
+    exists,
+    func,
+    insert,
+    literal,
+    literal_column,
+    select,
+    true,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from sqlalchemy.sql.util import ClauseAdapter
 
 from domain.entities.task import Task
-from domain.repositories.task_repository import TaskRepository
+from domain.repositories.task_repository import (
+    TaskPage,
+    TaskRepository,
+    TaskSearchPage,
+)
+from domain.value_objects.task_changes import TaskChanges
+from domain.value_objects.task_counts import TaskCounts
+from domain.value_objects.task_cursor import (
+    TaskCursor,
+    TaskSearchCursor,
+    default_sort,
+)
 from domain.value_objects.task_id import TaskId
 from domain.value_objects.user_id import UserId
-from infrastructure.database.models import TaskModel
+from infrastructure.database.models import (
+    TASK_SEARCH_CONFIG,
+    TaskModel,
+    UserTaskCountersModel,
+    modified_sort_key,
+)
+from infrastructure.database.text_match import trigram_pattern
+
+# Batches at least this large are loaded with COPY instead of INSERT; below
+# it a single multi-row INSERT stays well under the bind parameter limit
+BULK_COPY_THRESHOLD = int(os.getenv("TASK_BULK_COPY_THRESHOLD", "500"))
+
+UUID_COLUMNS = frozenset({"id", "user_id"})
+
+SORT_KEYS = {
+    "created_at": TaskModel.created_at,
+    "updated_at": modified_sort_key,
+    "title": TaskModel.title,
+}
+ASCENDING_SORTS = frozenset({"title"})
+
+# The listings GET /tasks may run, by (sort, completed filter), and the index
+# each one walks; anything else would sort or filter rows no index orders
+INDEXED_LISTINGS = {
+    ("created_at", None): "ix_tasks_user_created_id",
+    ("created_at", False): "ix_tasks_user_pending_created_id",
+    ("updated_at", None): "ix_tasks_user_modified_id",
+    ("updated_at", True): "ix_tasks_user_completed_sort_id",
+    ("title", None): "ix_tasks_user_title_id",
+}
+# Range filters bound the sort key, so each is only offered with its own sort
+RANGE_FILTER_SORTS = {
+    "created_after": "created_at",
+    "created_before": "created_at",
+    "updated_since": "updated_at",
+}
+_LISTING_NAMES = {None: "all tasks", True: "completed tasks", False: "pending tasks"}
+
+
+def check_listing(
+    sort: str, completed: Optional[bool] = None, range_filters: Iterable[str] = ()
+) -> None:
+    """Raise ValueError unless an index serves the listing and its filters"""
+    if (sort, completed) not in INDEXED_LISTINGS:
+        raise ValueError(
+            f"Sorting {_LISTING_NAMES[completed]} by {sort} is not supported"
+        )
+    for name in range_filters:
+        if RANGE_FILTER_SORTS[name] != sort:
+            raise ValueError(f"{name} requires sort={RANGE_FILTER_SORTS[name]}")
 
 
 class TaskRepositoryImpl(TaskRepository):  # pragma: no cover
@@ -43,19 +125,76 @@ class TaskRepositoryImpl(TaskRepository):  # pragma: no cover
         await self.session.refresh(model)
         return self._model_to_entity(model)
 
+    async def create_many(self, tasks: List[Task]) -> List[TaskId]:
+        # No flush or refresh per task: IDs and timestamps are generated by
+        # the entities, so nothing needs to be read back
+        if not tasks:
+            return []
+        rows = [self._entity_to_row(task) for task in tasks]
+        if len(rows) >= BULK_COPY_THRESHOLD:
+            await self._copy_rows(rows)
+        else:
+            await self.session.execute(insert(TaskModel).values(rows))
+        return [task.id for task in tasks]
+
+    def _entity_to_row(self, entity: Task) -> Dict[str, Any]:
+        return {
+            "id": str(entity.id),
+            "user_id": str(entity.user_id),
+            "title": entity.title,
+            "description": entity.description,
+            "completed": entity.completed,
+            "created_at": entity.created_at,
+            "updated_at": entity.updated_at,
+        }
+
+    async def _copy_rows(self, rows: List[Dict[str, Any]]) -> None:
+        # COPY runs on the session's own connection, inside its transaction,
+        # and fires the same triggers as INSERT
+        connection = await self.session.connection()
+        raw_connection = await connection.get_raw_connection()
+        columns = list(rows[0])
+        await raw_connection.driver_connection.copy_records_to_table(
+            TaskModel.__tablename__,
+            columns=columns,
+            records=[
+                tuple(
+                    uuid.UUID(row[column]) if column in UUID_COLUMNS else row[column]
+                    for column in columns
+                )
+                for row in rows
+            ],
+        )
+
     async def get_by_id(self, task_id: TaskId) -> Optional[Task]:
         stmt = select(TaskModel).where(TaskModel.id == str(task_id))
         result = await self.session.execute(stmt)
         model = result.scalar_one_or_none()
         return self._model_to_entity(model) if model else None
 
+    def _owned(self, task_id: TaskId, user_id: UserId):
+        # Ownership is part of the WHERE clause, so reads and writes of a task
+        # take one statement instead of a fetch and a check in Python
+        return and_(TaskModel.id == str(task_id), TaskModel.user_id == str(user_id))
+
+    async def get_owned(self, task_id: TaskId, user_id: UserId) -> Optional[Task]:
+        stmt = select(TaskModel).where(self._owned(task_id, user_id))
+        result = await self.session.execute(stmt)
+        model = result.scalar_one_or_none()
+        return self._model_to_entity(model) if model else None
+
+    async def exists(self, task_id: TaskId) -> bool:
+        stmt = select(exists().where(TaskModel.id == str(task_id)))
+        result = await self.session.execute(stmt)
+        return result.scalar_one()
+
     async def get_by_user_id(
         self, user_id: UserId, limit: int = 100, offset: int = 0
     ) -> List[Task]:
         stmt = (
             select(TaskModel)
             .where(TaskModel.user_id == str(user_id))
-            .order_by(TaskModel.created_at.desc())
+            .order_by(TaskModel.created_at.desc(), TaskModel.id.desc())
             .offset(offset)
             .limit(limit)
         )
@@ -63,6 +202,180 @@ class TaskRepositoryImpl(TaskRepository):  # pragma: no cover
         models = result.scalars().all()
         return [self._model_to_entity(model) for model in models]
 
+    async def get_page(
+        self,
+        user_id: UserId,
+        limit: int = 20,
+        completed: Optional[bool] = None,
+        after: Optional[TaskCursor] = None,
+        offset: int = 0,
+        with_counts: bool = False,
+        sort: Optional[str] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        updated_since: Optional[datetime] = None,
+    ) -> TaskPage:
+        # Keyset pagination: seek past the cursor on a composite index instead
+        # of skipping rows, so deep pages cost the same as the first one.
+        # One extra row tells whether there is a next page without counting.
+        sort = sort or default_sort(completed)
+        ranges = {
+            "created_after": created_after,
+            "created_before": created_before,
+            "updated_since": updated_since,
+        }
+        check_listing(
+            sort,
+            completed,
+            [name for name, value in ranges.items() if value is not None],
+        )
+        if after is not None and (after.sort, after.completed) != (sort, completed):
+            raise ValueError("Cursor does not match the listing")
+
+        sort_key = SORT_KEYS[sort]
+        page_stmt = select(TaskModel).where(TaskModel.user_id == str(user_id))
+        if completed is not None:
+            page_stmt = page_stmt.where(TaskModel.completed.is_(completed))
+        # Range bounds on the sort key narrow the same index scan
+        if created_after is not None:
+            page_stmt = page_stmt.where(TaskModel.created_at > created_after)
+        if created_before is not None:
+            page_stmt = page_stmt.where(TaskModel.created_at < created_before)
+        if updated_since is not None:
+            page_stmt = page_stmt.where(modified_sort_key >= updated_since)
+
+        ascending = sort in ASCENDING_SORTS
+        if ascending:
+            order_by = (sort_key.asc(), TaskModel.id.asc())
+        else:
+            order_by = (sort_key.desc(), TaskModel.id.desc())
+        if after is not None:
+            position = tuple_(sort_key, TaskModel.id)
+            # Bound as a UUID: Postgres has no uuid-to-varchar comparison
+            after_position = tuple_(
+                after.sort_key, literal(after.task_id, TaskModel.id.type)
+            )
+            page_stmt = page_stmt.where(
+                position > after_position if ascending else position < after_position
+            )
+        page_stmt = page_stmt.order_by(*order_by).offset(offset).limit(limit + 1)
+
+        counts = None
+        if with_counts:
+            models, counts = await self._fetch_page_with_counts(
+                user_id, page_stmt, order_by
+            )
+        else:
+            result = await self.session.execute(page_stmt)
+            models = list(result.scalars().all())
+
+        tasks = [self._model_to_entity(model) for model in models[:limit]]
+        next_cursor = (
+            TaskCursor.after(tasks[-1], completed, sort)
+            if len(models) > limit
+            else None
+        )
+        return TaskPage(tasks=tasks, next_cursor=next_cursor, counts=counts)
+
+    async def stream_by_user_id(
+        self, user_id: UserId, completed: Optional[bool] = None, batch_size: int = 500
+    ) -> AsyncIterator[List[Task]]:
+        # A server-side cursor hands over batch_size rows at a time, so memory
+        # stays flat however many tasks the user has, and the whole export
+        # reads one snapshot
+        stmt = select(TaskModel).where(TaskModel.user_id == str(user_id))
+        if completed is not None:
+            stmt = stmt.where(TaskModel.completed.is_(completed))
+        stmt = stmt.order_by(TaskModel.created_at.desc(), TaskModel.id.desc())
+
+        result = await self.session.stream_scalars(
+            stmt.execution_options(yield_per=batch_size)
+        )
+        async for models in result.partitions():
+            yield [self._model_to_entity(model) for model in models]
+
+    async def _fetch_page_with_counts(
+        self, user_id: UserId, page_stmt, order_by
+    ) -> Tuple[List[TaskModel], TaskCounts]:
+        # A single statement: the counts CTE reads the user's counters row,
+        # aggregated so it yields one row even before the user's first task,
+        # and the page is LEFT JOINed to it laterally so an empty page still
+        # returns the counts. The join does not preserve the page's order, so
+        # the outer query repeats it on the page's columns
+        counts = self._counts_stmt(user_id).cte("counts")
+        page = page_stmt.lateral("page")
+        page_task = aliased(TaskModel, page)
+        page_columns = ClauseAdapter(page)
+        stmt = (
+            select(counts.c.total, counts.c.completed, page_task)
+            .select_from(counts)
+            .outerjoin(page, true())
+            .order_by(*(page_columns.traverse(clause) for clause in order_by))
+        )
+
+        result = await self.session.execute(stmt)
+        rows = result.all()
+        task_counts = TaskCounts(total=rows[0].total, completed=rows[0].completed)
+        models = [row[2] for row in rows if row[2] is not None]
+        return models, task_counts
+
+    async def search(
+        self,
+        user_id: UserId,
+        query: str,
+        limit: int = 20,
+        after: Optional[TaskSearchCursor] = None,
+    ) -> TaskSearchPage:
+        # Matches come from the GIN index on search_vector; only the user's
+        # matches are ranked, and pages resume after (rank, id)
+        ts_query = func.websearch_to_tsquery(
+            literal_column(f"'{TASK_SEARCH_CONFIG}'"), query
+        )
+        rank = func.ts_rank_cd(TaskModel.search_vector, ts_query)
+        stmt = select(TaskModel, rank.label("rank")).where(
+            TaskModel.user_id == str(user_id),
+            TaskModel.search_vector.bool_op("@@")(ts_query),
+        )
+        if after is not None:
+            if not after.matches(query):
+                raise ValueError("Cursor does not match the search")
+            # Bound as a UUID: Postgres has no uuid-to-varchar comparison
+            stmt = stmt.where(
+                tuple_(rank, TaskModel.id)
+                < tuple_(after.rank, literal(after.task_id, TaskModel.id.type))
+            )
+        stmt = stmt.order_by(rank.desc(), TaskModel.id.desc()).limit(limit + 1)
+
+        result = await self.session.execute(stmt)
+        rows = result.all()
+        tasks = [self._model_to_entity(row.TaskModel) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            next_cursor = TaskSearchCursor.after(last.rank, last.TaskModel.id, query)
+        return TaskSearchPage(tasks=tasks, next_cursor=next_cursor)
+
+    async def search_by_title(
+        self, user_id: UserId, fragment: str, limit: int = 10
+    ) -> List[Task]:
+        # ix_tasks_user_title_trgm walks the user's substring matches in
+        # trigram distance order, so the scan stops after ``limit`` rows
+        # instead of ranking every match
+        pattern = trigram_pattern(fragment)
+        distance = TaskModel.title.op("<->", return_type=Float)(fragment)
+        stmt = (
+            select(TaskModel)
+            .where(
+                TaskModel.user_id == str(user_id),
+                TaskModel.title.ilike(pattern),
+            )
+            .order_by(distance)
+            .limit(limit)
+        )
+        result = await self.session.execute(stmt)
+        models = result.scalars().all()
+        return [self._model_to_entity(model) for model in models]
+
     async def update(self, task: Task) -> Task:
         stmt = (
             update(TaskModel)
@@ -79,15 +392,79 @@ class TaskRepositoryImpl(TaskRepository):  # pragma: no cover
         model = result.scalar_one()
         return self._model_to_entity(model)
 
+    async def update_owned(
+        self, task_id: TaskId, user_id: UserId, changes: TaskChanges
+    ) -> Optional[Task]:
+        now = datetime.now(timezone.utc)
+        if changes.only_completion:
+            # Like mark_completed/mark_incomplete, a task already in the
+            # requested state keeps its updated_at
+            updated_at = case(
+                (TaskModel.completed.is_not(changes.values["completed"]), now),
+                else_=TaskModel.updated_at,
+            )
+        else:
+            updated_at = now
+        stmt = (
+            update(TaskModel)
+            .where(self._owned(task_id, user_id))
+            .values(**changes.values, updated_at=updated_at)
+            .returning(TaskModel)
+        )
+        result = await self.session.execute(stmt)
+        model = result.scalar_one_or_none()
+        return self._model_to_entity(model) if model else None
+
+    async def update_many(
+        self,
+        user_id: UserId,
+        changes: TaskChanges,
+        task_ids: Optional[List[TaskId]] = None,
+    ) -> List[TaskId]:
+        # One UPDATE scoped to the owner; the IDs go in as a single array
+        # parameter so the statement is the same whatever the batch size
+        stmt = update(TaskModel).where(TaskModel.user_id == str(user_id))
+        if task_ids is not None:
+            ids = bindparam(
+                "task_ids",
+                [str(task_id) for task_id in task_ids],
+                type_=ARRAY(UUID(as_uuid=False)),
+            )
+            stmt = stmt.where(TaskModel.id == any_(ids))
+        if changes.only_completion:
+            # Like mark_completed/mark_incomplete, tasks already in the
+            # requested state are left alone and keep their updated_at
+            stmt = stmt.where(TaskModel.completed.is_not(changes.values["completed"]))
+        stmt = stmt.values(
+            **changes.values, updated_at=datetime.now(timezone.utc)
+        ).returning(TaskModel.id)
+
+        result = await self.session.execute(stmt)
+        return [TaskId(task_id) for task_id in result.scalars().all()]
+
     async def delete(self, task_id: TaskId) -> bool:
         stmt = delete(TaskModel).where(TaskModel.id == str(task_id))
         result = await self.session.execute(stmt)
         return result.rowcount > 0
 
-    async def count_by_user_id(self, user_id: UserId) -> int:
-        stmt = select(func.count(TaskModel.id)).where(TaskModel.user_id == str(user_id))
+    async def delete_owned(self, task_id: TaskId, user_id: UserId) -> bool:
+        stmt = delete(TaskModel).where(self._owned(task_id, user_id))
         result = await self.session.execute(stmt)
-        return result.scalar_one()
+        return result.rowcount > 0
+
+    def _counts_stmt(self, user_id: UserId):
+        # Counters are maintained by triggers on tasks, so this is a primary
+        # key lookup however many tasks the user has
+        return select(
+            func.coalesce(func.max(UserTaskCountersModel.total), 0).label("total"),
+            func.coalesce(func.max(UserTaskCountersModel.completed), 0).label(
+                "completed"
+            ),
+        ).where(UserTaskCountersModel.user_id == str(user_id))
+
+    async def count_by_user_id(self, user_id: UserId) -> int:
+        result = await self.session.execute(self._counts_stmt(user_id))
+        return result.one().total
 
     async def get_completed_by_user_id(
         self, user_id: UserId, limit: int = 100, offset: int = 0
@@ -95,7 +472,7 @@ class TaskRepositoryImpl(TaskRepository):  # pragma: no cover
         stmt = (
             select(TaskModel)
             .where(TaskModel.user_id == str(user_id), TaskModel.completed == True)
-            .order_by(TaskModel.updated_at.desc())
+            .order_by(modified_sort_key.desc(), TaskModel.id.desc())
             .offset(offset)
             .limit(limit)
         )
@@ -109,7 +486,7 @@ class TaskRepositoryImpl(TaskRepository):  # pragma: no cover
         stmt = (
             select(TaskModel)
             .where(TaskModel.user_id == str(user_id), TaskModel.completed == False)
-            .order_by(TaskModel.created_at.desc())
+            .order_by(TaskModel.created_at.desc(), TaskModel.id.desc())
             .offset(offset)
             .limit(limit)
         )
@@ -1,14 +1,17 @@
 from typing import List, Optional
 
-from sqlalchemy import delete, select, update
+from sqlalchemy import Float, delete, func, select, union, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from domain.entities.user import User
+from domain.entities.user import User, UserCredentials
 from domain.repositories.user_repository import UserRepository
 from domain.value_objects.email import Email
 from domain.value_objects.user_id import UserId
+from infrastructure.auth.principal_cache import principal_cache, token_version_cache
 from infrastructure.database.models import UserModel
+from infrastructure.database.text_match import trigram_pattern
 
 
 class UserRepositoryImpl(UserRepository):  # pragma: no cover
@@ -22,6 +25,7 @@ class UserRepositoryImpl(UserRepository):  # pragma: no cover
             username=model.username,
             hashed_password=model.hashed_password,
             is_active=model.is_active,
+            token_version=model.token_version,
             created_at=model.created_at,
             updated_at=model.updated_at,
         )
@@ -33,6 +37,7 @@ class UserRepositoryImpl(UserRepository):  # pragma: no cover
             username=entity.username,
             hashed_password=entity.hashed_password,
             is_active=entity.is_active,
+            token_version=entity.token_version,
             created_at=entity.created_at,
             updated_at=entity.updated_at,
         )
@@ -52,6 +57,35 @@ class UserRepositoryImpl(UserRepository):  # pragma: no cover
                 raise ValueError(f"User with username {user.username} already exists")
             raise e
 
+    async def create_unique(self, user: User) -> User:  # pragma: no cover
+        # A single INSERT ... ON CONFLICT DO NOTHING RETURNING both checks the
+        # unique constraints and writes the row, without racing a prior SELECT
+        stmt = (
+            insert(UserModel)
+            .values(
+                id=str(user.id),
+                email=str(user.email),
+                username=user.username,
+                hashed_password=user.hashed_password,
+                is_active=user.is_active,
+                token_version=user.token_version,
+                created_at=user.created_at,
+                updated_at=user.updated_at,
+            )
+            .on_conflict_do_nothing()
+            .returning(UserModel)
+        )
+        result = await self.session.execute(stmt)
+        model = result.scalar_one_or_none()
+        if model is not None:
+            return self._model_to_entity(model)
+
+        # Only the rejected path pays for finding out which value was taken;
+        # the email is reported first when both are
+        if await self.exists_by_email(user.email):
+            raise ValueError("User with this email already exists")
+        raise ValueError("User with this username already exists")
+
     async def get_by_id(self, user_id: UserId) -> Optional[User]:  # pragma: no cover
         stmt = select(UserModel).where(UserModel.id == str(user_id))
         result = await self.session.execute(stmt)
@@ -64,6 +98,24 @@ class UserRepositoryImpl(UserRepository):  # pragma: no cover
         model = result.scalar_one_or_none()
         return self._model_to_entity(model) if model else None
 
+    async def get_credentials_by_email(
+        self, email: Email
+    ) -> Optional[UserCredentials]:  # pragma: no cover
+        # Plain column rows skip the identity map and entity validation and
+        # are answered from the ix_users_email_credentials covering index
+        stmt = select(
+            UserModel.id,
+            UserModel.username,
+            UserModel.hashed_password,
+            UserModel.is_active,
+            UserModel.token_version,
+            UserModel.created_at,
+            UserModel.updated_at,
+        ).where(UserModel.email == str(email))
+        result = await self.session.execute(stmt)
+        row = result.one_or_none()
+        return UserCredentials(*row) if row else None
+
     async def get_by_username(
         self, username: str
     ) -> Optional[User]:  # pragma: no cover
@@ -72,6 +124,35 @@ class UserRepositoryImpl(UserRepository):  # pragma: no cover
         model = result.scalar_one_or_none()
         return self._model_to_entity(model) if model else None
 
+    async def search_by_email_or_username(
+        self, fragment: str, limit: int = 20
+    ) -> List[User]:  # pragma: no cover
+        # Each trigram index returns its ``limit`` closest matches in
+        # distance order; only those candidates are ranked together, rather
+        # than sorting every user that matches
+        pattern = trigram_pattern(fragment)
+        email_distance = UserModel.email.op("<->", return_type=Float)(fragment)
+        username_distance = UserModel.username.op("<->", return_type=Float)(fragment)
+        candidates = union(
+            select(UserModel.id)
+            .where(UserModel.email.ilike(pattern))
+            .order_by(email_distance)
+            .limit(limit),
+            select(UserModel.id)
+            .where(UserModel.username.ilike(pattern))
+            .order_by(username_distance)
+            .limit(limit),
+        ).subquery()
+        stmt = (
+            select(UserModel)
+            .where(UserModel.id.in_(select(candidates.c.id)))
+            .order_by(func.least(email_distance, username_distance), UserModel.id)
+            .limit(limit)
+        )
+        result = await self.session.execute(stmt)
+        models = result.scalars().all()
+        return [self._model_to_entity(model) for model in models]
+
     async def update(self, user: User) -> User:  # pragma: no cover
         stmt = (
             update(UserModel)
@@ -81,27 +162,41 @@ class UserRepositoryImpl(UserRepository):  # pragma: no cover
                 username=user.username,
                 hashed_password=user.hashed_password,
                 is_active=user.is_active,
+                token_version=user.token_version,
                 updated_at=user.updated_at,
             )
             .returning(UserModel)
         )
         result = await self.session.execute(stmt)
         model = result.scalar_one()
+        principal_cache.invalidate(user.id)
+        token_version_cache.invalidate(user.id)
         return self._model_to_entity(model)
 
     async def delete(self, user_id: UserId) -> bool:  # pragma: no cover
         stmt = delete(UserModel).where(UserModel.id == str(user_id))
         result = await self.session.execute(stmt)
+        principal_cache.invalidate(user_id)
+        token_version_cache.invalidate(user_id)
         return result.rowcount > 0
 
     async def list_all(
         self, limit: int = 100, offset: int = 0
     ) -> List[User]:  # pragma: no cover
-        stmt = select(UserModel).offset(offset).limit(limit)
+        stmt = select(UserModel).order_by(UserModel.id).offset(offset).limit(limit)
         result = await self.session.execute(stmt)
         models = result.scalars().all()
         return [self._model_to_entity(model) for model in models]
 
+    async def get_token_version(
+        self, user_id: UserId
+    ) -> Optional[int]:  # pragma: no cover
+        stmt = select(UserModel.token_version).where(
+            UserModel.id == str(user_id), UserModel.is_active.is_(True)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
     async def exists_by_email(self, email: Email) -> bool:  # pragma: no cover
         stmt = select(UserModel.id).where(UserModel.email == str(email))
         result = await self.session.execute(stmt)
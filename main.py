@@ -1,22 +1,105 @@
+import asyncio
+import logging
 from contextlib import asynccontextmanager
+from datetime import datetime, timezone
 import os
 
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
+from infrastructure.auth.jwt_service import jwt_service
+from infrastructure.auth.password_service import password_service
+from infrastructure.auth.principal_cache import principal_cache
+from infrastructure.auth.revocation import revocation_list
 from infrastructure.config.auth import auth_config
-from infrastructure.database.base import create_tables
+from infrastructure.config.database import database_config
+from infrastructure.database.base import (
+    async_session_maker,
+    create_tables,
+    dispose_engines,
+    log_database_settings,
+    replica_pool,
+)
+from infrastructure.repositories.revoked_token_repository_impl import (
+    RevokedTokenRepositoryImpl,
+)
 from presentation.api.auth_router import router as auth_router
 from presentation.api.task_router import router as task_router
+from presentation.middleware.consistency import ConsistencyTokenMiddleware
+
+logger = logging.getLogger(__name__)
+
+
+async def calibrate_password_hashing(target_ms: float) -> None:  # pragma: no cover
+    """Tune the password hash cost to the latency budget on this host"""
+    min_rounds = os.getenv("PASSWORD_HASH_MIN_ROUNDS")
+    loop = asyncio.get_running_loop()
+    rounds = await loop.run_in_executor(
+        None,
+        password_service.calibrate,
+        target_ms,
+        int(min_rounds) if min_rounds else None,
+    )
+    logger.info(
+        "Calibrated %s password hashing to %d rounds for a %.0f ms budget",
+        password_service.scheme,
+        rounds,
+        target_ms,
+    )
+
+
+async def sync_revoked_tokens() -> None:  # pragma: no cover
+    """Refresh this worker's revocation list from the revocation store"""
+    async with async_session_maker() as session:
+        repository = RevokedTokenRepositoryImpl(session)
+        await revocation_list.sync(repository)
+        await repository.delete_expired(datetime.now(timezone.utc))
+        await session.commit()
+
+
+async def sync_revoked_tokens_periodically() -> None:  # pragma: no cover
+    while True:
+        await asyncio.sleep(revocation_list.sync_interval_seconds)
+        try:
+            await sync_revoked_tokens()
+        except Exception:
+            logger.exception("Failed to sync revoked tokens")
+
+
+async def probe_replicas_periodically() -> None:  # pragma: no cover
+    while True:
+        await asyncio.sleep(database_config.replica_probe_interval_seconds)
+        try:
+            await replica_pool.probe()
+        except Exception:
+            logger.exception("Failed to probe read replicas")
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):  # pragma: no cover
     # Startup - only create tables if not in test mode
+    log_database_settings()
+    revocation_sync = None
+    replica_probe = None
+    if replica_pool:
+        await replica_pool.probe()
+        replica_probe = asyncio.create_task(probe_replicas_periodically())
     if not os.getenv("TESTING"):
+        target_ms = os.getenv("PASSWORD_HASH_TARGET_MS")
+        if target_ms:
+            await calibrate_password_hashing(float(target_ms))
         await create_tables()
+        await sync_revoked_tokens()
+        revocation_sync = asyncio.create_task(sync_revoked_tokens_periodically())
     yield
     # Shutdown
+    if revocation_sync is not None:
+        revocation_sync.cancel()
+    if replica_probe is not None:
+        replica_probe.cancel()
+    password_service.shutdown()
+    await dispose_engines()
 
 
 app = FastAPI(
@@ -35,6 +118,11 @@ app.add_middleware(
     allow_headers=auth_config.cors_allow_headers,
 )
 
+# Tell clients when their writes are visible on read replicas; without
+# replicas there is nothing to wait for
+if replica_pool:
+    app.add_middleware(ConsistencyTokenMiddleware)
+
 # Include routers
 app.include_router(auth_router, prefix="/api/v1")
 app.include_router(task_router, prefix="/api/v1")
@@ -61,6 +149,27 @@ async def health_check():
     return {"status": "healthy", "version": "2.0.0"}
 
 
+@app.get("/.well-known/jwks.json", summary="JWT verification keys")
+async def jwks():
+    # Keys change only on rotation, so gateways may cache the set; a retired
+    # key stays published until the tokens it signed have expired
+    max_age = int(os.getenv("JWT_JWKS_MAX_AGE_SECONDS", "300"))
+    return JSONResponse(
+        jwt_service.jwks(), headers={"Cache-Control": f"public, max-age={max_age}"}
+    )
+
+
+@app.get("/metrics", summary="Runtime metrics")
+async def metrics():
+    return {
+        "principal_cache": principal_cache.stats(),
+        "token_cache": jwt_service.cache_stats(),
+        "token_revocation": revocation_list.stats(),
+        "password_hashing": password_service.stats(),
+        "read_replicas": replica_pool.stats(),
+    }
+
+
 if __name__ == "__main__":  # pragma: no cover
     import uvicorn
 
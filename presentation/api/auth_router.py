@@ -1,7 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import logging
+from typing import Optional
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from application.dto.user_dto import (
+    LogoutDTO,
     TokenRefreshDTO,
     TokenResponseDTO,
     UserCreateDTO,
@@ -10,21 +15,55 @@ from application.dto.user_dto import (
 )
 from application.use_cases.auth_use_cases import AuthUseCases
 from domain.entities.user import User
+from domain.value_objects.user_id import UserId
+from infrastructure.auth.admission import AdmissionRejectedError
 from infrastructure.auth.jwt_service import jwt_service
 from infrastructure.auth.password_service import password_service
-from infrastructure.database.base import get_session
+from infrastructure.database.base import async_session_maker, get_session
+from infrastructure.repositories.revoked_token_repository_impl import (
+    RevokedTokenRepositoryImpl,
+)
 from infrastructure.repositories.user_repository_impl import UserRepositoryImpl
-from presentation.middleware.auth import get_current_active_user
+from presentation.middleware.auth import get_current_active_user, security
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
+logger = logging.getLogger(__name__)
+
+
+def _service_busy(error: AdmissionRejectedError) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=str(error),
+        headers={"Retry-After": str(error.retry_after)},
+    )
+
 
 def get_auth_use_cases(
     session: AsyncSession = Depends(get_session),
 ) -> AuthUseCases:  # pragma: no cover
     """Dependency to get auth use cases"""
     user_repository = UserRepositoryImpl(session)
-    return AuthUseCases(user_repository, password_service, jwt_service)
+    revoked_token_repository = RevokedTokenRepositoryImpl(session)
+    return AuthUseCases(
+        user_repository, password_service, jwt_service, revoked_token_repository
+    )
+
+
+async def rehash_password(
+    user_id: UserId, plain_password: str
+) -> None:  # pragma: no cover
+    """Persist a hash with the current cost parameters after a login"""
+    async with async_session_maker() as session:
+        auth_use_cases = AuthUseCases(
+            UserRepositoryImpl(session), password_service, jwt_service
+        )
+        try:
+            await auth_use_cases.rehash_password(user_id, plain_password)
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            logger.exception("Failed to rehash password for user %s", user_id)
 
 
 @router.post("/signup", response_model=dict, status_code=status.HTTP_201_CREATED)
@@ -41,6 +80,8 @@ async def sign_up(  # pragma: no cover
         }
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except AdmissionRejectedError as e:
+        raise _service_busy(e)
     except Exception:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -50,11 +91,17 @@ async def sign_up(  # pragma: no cover
 
 @router.post("/login", response_model=dict)
 async def login(  # pragma: no cover
-    login_data: UserLoginDTO, auth_use_cases: AuthUseCases = Depends(get_auth_use_cases)
+    login_data: UserLoginDTO,
+    background_tasks: BackgroundTasks,
+    auth_use_cases: AuthUseCases = Depends(get_auth_use_cases),
 ):
     """Login user and return tokens"""
     try:
         result = await auth_use_cases.login_user(login_data)
+        if result["rehash_needed"]:
+            background_tasks.add_task(
+                rehash_password, UserId(result["user"]["id"]), login_data.password
+            )
         return {
             "message": "Login successful",
             "user": result["user"],
@@ -62,6 +109,8 @@ async def login(  # pragma: no cover
         }
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e))
+    except AdmissionRejectedError as e:
+        raise _service_busy(e)
     except Exception:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -88,9 +137,41 @@ async def refresh_token(
 
 
 @router.post("/logout")
-async def logout():
-    """Logout user (client should discard tokens)"""
-    return {"message": "Logout successful. Please discard your tokens."}
+async def logout(
+    logout_data: Optional[LogoutDTO] = None,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+    auth_use_cases: AuthUseCases = Depends(get_auth_use_cases),
+):
+    """Logout user by revoking the presented access token and refresh token"""
+    try:
+        await auth_use_cases.logout(
+            credentials.credentials if credentials else None,
+            logout_data.refresh_token if logout_data else None,
+        )
+        return {"message": "Logout successful. Your tokens have been revoked."}
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error during logout",
+        )
+
+
+@router.post("/logout-all")
+async def logout_all(
+    current_user: User = Depends(get_current_active_user),
+    auth_use_cases: AuthUseCases = Depends(get_auth_use_cases),
+):
+    """Revoke every access token issued to the current user"""
+    try:
+        await auth_use_cases.revoke_all_tokens(current_user.id)
+        return {"message": "All sessions have been logged out."}
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error during logout",
+        )
 
 
 @router.get("/me", response_model=UserResponseDTO)
@@ -0,0 +1,95 @@
+import csv
+import io
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable
+
+from application.dto.task_dto import TaskResponseDTO
+
+EXPORT_FIELDS = ["id", "title", "description", "completed", "created_at", "updated_at"]
+
+# Spreadsheet apps evaluate cells starting with these as formulas, also after
+# leading tabs or carriage returns
+CSV_FORMULA_PREFIXES = ("=", "@")
+# Cells starting with a sign are formulas too, but only do harm when they call
+# a function or another program; plain numbers and text are left alone
+CSV_SIGN_PREFIXES = ("+", "-")
+CSV_FORMULA_CHARS = frozenset("=(!|")
+
+
+class TaskExportFormat(ABC):
+    """How a batch of tasks is written into an export stream"""
+
+    media_type: str
+    extension: str
+
+    def header(self) -> bytes:
+        """Bytes written once, before the first batch"""
+        return b""
+
+    @abstractmethod
+    def chunk(self, tasks: Iterable[TaskResponseDTO]) -> bytes:
+        """Encode a batch of tasks"""
+        pass
+
+
+class NdjsonExportFormat(TaskExportFormat):
+    media_type = "application/x-ndjson"
+    extension = "ndjson"
+
+    def chunk(self, tasks: Iterable[TaskResponseDTO]) -> bytes:
+        return b"".join(task.model_dump_json().encode() + b"\n" for task in tasks)
+
+
+class CsvExportFormat(TaskExportFormat):
+    """CSV with a header row
+
+    Cells a spreadsheet would evaluate as a formula are prefixed with ``'``:
+    anything starting with ``=`` or ``@``, and ``+``/``-`` cells containing a
+    function call or program reference. Other values, such as ``-5 items`` or
+    ``+12``, are written unchanged.
+    """
+
+    media_type = "text/csv"
+    extension = "csv"
+
+    def header(self) -> bytes:
+        return self._write([dict(zip(EXPORT_FIELDS, EXPORT_FIELDS))])
+
+    def chunk(self, tasks: Iterable[TaskResponseDTO]) -> bytes:
+        return self._write(
+            {
+                field: self._cell(value)
+                for field, value in task.model_dump(mode="json").items()
+            }
+            for task in tasks
+        )
+
+    def _write(self, rows: Iterable[Dict[str, str]]) -> bytes:
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, EXPORT_FIELDS, lineterminator="\n")
+        writer.writerows(rows)
+        return buffer.getvalue().encode()
+
+    @staticmethod
+    def _cell(value) -> str:
+        if value is None:
+            return ""
+        if isinstance(value, bool):
+            return "true" if value else "false"
+        text = str(value)
+        return f"'{text}" if CsvExportFormat._is_formula(text) else text
+
+    @staticmethod
+    def _is_formula(text: str) -> bool:
+        text = text.lstrip("\t\r")
+        if text.startswith(CSV_FORMULA_PREFIXES):
+            return True
+        if not text.startswith(CSV_SIGN_PREFIXES):
+            return False
+        return any(char in CSV_FORMULA_CHARS for char in text)
+
+
+EXPORT_FORMATS: Dict[str, TaskExportFormat] = {
+    export_format.extension: export_format
+    for export_format in (NdjsonExportFormat(), CsvExportFormat())
+}
@@ -0,0 +1,203 @@
+import codecs
+import csv
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Dict, List, Optional
+
+from domain.entities.task import Task
+from domain.value_objects.user_id import UserId
+
+TRUE_VALUES = frozenset({"true", "1", "yes"})
+FALSE_VALUES = frozenset({"false", "0", "no", ""})
+
+# Longest line, or multi-line CSV record, held in memory while parsing; a
+# body exceeding it is rejected rather than buffered whole
+MAX_RECORD_LENGTH = int(os.getenv("TASK_IMPORT_MAX_RECORD_LENGTH", "65536"))
+
+
+@dataclass(frozen=True)
+class ParsedRow:
+    """One record of an import body: its fields, or why it could not be read
+
+    ``number`` is the line for NDJSON and the record after the header for CSV.
+    """
+
+    number: int
+    fields: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class ImportReport:
+    """Outcome of an import, keeping only the first ``max_errors`` errors"""
+
+    max_errors: int
+    imported_count: int = 0
+    error_count: int = 0
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+
+    def add_error(self, row: int, error: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"row": row, "error": error})
+
+
+async def iter_lines(
+    chunks: AsyncIterable[bytes], max_length: int = MAX_RECORD_LENGTH
+) -> AsyncIterator[str]:
+    """Split a streamed UTF-8 body into lines without buffering all of it
+
+    Raises ValueError once a line grows past ``max_length`` characters.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    # Pieces of the unfinished line; only newly decoded text is searched for
+    # a newline, so a long line is not rescanned on every chunk
+    pending: List[str] = []
+    pending_length = 0
+    async for chunk in chunks:
+        text = decoder.decode(chunk)
+        if "\n" in text:
+            first, *lines, rest = text.split("\n")
+            pending.append(first)
+            lines.insert(0, "".join(pending))
+            pending, pending_length = [rest], len(rest)
+            for line in lines:
+                if len(line) > max_length:
+                    raise _line_too_long(max_length)
+                yield line.rstrip("\r")
+        elif text:
+            pending.append(text)
+            pending_length += len(text)
+        if pending_length > max_length:
+            raise _line_too_long(max_length)
+    pending.append(decoder.decode(b"", final=True))
+    last = "".join(pending)
+    if len(last) > max_length:
+        raise _line_too_long(max_length)
+    if last:
+        yield last.rstrip("\r")
+
+
+def _line_too_long(max_length: int) -> ValueError:
+    return ValueError(f"Lines and records may be at most {max_length} characters")
+
+
+async def parse_ndjson(lines: AsyncIterable[str]) -> AsyncIterator[ParsedRow]:
+    number = 0
+    async for line in lines:
+        number += 1
+        if not line.strip():
+            continue
+        try:
+            fields = json.loads(line)
+        except ValueError:
+            yield ParsedRow(number, error="Invalid JSON")
+            continue
+        if not isinstance(fields, dict):
+            yield ParsedRow(number, error="Expected a JSON object")
+            continue
+        yield ParsedRow(number, fields)
+
+
+def _in_quoted_field(line: str, in_quotes: bool) -> bool:
+    """Whether a CSV record is inside a quoted field at the end of the line
+
+    Follows the csv module: a quote only opens a field at its start (or
+    doubled, within a quoted field), so ``5" nail`` stays an unquoted value.
+    """
+    field_start = not in_quotes
+    just_closed = False
+    for char in line:
+        if in_quotes:
+            if char == '"':
+                in_quotes, just_closed = False, True
+            continue
+        if char == '"' and (field_start or just_closed):
+            in_quotes = True
+        field_start = char == ","
+        just_closed = False
+    return in_quotes
+
+
+async def _csv_records(
+    lines: AsyncIterable[str], max_length: int = MAX_RECORD_LENGTH
+) -> AsyncIterator[str]:
+    """Join lines into CSV records; a quoted field may span several lines"""
+    pending: List[str] = []
+    pending_length = 0
+    in_quotes = False
+    async for line in lines:
+        pending.append(line)
+        pending_length += len(line) + 1
+        in_quotes = _in_quoted_field(line, in_quotes)
+        if not in_quotes:
+            yield "\n".join(pending)
+            pending, pending_length = [], 0
+        elif pending_length > max_length:
+            raise _line_too_long(max_length)
+    if pending:
+        # Let the parser report the unterminated quote on the last record
+        yield "\n".join(pending)
+
+
+async def parse_csv(lines: AsyncIterable[str]) -> AsyncIterator[ParsedRow]:
+    """Parse CSV with a header row naming at least the title column"""
+    header: Optional[List[str]] = None
+    number = 0
+    async for record in _csv_records(lines):
+        if not record.strip():
+            continue
+        try:
+            values = next(csv.reader([record], strict=True))
+        except csv.Error as e:
+            if header is None:
+                raise ValueError(f"Invalid CSV header: {e}")
+            number += 1
+            yield ParsedRow(number, error=f"Invalid CSV: {e}")
+            continue
+
+        if header is None:
+            header = [value.strip() for value in values]
+            if "title" not in header:
+                raise ValueError("CSV header must include a title column")
+            continue
+        number += 1
+        if len(values) > len(header):
+            yield ParsedRow(number, error="Row has more columns than the header")
+        else:
+            yield ParsedRow(number, dict(zip(header, values)))
+
+
+IMPORT_PARSERS: Dict[str, Callable[[AsyncIterable[str]], AsyncIterator[ParsedRow]]] = {
+    "ndjson": parse_ndjson,
+    "csv": parse_csv,
+}
+
+
+def _parse_completed(value: Any) -> bool:
+    if value is None or isinstance(value, bool):
+        return bool(value)
+    if isinstance(value, str) and value.strip().lower() in TRUE_VALUES:
+        return True
+    if isinstance(value, str) and value.strip().lower() in FALSE_VALUES:
+        return False
+    raise ValueError("Task completion status must be true or false")
+
+
+def task_from_row(user_id: UserId, row: ParsedRow) -> Task:
+    """Build a task from an imported row with the same rules as Task.create"""
+    if row.error is not None:
+        raise ValueError(row.error)
+    for name in ("title", "description"):
+        if not isinstance(row.fields.get(name), (str, type(None))):
+            raise ValueError(f"Task {name} must be a string")
+
+    task = Task.create(
+        user_id=user_id,
+        title=row.fields.get("title"),
+        description=row.fields.get("description") or None,
+    )
+    if _parse_completed(row.fields.get("completed")):
+        task.mark_completed()
+    return task
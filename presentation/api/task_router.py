@@ -1,21 +1,57 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+import os
+from datetime import datetime
+from typing import AsyncIterator, List, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from application.dto.task_dto import (
+    TaskBulkCompleteDTO,
+    TaskBulkCreateDTO,
+    TaskBulkCreateResponseDTO,
+    TaskBulkUpdateDTO,
+    TaskBulkUpdateResponseDTO,
     TaskCreateDTO,
+    TaskImportResponseDTO,
     TaskListResponseDTO,
     TaskResponseDTO,
+    TaskSearchResponseDTO,
     TaskUpdateDTO,
 )
 from domain.entities.task import Task
-from domain.entities.user import User
+from domain.entities.user import Principal
+from domain.value_objects.task_changes import TaskChanges
+from domain.value_objects.task_cursor import default_sort
 from domain.value_objects.task_id import TaskId
-from infrastructure.database.base import get_session
-from infrastructure.repositories.task_repository_impl import TaskRepositoryImpl
-from presentation.middleware.auth import get_current_active_user
+from infrastructure.database.base import (
+    get_read_session,
+    get_session,
+    read_session_scope,
+)
+from infrastructure.pagination.cursor import cursor_codec
+from infrastructure.repositories.task_repository_impl import (
+    TaskRepositoryImpl,
+    check_listing,
+)
+from presentation.api.task_export import EXPORT_FORMATS
+from presentation.api.task_import import (
+    IMPORT_PARSERS,
+    ImportReport,
+    iter_lines,
+    task_from_row,
+)
+from presentation.middleware.auth import get_current_active_principal
 
 router = APIRouter(prefix="/tasks", tags=["Tasks"])
 
+# Rows fetched from the server-side cursor and written per export chunk
+EXPORT_BATCH_SIZE = int(os.getenv("TASK_EXPORT_BATCH_SIZE", "500"))
+# Valid rows loaded per COPY while an import streams in
+IMPORT_BATCH_SIZE = int(os.getenv("TASK_IMPORT_BATCH_SIZE", "1000"))
+# Skipped rows listed in an import response; the rest are only counted
+IMPORT_MAX_ERRORS = int(os.getenv("TASK_IMPORT_MAX_ERRORS", "100"))
+
 
 def get_task_repository(
     session: AsyncSession = Depends(get_session),
@@ -24,6 +60,13 @@ def get_task_repository(
     return TaskRepositoryImpl(session)
 
 
+def get_task_read_repository(
+    session: AsyncSession = Depends(get_read_session),
+) -> TaskRepositoryImpl:
+    """Dependency to get a task repository for read-only handlers"""
+    return TaskRepositoryImpl(session)
+
+
 def task_to_response_dto(task: Task) -> TaskResponseDTO:
     """Convert Task entity to TaskResponseDTO"""
     return TaskResponseDTO(
@@ -36,43 +79,122 @@ def task_to_response_dto(task: Task) -> TaskResponseDTO:
     )
 
 
+def parse_task_ids(task_ids: List[str]) -> List[TaskId]:
+    """Parse task IDs from a request body, rejecting malformed ones"""
+    try:
+        return [TaskId(task_id) for task_id in task_ids]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid task ID"
+        )
+
+
+async def unavailable_task_error(
+    task_repository: TaskRepositoryImpl, task_id: TaskId
+) -> HTTPException:
+    """404 or 403 for a task the user's query did not match
+
+    Only this failure path pays for the extra lookup that tells a missing task
+    from someone else's.
+    """
+    if await task_repository.exists(task_id):
+        return HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Access denied"
+        )
+    return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
+
+
 @router.get("/", response_model=TaskListResponseDTO)
 async def get_tasks(
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Page size"),
     completed: bool = Query(None, description="Filter by completion status"),
-    current_user: User = Depends(get_current_active_user),
-    task_repository: TaskRepositoryImpl = Depends(get_task_repository),
+    sort: Optional[Literal["created_at", "updated_at", "title"]] = Query(
+        None,
+        description=(
+            "Sort order: dates newest first, titles A to Z; defaults to "
+            "updated_at for completed tasks and created_at otherwise"
+        ),
+    ),
+    created_after: Optional[datetime] = Query(
+        None, description="Only tasks created after this time; needs sort=created_at"
+    ),
+    created_before: Optional[datetime] = Query(
+        None, description="Only tasks created before this time; needs sort=created_at"
+    ),
+    updated_since: Optional[datetime] = Query(
+        None, description="Only tasks changed since this time; needs sort=updated_at"
+    ),
+    cursor: Optional[str] = Query(
+        None, description="Cursor from a previous response; overrides page"
+    ),
+    include_counts: bool = Query(
+        True, description="Include task counts; skip them if only has_next is needed"
+    ),
+    current_user: Principal = Depends(get_current_active_principal),
+    task_repository: TaskRepositoryImpl = Depends(get_task_read_repository),
 ):
-    """Get user's tasks with pagination"""
+    """Get user's tasks with cursor or page-number pagination"""
+    sort = sort or default_sort(completed)
+    range_filters = {
+        name: value
+        for name, value in (
+            ("created_after", created_after),
+            ("created_before", created_before),
+            ("updated_since", updated_since),
+        )
+        if value is not None
+    }
     try:
-        offset = (page - 1) * page_size
+        # Only sorts and filters an index serves are accepted
+        check_listing(sort, completed, range_filters)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
-        if completed is not None:
-            if completed:
-                tasks = await task_repository.get_completed_by_user_id(
-                    current_user.id, page_size, offset
-                )
-            else:
-                tasks = await task_repository.get_pending_by_user_id(
-                    current_user.id, page_size, offset
-                )
-        else:
-            tasks = await task_repository.get_by_user_id(
-                current_user.id, page_size, offset
+    after = None
+    if cursor is not None:
+        try:
+            after = cursor_codec.decode(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        if (after.sort, after.completed) != (sort, completed):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cursor does not match the completed filter and sort",
             )
 
-        total_count = await task_repository.count_by_user_id(current_user.id)
-        has_next = offset + page_size < total_count
+    try:
+        # Page numbers are kept for compatibility; past the first page they
+        # skip rows with OFFSET, while cursors seek straight to the position
+        offset = 0 if after is not None else (page - 1) * page_size
+        task_page = await task_repository.get_page(
+            current_user.id,
+            page_size,
+            completed,
+            after,
+            offset=offset,
+            with_counts=include_counts,
+            sort=sort,
+            **range_filters,
+        )
 
-        task_dtos = [task_to_response_dto(task) for task in tasks]
+        task_dtos = [task_to_response_dto(task) for task in task_page.tasks]
+        counts = task_page.counts
+        next_cursor = task_page.next_cursor
+        # The counters cover whole listings, not date ranges
+        total_count = (
+            counts.matching(completed) if counts and not range_filters else None
+        )
 
         return TaskListResponseDTO(
             tasks=task_dtos,
             total_count=total_count,
+            completed_count=counts.completed if counts else None,
+            pending_count=counts.pending if counts else None,
             page=page,
             page_size=page_size,
-            has_next=has_next,
+            has_next=next_cursor is not None,
+            next_cursor=cursor_codec.encode(next_cursor) if next_cursor else None,
         )
     except Exception:
         raise HTTPException(
@@ -81,26 +203,97 @@ async def get_tasks(
         )
 
 
+@router.get("/search", response_model=TaskSearchResponseDTO)
+async def search_tasks(
+    q: str = Query(..., min_length=1, max_length=200, description="Search text"),
+    page_size: int = Query(20, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(
+        None, description="Cursor from a previous search with the same text"
+    ),
+    current_user: Principal = Depends(get_current_active_principal),
+    task_repository: TaskRepositoryImpl = Depends(get_task_read_repository),
+):
+    """Full-text search of the user's task titles and descriptions"""
+    after = None
+    if cursor is not None:
+        try:
+            after = cursor_codec.decode_search(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        if not after.matches(q):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cursor does not match the search text",
+            )
+
+    try:
+        search_page = await task_repository.search(current_user.id, q, page_size, after)
+        next_cursor = search_page.next_cursor
+
+        return TaskSearchResponseDTO(
+            tasks=[task_to_response_dto(task) for task in search_page.tasks],
+            has_next=next_cursor is not None,
+            next_cursor=(
+                cursor_codec.encode_search(next_cursor) if next_cursor else None
+            ),
+        )
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error searching tasks",
+        )
+
+
+@router.get("/export")
+async def export_tasks(
+    request: Request,
+    export_format_name: Literal["ndjson", "csv"] = Query(
+        "ndjson", alias="format", description="Export format"
+    ),
+    completed: Optional[bool] = Query(None, description="Filter by completion status"),
+    current_user: Principal = Depends(get_current_active_principal),
+):
+    """Stream all of the user's tasks as NDJSON or CSV"""
+    export_format = EXPORT_FORMATS[export_format_name]
+    user_id = current_user.id
+
+    async def body() -> AsyncIterator[bytes]:
+        # The body is sent after the handler returns, so it opens a session
+        # of its own rather than borrowing the request-scoped one
+        header = export_format.header()
+        if header:
+            yield header
+        async with read_session_scope(request) as session:
+            batches = TaskRepositoryImpl(session).stream_by_user_id(
+                user_id, completed, EXPORT_BATCH_SIZE
+            )
+            async for tasks in batches:
+                yield export_format.chunk(task_to_response_dto(task) for task in tasks)
+
+    return StreamingResponse(
+        body(),
+        media_type=export_format.media_type,
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="tasks.{export_format.extension}"'
+            )
+        },
+    )
+
+
 @router.get("/{task_id}", response_model=TaskResponseDTO)
 async def get_task(
     task_id: str,
-    current_user: User = Depends(get_current_active_user),
-    task_repository: TaskRepositoryImpl = Depends(get_task_repository),
+    current_user: Principal = Depends(get_current_active_principal),
+    task_repository: TaskRepositoryImpl = Depends(get_task_read_repository),
 ):
     """Get a specific task"""
     try:
         task_id_obj = TaskId(task_id)
-        task = await task_repository.get_by_id(task_id_obj)
+        task = await task_repository.get_owned(task_id_obj, current_user.id)
 
         if not task:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Task not found"
-            )
-
-        if not task.belongs_to_user(current_user.id):
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN, detail="Access denied"
-            )
+            raise await unavailable_task_error(task_repository, task_id_obj)
 
         return task_to_response_dto(task)
 
@@ -120,7 +313,7 @@ async def get_task(
 @router.post("/", response_model=TaskResponseDTO, status_code=status.HTTP_201_CREATED)
 async def create_task(
     task_data: TaskCreateDTO,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_principal),
     task_repository: TaskRepositoryImpl = Depends(get_task_repository),
 ):
     """Create a new task"""
@@ -143,45 +336,170 @@ async def create_task(
         )
 
 
+@router.post(
+    "/bulk",
+    response_model=TaskBulkCreateResponseDTO,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_tasks_bulk(
+    bulk_data: TaskBulkCreateDTO,
+    current_user: Principal = Depends(get_current_active_principal),
+    task_repository: TaskRepositoryImpl = Depends(get_task_repository),
+):
+    """Create many tasks in one statement; all are created or none"""
+    tasks = []
+    for index, task_data in enumerate(bulk_data.tasks):
+        try:
+            tasks.append(
+                Task.create(
+                    user_id=current_user.id,
+                    title=task_data.title,
+                    description=task_data.description,
+                )
+            )
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail=f"Task {index}: {e}"
+            )
+
+    try:
+        task_ids = await task_repository.create_many(tasks)
+        return TaskBulkCreateResponseDTO(
+            ids=[str(task_id) for task_id in task_ids], created_count=len(task_ids)
+        )
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error creating tasks",
+        )
+
+
+@router.patch("/bulk", response_model=TaskBulkUpdateResponseDTO)
+async def update_tasks_bulk(
+    bulk_data: TaskBulkUpdateDTO,
+    current_user: Principal = Depends(get_current_active_principal),
+    task_repository: TaskRepositoryImpl = Depends(get_task_repository),
+):
+    """Apply the same changes to many tasks in one statement"""
+    task_ids = parse_task_ids(bulk_data.ids)
+    try:
+        changes = TaskChanges.from_fields(
+            bulk_data.model_dump(exclude_unset=True, exclude={"ids"})
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    try:
+        # Tasks that are missing or owned by someone else are not updated
+        # and are simply absent from updated_ids
+        updated_ids = await task_repository.update_many(
+            current_user.id, changes, task_ids
+        )
+        return TaskBulkUpdateResponseDTO(
+            updated_ids=[str(task_id) for task_id in updated_ids],
+            updated_count=len(updated_ids),
+        )
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error updating tasks",
+        )
+
+
+@router.post("/bulk/complete", response_model=TaskBulkUpdateResponseDTO)
+async def complete_tasks_bulk(
+    bulk_data: Optional[TaskBulkCompleteDTO] = None,
+    current_user: Principal = Depends(get_current_active_principal),
+    task_repository: TaskRepositoryImpl = Depends(get_task_repository),
+):
+    """Mark the given tasks, or all pending tasks, completed"""
+    task_ids = None
+    if bulk_data is not None and bulk_data.ids is not None:
+        task_ids = parse_task_ids(bulk_data.ids)
+
+    try:
+        updated_ids = await task_repository.update_many(
+            current_user.id, TaskChanges.from_fields({"completed": True}), task_ids
+        )
+        return TaskBulkUpdateResponseDTO(
+            updated_ids=[str(task_id) for task_id in updated_ids],
+            updated_count=len(updated_ids),
+        )
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error completing tasks",
+        )
+
+
+@router.post("/import", response_model=TaskImportResponseDTO)
+async def import_tasks(
+    request: Request,
+    import_format_name: Literal["ndjson", "csv"] = Query(
+        "ndjson", alias="format", description="Format of the request body"
+    ),
+    current_user: Principal = Depends(get_current_active_principal),
+    task_repository: TaskRepositoryImpl = Depends(get_task_repository),
+):
+    """Load tasks from an NDJSON or CSV body as it streams in
+
+    Invalid rows are skipped and reported; a body that cannot be parsed at
+    all rolls the whole import back.
+    """
+    parse = IMPORT_PARSERS[import_format_name]
+    report = ImportReport(max_errors=IMPORT_MAX_ERRORS)
+    batch = []
+    try:
+        async for row in parse(iter_lines(request.stream())):
+            try:
+                batch.append(task_from_row(current_user.id, row))
+            except ValueError as e:
+                report.add_error(row.number, str(e))
+                continue
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                report.imported_count += len(await task_repository.create_many(batch))
+                batch = []
+        if batch:
+            report.imported_count += len(await task_repository.create_many(batch))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error importing tasks",
+        )
+
+    return TaskImportResponseDTO(
+        imported_count=report.imported_count,
+        error_count=report.error_count,
+        errors=report.errors,
+    )
+
+
 @router.put("/{task_id}", response_model=TaskResponseDTO)
-async def update_task(  # noqa: C901
+async def update_task(
     task_id: str,
     task_data: TaskUpdateDTO,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_principal),
     task_repository: TaskRepositoryImpl = Depends(get_task_repository),
 ):
     """Update a task"""
     try:
         task_id_obj = TaskId(task_id)
-        task = await task_repository.get_by_id(task_id_obj)
-
-        if not task:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Task not found"
-            )
-
-        if not task.belongs_to_user(current_user.id):
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN, detail="Access denied"
-            )
-
-        # Update fields
         update_data = task_data.model_dump(exclude_unset=True)
 
-        if "title" in update_data:
-            task.update_title(update_data["title"])
-
-        if "description" in update_data:
-            task.update_description(update_data["description"])
+        if update_data:
+            changes = TaskChanges.from_fields(update_data)
+            task = await task_repository.update_owned(
+                task_id_obj, current_user.id, changes
+            )
+        else:
+            task = await task_repository.get_owned(task_id_obj, current_user.id)
 
-        if "completed" in update_data:
-            if update_data["completed"]:
-                task.mark_completed()
-            else:
-                task.mark_incomplete()
+        if not task:
+            raise await unavailable_task_error(task_repository, task_id_obj)
 
-        updated_task = await task_repository.update(task)
-        return task_to_response_dto(updated_task)
+        return task_to_response_dto(task)
 
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -197,25 +515,16 @@ async def update_task(  # noqa: C901
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_task(
     task_id: str,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_principal),
     task_repository: TaskRepositoryImpl = Depends(get_task_repository),
 ):
     """Delete a task"""
     try:
         task_id_obj = TaskId(task_id)
-        task = await task_repository.get_by_id(task_id_obj)
-
-        if not task:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND, detail="Task not found"
-            )
 
-        if not task.belongs_to_user(current_user.id):
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN, detail="Access denied"
-            )
+        if not await task_repository.delete_owned(task_id_obj, current_user.id):
+            raise await unavailable_task_error(task_repository, task_id_obj)
 
-        await task_repository.delete(task_id_obj)
         return None
 
     except ValueError:
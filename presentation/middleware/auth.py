@@ -1,72 +1,146 @@
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from domain.entities.user import User
+from domain.entities.user import Principal, User
+from domain.value_objects.user_id import UserId
 from infrastructure.auth.jwt_service import jwt_service
-from infrastructure.database.base import get_session
+from infrastructure.auth.principal_cache import principal_cache, token_version_cache
+from infrastructure.database.base import get_read_session
 from infrastructure.repositories.user_repository_impl import UserRepositoryImpl
 
 security = HTTPBearer(auto_error=False)
 
 
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def _authenticate(
+    credentials: Optional[HTTPAuthorizationCredentials],
+) -> Tuple[UserId, Dict[str, Any]]:
+    """Verify the bearer token and return the user ID and token payload"""
+    if not credentials:
+        raise _unauthorized("Not authenticated")
+
+    payload = jwt_service.verify_token(credentials.credentials)
+    try:
+        user_id = UserId(payload["sub"]) if payload else None
+    except (KeyError, TypeError, ValueError):
+        user_id = None
+    if not payload or not user_id:
+        raise _unauthorized("Invalid authentication credentials")
+
+    return user_id, payload
+
+
+async def _release_connection(session: AsyncSession) -> None:  # pragma: no cover
+    # End the read-only transaction right after the lookup so write requests
+    # do not hold this connection while their own session works
+    await session.rollback()
+
+
+async def _load_active_user(
+    user_id: UserId, session: AsyncSession
+) -> Optional[User]:  # pragma: no cover
+    # Serve the principal from the in-process cache when possible so the
+    # common authenticated request costs no database round trip
+    user = principal_cache.get_active(user_id)
+    if user is not None:
+        return user
+
+    user_repository = UserRepositoryImpl(session)
+    user = await user_repository.get_by_id(user_id)
+    await _release_connection(session)
+    if not user or not user.is_active:
+        return None
+
+    principal_cache.put(user)
+    return user
+
+
+async def _current_token_version(
+    user_id: UserId, session: AsyncSession
+) -> Optional[int]:  # pragma: no cover
+    """Get the user's token version without fetching the full row"""
+    user = principal_cache.get_active(user_id)
+    if user is not None:
+        return user.token_version
+
+    version = token_version_cache.get(user_id)
+    if version is None:
+        version = await UserRepositoryImpl(session).get_token_version(user_id)
+        await _release_connection(session)
+        if version is not None:
+            token_version_cache.set(user_id, version)
+    return version
+
+
+async def _resolve_user(
+    user_id: UserId, payload: Dict[str, Any], session: AsyncSession
+) -> User:  # pragma: no cover
+    user = await _load_active_user(user_id, session)
+    if not user:
+        raise _unauthorized("User not found or inactive")
+
+    if payload.get("ver", user.token_version) != user.token_version:
+        raise _unauthorized("Token has been revoked")
+
+    return user
+
+
 async def get_current_user_optional(  # pragma: no cover
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ) -> Optional[User]:
     """Get current user from JWT token (optional - returns None if not authenticated)"""
     if not credentials:
         return None
 
     try:
-        user_id = jwt_service.get_user_id_from_token(credentials.credentials)
-        if not user_id:
-            return None
-
-        user_repository = UserRepositoryImpl(session)
-        user = await user_repository.get_by_id(user_id)
-
-        if not user or not user.is_active:
-            return None
-
-        return user
+        user_id, payload = _authenticate(credentials)
+        return await _resolve_user(user_id, payload, session)
     except Exception:
         return None
 
 
 async def get_current_user(  # pragma: no cover
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ) -> User:
     """Get current user from JWT token (required - raises exception if not authenticated)"""
-    if not credentials:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Not authenticated",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    user_id, payload = _authenticate(credentials)
+    return await _resolve_user(user_id, payload, session)
 
-    user_id = jwt_service.get_user_id_from_token(credentials.credentials)
-    if not user_id:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
 
-    user_repository = UserRepositoryImpl(session)
-    user = await user_repository.get_by_id(user_id)
+async def get_current_principal(  # pragma: no cover
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+    session: AsyncSession = Depends(get_read_session),
+) -> Principal:
+    """Get the authenticated principal, trusting token claims in stateless mode"""
+    user_id, payload = _authenticate(credentials)
 
-    if not user or not user.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found or inactive",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    if not jwt_service.stateless_access_tokens or "ver" not in payload:
+        user = await _resolve_user(user_id, payload, session)
+        return Principal.from_user(user)
 
-    return user
+    if not payload.get("active"):
+        raise _unauthorized("User not found or inactive")
+
+    # Revocation is a compact version comparison instead of a row fetch
+    version = await _current_token_version(user_id, session)
+    if version is None:
+        raise _unauthorized("User not found or inactive")
+    if version != payload["ver"]:
+        raise _unauthorized("Token has been revoked")
+
+    return Principal(id=user_id, username=payload.get("username", ""))
 
 
 async def get_current_active_user(  # pragma: no cover
@@ -78,3 +152,14 @@ async def get_current_active_user(  # pragma: no cover
             status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user"
         )
     return current_user
+
+
+async def get_current_active_principal(  # pragma: no cover
+    current_principal: Principal = Depends(get_current_principal),
+) -> Principal:
+    """Get current active principal (convenience dependency)"""
+    if not current_principal.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user"
+        )
+    return current_principal
@@ -0,0 +1,32 @@
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from infrastructure.database.base import SAFE_METHODS
+from infrastructure.database.replicas import CONSISTENCY_TOKEN_HEADER
+
+
+class ConsistencyTokenMiddleware:
+    """Stamp successful writes with a token clients can send to read them back
+
+    ``get_session`` commits and sets ``request.state.consistency_token`` as
+    the dependency exits, which FastAPI does before the response is sent, so
+    the header is added as the response starts. Nothing is held back, so
+    background tasks run after the response as usual.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def stamp(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                token = scope.get("state", {}).get("consistency_token")
+                if token:
+                    MutableHeaders(scope=message)[CONSISTENCY_TOKEN_HEADER] = token
+            await send(message)
+
+        await self.app(scope, receive, stamp)
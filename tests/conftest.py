@@ -128,7 +128,7 @@ def test_app() -> FastAPI:
 async def client(test_app: FastAPI, test_engine) -> AsyncGenerator[AsyncClient, None]:
     """Create an HTTP client for testing API endpoints."""
     from httpx import ASGITransport
-    from infrastructure.database.base import get_session
+    from infrastructure.database.base import get_read_session, get_session
 
     # Create a sessionmaker
     async_session = sessionmaker(
@@ -147,7 +147,19 @@ async def client(test_app: FastAPI, test_engine) -> AsyncGenerator[AsyncClient,
             finally:
                 await session.close()
 
+    read_session = sessionmaker(
+        test_engine.execution_options(postgresql_readonly=True),
+        class_=AsyncSession,
+        expire_on_commit=False,
+    )
+
+    async def get_test_read_session() -> AsyncGenerator[AsyncSession, None]:
+        """Get a read-only database session for testing."""
+        async with read_session() as session:
+            yield session
+
     test_app.dependency_overrides[get_session] = get_test_session
+    test_app.dependency_overrides[get_read_session] = get_test_read_session
 
     try:
         async with AsyncClient(
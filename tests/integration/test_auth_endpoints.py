@@ -242,6 +242,51 @@ class TestAuthEndpoints:
         data = response.json()
         assert "Logout successful" in data["message"]
 
+    @pytest.mark.integration
+    async def test_logout_revokes_access_token(self, authenticated_client):
+        """Test that logging out revokes the presented access token."""
+        client, auth_data = authenticated_client
+
+        response = await client.post(
+            "/api/v1/auth/logout",
+            json={"refresh_token": auth_data["refresh_token"]},
+        )
+        assert response.status_code == 200
+
+        response = await client.get("/api/v1/auth/me")
+        assert response.status_code == 401
+
+        response = await client.post(
+            "/api/v1/auth/refresh", json={"refresh_token": auth_data["refresh_token"]}
+        )
+        assert response.status_code == 401
+
+    @pytest.mark.integration
+    async def test_logout_all_revokes_access_tokens(self, authenticated_client):
+        """Test that logging out everywhere revokes outstanding access tokens."""
+        client, auth_data = authenticated_client
+
+        response = await client.post("/api/v1/auth/logout-all")
+        assert response.status_code == 200
+
+        response = await client.get("/api/v1/auth/me")
+        assert response.status_code == 401
+        assert response.json()["detail"] == "Token has been revoked"
+
+    @pytest.mark.integration
+    async def test_logout_all_revokes_refresh_tokens(self, authenticated_client):
+        """Test that refresh tokens issued before logging out everywhere fail."""
+        client, auth_data = authenticated_client
+
+        response = await client.post("/api/v1/auth/logout-all")
+        assert response.status_code == 200
+
+        response = await client.post(
+            "/api/v1/auth/refresh", json={"refresh_token": auth_data["refresh_token"]}
+        )
+        assert response.status_code == 401
+        assert response.json()["detail"] == "Invalid refresh token"
+
     @pytest.mark.integration
     async def test_auth_flow_complete(self, client: AsyncClient, user_factory):
         """Test complete authentication flow: signup -> login -> get user -> refresh -> logout."""
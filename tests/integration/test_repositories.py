@@ -0,0 +1,63 @@
+"""
+Integration tests for repository queries.
+"""
+
+import uuid
+
+import pytest
+
+from domain.entities.task import Task
+from domain.entities.user import User
+from domain.value_objects.email import Email
+from infrastructure.repositories.task_repository_impl import TaskRepositoryImpl
+from infrastructure.repositories.user_repository_impl import UserRepositoryImpl
+
+
+class TestSubstringMatching:
+    """Integration tests for trigram-backed lookups by partial text."""
+
+    @pytest.fixture
+    async def user(self, db_session):
+        """A stored user with a few tasks."""
+        suffix = uuid.uuid4().hex[:8]
+        user = await UserRepositoryImpl(db_session).create_unique(
+            User.create(
+                Email(f"trigram_{suffix}@example.com"), f"trigram_{suffix}", "unused"
+            )
+        )
+        await TaskRepositoryImpl(db_session).create_many(
+            [
+                Task.create(user.id, "Renew passport"),
+                Task.create(user.id, "Book flights"),
+                Task.create(user.id, "Save 50% on tickets"),
+            ]
+        )
+        await db_session.commit()
+        return user
+
+    @pytest.mark.integration
+    async def test_search_by_title(self, db_session, user):
+        """Test matching task titles by partial, case-insensitive text."""
+        tasks = TaskRepositoryImpl(db_session)
+
+        found = await tasks.search_by_title(user.id, "PASS")
+        assert [task.title for task in found] == ["Renew passport"]
+        found = await tasks.search_by_title(user.id, "ave 50%")
+        assert [task.title for task in found] == ["Save 50% on tickets"]
+        assert await tasks.search_by_title(user.id, "ave 500") == []
+
+    @pytest.mark.integration
+    async def test_search_by_email_or_username(self, db_session, user):
+        """Test matching users by part of their email or username."""
+        users = UserRepositoryImpl(db_session)
+
+        found = await users.search_by_email_or_username(user.username[4:])
+        assert [match.id for match in found] == [user.id]
+
+    @pytest.mark.integration
+    async def test_short_fragments_are_rejected(self, db_session, user):
+        """Test that fragments no trigram index can serve are rejected."""
+        with pytest.raises(ValueError, match="at least 3 letters or digits"):
+            await TaskRepositoryImpl(db_session).search_by_title(user.id, "0%")
+        with pytest.raises(ValueError, match="at least 3 letters or digits"):
+            await UserRepositoryImpl(db_session).search_by_email_or_username("tr")
@@ -2,8 +2,13 @@
 Integration tests for task endpoints.
 """
 
+import json
+
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import text
+
+from infrastructure.database.task_counters import repair_task_counters
 
 
 class TestTaskEndpoints:
@@ -76,6 +81,109 @@ class TestTaskEndpoints:
         data = response.json()
         assert "detail" in data
 
+    @pytest.mark.integration
+    async def test_create_tasks_bulk(self, authenticated_client, task_factory):
+        """Test bulk creation returns IDs in order and counts every task."""
+        client, auth_data = authenticated_client
+        titles = [f"Bulk {i}" for i in range(5)]
+
+        response = await client.post(
+            "/api/v1/tasks/bulk",
+            json={"tasks": [task_factory(title=title) for title in titles]},
+        )
+
+        assert response.status_code == 201
+        data = response.json()
+        assert data["created_count"] == 5
+        for task_id, title in zip(data["ids"], titles):
+            task_response = await client.get(f"/api/v1/tasks/{task_id}")
+            assert task_response.json()["title"] == title
+
+        response = await client.get("/api/v1/tasks/")
+        assert response.json()["total_count"] == 5
+
+    @pytest.mark.integration
+    async def test_create_tasks_bulk_with_copy(self, authenticated_client, monkeypatch):
+        """Test that batches above the COPY threshold are created too."""
+        from infrastructure.repositories import task_repository_impl
+
+        monkeypatch.setattr(task_repository_impl, "BULK_COPY_THRESHOLD", 2)
+        client, auth_data = authenticated_client
+
+        response = await client.post(
+            "/api/v1/tasks/bulk",
+            json={"tasks": [{"title": f"Copied {i}"} for i in range(3)]},
+        )
+
+        assert response.status_code == 201
+        assert response.json()["created_count"] == 3
+        response = await client.get("/api/v1/tasks/")
+        assert response.json()["total_count"] == 3
+
+    @pytest.mark.integration
+    async def test_create_tasks_bulk_rejects_invalid_task(self, authenticated_client):
+        """Test that one invalid task rejects the whole batch."""
+        client, auth_data = authenticated_client
+
+        response = await client.post(
+            "/api/v1/tasks/bulk",
+            json={"tasks": [{"title": "Valid"}, {"title": "   "}]},
+        )
+
+        assert response.status_code == 400
+        assert response.json()["detail"].startswith("Task 1:")
+        response = await client.get("/api/v1/tasks/")
+        assert response.json()["total_count"] == 0
+
+    @pytest.mark.integration
+    async def test_update_tasks_bulk(self, authenticated_client):
+        """Test bulk edits apply task rules and skip tasks not owned."""
+        client, auth_data = authenticated_client
+        response = await client.post(
+            "/api/v1/tasks/bulk",
+            json={"tasks": [{"title": f"Task {i}"} for i in range(3)]},
+        )
+        task_ids = response.json()["ids"]
+        unknown_id = "00000000-0000-4000-8000-000000000000"
+
+        response = await client.patch(
+            "/api/v1/tasks/bulk",
+            json={"ids": task_ids[:2] + [unknown_id], "title": "  Renamed  "},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["updated_count"] == 2
+        assert set(data["updated_ids"]) == set(task_ids[:2])
+        task = (await client.get(f"/api/v1/tasks/{task_ids[0]}")).json()
+        assert task["title"] == "Renamed"
+        assert task["updated_at"] is not None
+
+        response = await client.patch("/api/v1/tasks/bulk", json={"ids": task_ids})
+        assert response.status_code == 400
+
+    @pytest.mark.integration
+    async def test_complete_tasks_bulk(self, authenticated_client):
+        """Test completing chosen tasks and then every pending task."""
+        client, auth_data = authenticated_client
+        response = await client.post(
+            "/api/v1/tasks/bulk",
+            json={"tasks": [{"title": f"Task {i}"} for i in range(3)]},
+        )
+        task_ids = response.json()["ids"]
+
+        response = await client.post(
+            "/api/v1/tasks/bulk/complete", json={"ids": task_ids[:1]}
+        )
+        assert response.json()["updated_ids"] == task_ids[:1]
+
+        response = await client.post("/api/v1/tasks/bulk/complete")
+        assert response.status_code == 200
+        assert set(response.json()["updated_ids"]) == set(task_ids[1:])
+
+        response = await client.get("/api/v1/tasks/")
+        assert response.json()["completed_count"] == 3
+
     @pytest.mark.integration
     async def test_get_tasks_empty_list(self, authenticated_client):
         """Test getting tasks when user has no tasks."""
@@ -138,6 +246,161 @@ class TestTaskEndpoints:
         assert data["page_size"] == 2
         assert data["has_next"] is True
 
+    @pytest.mark.integration
+    async def test_get_tasks_filtered_counts(self, authenticated_client, task_factory):
+        """Test that counts follow the completed filter and can be skipped."""
+        client, auth_data = authenticated_client
+
+        task_ids = []
+        for i in range(3):
+            response = await client.post(
+                "/api/v1/tasks/", json=task_factory(title=f"Task {i+1}")
+            )
+            task_ids.append(response.json()["id"])
+        await client.put(f"/api/v1/tasks/{task_ids[0]}", json={"completed": True})
+
+        response = await client.get("/api/v1/tasks/?completed=false&page_size=2")
+        data = response.json()
+        assert data["total_count"] == 2
+        assert data["completed_count"] == 1
+        assert data["pending_count"] == 2
+        assert data["has_next"] is False
+
+        response = await client.get("/api/v1/tasks/?include_counts=false&page_size=2")
+        data = response.json()
+        assert data["total_count"] is None
+        assert data["has_next"] is True
+
+    @pytest.mark.integration
+    async def test_task_counters_follow_writes_and_repair(
+        self, authenticated_client, task_factory, db_session
+    ):
+        """Test that task counters track writes and can be recomputed."""
+        client, auth_data = authenticated_client
+        user_id = auth_data["user"]["id"]
+
+        task_ids = []
+        for i in range(3):
+            response = await client.post(
+                "/api/v1/tasks/", json=task_factory(title=f"Task {i+1}")
+            )
+            task_ids.append(response.json()["id"])
+        await client.put(f"/api/v1/tasks/{task_ids[0]}", json={"completed": True})
+        await client.delete(f"/api/v1/tasks/{task_ids[1]}")
+
+        response = await client.get("/api/v1/tasks/")
+        data = response.json()
+        assert data["total_count"] == 2
+        assert data["completed_count"] == 1
+
+        await db_session.execute(
+            text(
+                "UPDATE user_task_counters SET total = 7, completed = 0 "
+                "WHERE user_id = CAST(:user_id AS uuid)"
+            ),
+            {"user_id": user_id},
+        )
+        repaired = await repair_task_counters(db_session, user_id)
+        await db_session.commit()
+        assert repaired == 1
+
+        response = await client.get("/api/v1/tasks/")
+        data = response.json()
+        assert data["total_count"] == 2
+        assert data["completed_count"] == 1
+
+    @pytest.mark.integration
+    async def test_get_tasks_cursor_pagination(
+        self, authenticated_client, task_factory
+    ):
+        """Test walking all tasks with cursors."""
+        client, auth_data = authenticated_client
+
+        for i in range(5):
+            await client.post("/api/v1/tasks/", json=task_factory(title=f"Task {i+1}"))
+
+        seen = []
+        response = await client.get("/api/v1/tasks/?page_size=2")
+        while True:
+            assert response.status_code == 200
+            data = response.json()
+            seen.extend(task["id"] for task in data["tasks"])
+            if not data["has_next"]:
+                assert data["next_cursor"] is None
+                break
+            response = await client.get(
+                "/api/v1/tasks/",
+                params={"page_size": 2, "cursor": data["next_cursor"]},
+            )
+
+        assert len(seen) == 5
+        assert len(set(seen)) == 5
+
+    @pytest.mark.integration
+    async def test_get_tasks_invalid_cursor(self, authenticated_client):
+        """Test that forged cursors are rejected."""
+        client, auth_data = authenticated_client
+
+        response = await client.get("/api/v1/tasks/?cursor=forged.cursor")
+
+        assert response.status_code == 400
+
+    @pytest.mark.integration
+    async def test_get_tasks_sorted_by_title(self, authenticated_client):
+        """Test walking a title-sorted listing with cursors."""
+        client, auth_data = authenticated_client
+        titles = ["banana", "Apple | pie", "cherry", "apple"]
+        await client.post(
+            "/api/v1/tasks/bulk", json={"tasks": [{"title": t} for t in titles]}
+        )
+
+        seen = []
+        params = {"sort": "title", "page_size": 3}
+        while True:
+            response = await client.get("/api/v1/tasks/", params=params)
+            assert response.status_code == 200
+            data = response.json()
+            seen.extend(task["title"] for task in data["tasks"])
+            if not data["has_next"]:
+                break
+            params["cursor"] = data["next_cursor"]
+
+        assert sorted(seen) == sorted(titles)
+        assert len(seen) == len(titles)
+
+        # A cursor only resumes the listing it came from
+        response = await client.get(
+            "/api/v1/tasks/", params={"cursor": params["cursor"]}
+        )
+        assert response.status_code == 400
+
+    @pytest.mark.integration
+    async def test_get_tasks_range_filters(self, authenticated_client):
+        """Test date range filters and the sorts they require."""
+        client, auth_data = authenticated_client
+        await client.post("/api/v1/tasks/", json={"title": "Old enough"})
+        response = await client.get("/api/v1/tasks/")
+        created_at = response.json()["tasks"][0]["created_at"]
+
+        response = await client.get(
+            "/api/v1/tasks/", params={"created_before": created_at}
+        )
+        assert response.status_code == 200
+        assert response.json()["tasks"] == []
+        assert response.json()["total_count"] is None
+
+        response = await client.get(
+            "/api/v1/tasks/",
+            params={"sort": "updated_at", "updated_since": created_at},
+        )
+        assert [task["title"] for task in response.json()["tasks"]] == ["Old enough"]
+
+        response = await client.get(
+            "/api/v1/tasks/", params={"sort": "title", "created_after": created_at}
+        )
+        assert response.status_code == 400
+        assert response.json()["detail"] == "created_after requires sort=created_at"
+
     @pytest.mark.integration
     async def test_get_tasks_filter_completed(self, authenticated_client, task_factory):
         """Test filtering tasks by completion status."""
@@ -169,6 +432,93 @@ class TestTaskEndpoints:
         assert len(data["tasks"]) == 1
         assert data["tasks"][0]["completed"] is False
 
+    @pytest.mark.integration
+    async def test_search_tasks(self, authenticated_client):
+        """Test ranked full-text search with cursor pages."""
+        client, auth_data = authenticated_client
+        await client.post(
+            "/api/v1/tasks/bulk",
+            json={
+                "tasks": [
+                    {"title": "Pay invoices", "description": "Quarterly run"},
+                    {"title": "Call bank", "description": "Ask about invoices"},
+                    {"title": "Water plants"},
+                ]
+            },
+        )
+
+        response = await client.get("/api/v1/tasks/search?q=invoice&page_size=1")
+        assert response.status_code == 200
+        data = response.json()
+        # Title matches are weighted above description matches
+        assert [task["title"] for task in data["tasks"]] == ["Pay invoices"]
+        assert data["has_next"] is True
+
+        # A cursor only resumes the search it came from
+        response = await client.get(
+            "/api/v1/tasks/search",
+            params={"q": "bank", "page_size": 1, "cursor": data["next_cursor"]},
+        )
+        assert response.status_code == 400
+
+        response = await client.get(
+            "/api/v1/tasks/search",
+            params={"q": "invoice", "page_size": 1, "cursor": data["next_cursor"]},
+        )
+        data = response.json()
+        assert [task["title"] for task in data["tasks"]] == ["Call bank"]
+        assert data["has_next"] is False
+
+        response = await client.get("/api/v1/tasks/search?q=-plants water")
+        assert response.json()["tasks"] == []
+
+    @pytest.mark.integration
+    async def test_export_tasks(self, authenticated_client):
+        """Test streaming every task as NDJSON and CSV."""
+        client, auth_data = authenticated_client
+        await client.post(
+            "/api/v1/tasks/bulk",
+            json={"tasks": [{"title": f"Task {i}"} for i in range(3)]},
+        )
+
+        response = await client.get("/api/v1/tasks/export?format=ndjson")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        titles = [json.loads(line)["title"] for line in response.text.splitlines()]
+        assert titles == ["Task 2", "Task 1", "Task 0"]
+
+        response = await client.get("/api/v1/tasks/export?format=csv")
+        assert response.status_code == 200
+        lines = response.text.splitlines()
+        assert lines[0] == "id,title,description,completed,created_at,updated_at"
+        assert len(lines) == 4
+
+    @pytest.mark.integration
+    async def test_import_tasks(self, authenticated_client, monkeypatch):
+        """Test importing CSV in COPY batches while skipping invalid rows."""
+        from presentation.api import task_router
+
+        monkeypatch.setattr(task_router, "IMPORT_BATCH_SIZE", 2)
+        monkeypatch.setattr(
+            "infrastructure.repositories.task_repository_impl.BULK_COPY_THRESHOLD", 2
+        )
+        client, auth_data = authenticated_client
+        body = "title,description,completed\nA,,true\n,blank,false\nB,x\nC,y,no\n"
+
+        response = await client.post(
+            "/api/v1/tasks/import?format=csv", content=body.encode()
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["imported_count"] == 3
+        assert data["error_count"] == 1
+        assert data["errors"] == [{"row": 2, "error": "Task title cannot be empty"}]
+
+        response = await client.get("/api/v1/tasks/")
+        assert response.json()["total_count"] == 3
+        assert response.json()["completed_count"] == 1
+
     @pytest.mark.integration
     async def test_get_task_by_id_success(self, authenticated_client, task_factory):
         """Test getting specific task by ID."""
@@ -254,6 +604,22 @@ class TestTaskEndpoints:
         assert data["description"] == task_data["description"]  # Unchanged
         assert data["completed"] is False  # Unchanged
 
+    @pytest.mark.integration
+    async def test_update_task_completed_twice(
+        self, authenticated_client, task_factory
+    ):
+        """Test that completing a completed task keeps its updated_at."""
+        client, auth_data = authenticated_client
+        create_response = await client.post("/api/v1/tasks/", json=task_factory())
+        task_id = create_response.json()["id"]
+
+        first = await client.put(f"/api/v1/tasks/{task_id}", json={"completed": True})
+        second = await client.put(f"/api/v1/tasks/{task_id}", json={"completed": True})
+
+        assert second.status_code == 200
+        assert second.json()["completed"] is True
+        assert second.json()["updated_at"] == first.json()["updated_at"]
+
     @pytest.mark.integration
     async def test_update_task_not_found(self, authenticated_client):
         """Test updating non-existent task."""
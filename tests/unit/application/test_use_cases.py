@@ -2,6 +2,7 @@
 Unit tests for application use cases.
 """
 
+from dataclasses import replace
 from datetime import datetime
 from unittest.mock import AsyncMock, Mock
 
@@ -9,7 +10,7 @@ import pytest
 
 from application.dto.user_dto import UserCreateDTO, UserLoginDTO
 from application.use_cases.auth_use_cases import AuthUseCases
-from domain.entities.user import User
+from domain.entities.user import User, UserCredentials
 from domain.value_objects.email import Email
 from domain.value_objects.password import Password
 from domain.value_objects.user_id import UserId
@@ -18,15 +19,19 @@ from domain.value_objects.user_id import UserId
 @pytest.fixture
 def mock_user_repository():
     """Mock user repository."""
-    return AsyncMock()
+    mock = AsyncMock()
+    mock.exists_by_email.return_value = False
+    mock.exists_by_username.return_value = False
+    return mock
 
 
 @pytest.fixture
 def mock_password_service():
     """Mock password service."""
     mock = Mock()
-    mock.hash_password.return_value = "hashed_password"
-    mock.verify_password.return_value = True
+    mock.hash_password_async = AsyncMock(return_value="hashed_password")
+    mock.verify_password_async = AsyncMock(return_value=True)
+    mock.needs_update.return_value = False
     return mock
 
 
@@ -42,9 +47,25 @@ def mock_jwt_service():
 
 
 @pytest.fixture
-def auth_use_cases(mock_user_repository, mock_password_service, mock_jwt_service):
+def mock_revoked_token_repository():
+    """Mock revoked token repository."""
+    return AsyncMock()
+
+
+@pytest.fixture
+def auth_use_cases(
+    mock_user_repository,
+    mock_password_service,
+    mock_jwt_service,
+    mock_revoked_token_repository,
+):
     """Auth use cases with mocked dependencies."""
-    return AuthUseCases(mock_user_repository, mock_password_service, mock_jwt_service)
+    return AuthUseCases(
+        mock_user_repository,
+        mock_password_service,
+        mock_jwt_service,
+        mock_revoked_token_repository,
+    )
 
 
 @pytest.fixture
@@ -55,6 +76,19 @@ def sample_user():
     return user
 
 
+@pytest.fixture
+def sample_credentials(sample_user):
+    """Login projection of the sample user."""
+    return UserCredentials(
+        id=str(sample_user.id),
+        username=sample_user.username,
+        hashed_password=sample_user.hashed_password,
+        is_active=sample_user.is_active,
+        token_version=sample_user.token_version,
+        created_at=sample_user.created_at,
+    )
+
+
 class TestAuthUseCases:
     """Tests for AuthUseCases."""
 
@@ -68,9 +102,7 @@ class TestAuthUseCases:
             email="test@example.com", username="testuser", password="TestPassword123"
         )
 
-        mock_user_repository.exists_by_email.return_value = False
-        mock_user_repository.exists_by_username.return_value = False
-        mock_user_repository.create.return_value = sample_user
+        mock_user_repository.create_unique.return_value = sample_user
 
         # Execute
         result = await auth_use_cases.register_user(user_data)
@@ -81,40 +113,61 @@ class TestAuthUseCases:
         assert result["tokens"].access_token == "access_token"
         assert result["tokens"].refresh_token == "refresh_token"
 
-        # Verify repository calls
         mock_user_repository.exists_by_email.assert_called_once()
-        mock_user_repository.exists_by_username.assert_called_once()
-        mock_user_repository.create.assert_called_once()
+        mock_user_repository.exists_by_username.assert_called_once_with("testuser")
+        mock_user_repository.create_unique.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_register_user_email_exists(
-        self, auth_use_cases, mock_user_repository
+        self, auth_use_cases, mock_user_repository, mock_password_service
     ):
-        """Test user registration with existing email."""
+        """Test that a taken email is rejected before the password is hashed."""
         user_data = UserCreateDTO(
             email="test@example.com", username="testuser", password="TestPassword123"
         )
 
         mock_user_repository.exists_by_email.return_value = True
+        mock_user_repository.exists_by_username.return_value = True
 
         with pytest.raises(ValueError, match="User with this email already exists"):
             await auth_use_cases.register_user(user_data)
 
+        mock_password_service.hash_password_async.assert_not_called()
+        mock_user_repository.create_unique.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_register_user_username_exists(
-        self, auth_use_cases, mock_user_repository
+        self, auth_use_cases, mock_user_repository, mock_password_service
     ):
-        """Test user registration with existing username."""
+        """Test that a taken username is rejected before the password is hashed."""
         user_data = UserCreateDTO(
             email="test@example.com", username="testuser", password="TestPassword123"
         )
 
-        mock_user_repository.exists_by_email.return_value = False
         mock_user_repository.exists_by_username.return_value = True
 
         with pytest.raises(ValueError, match="User with this username already exists"):
             await auth_use_cases.register_user(user_data)
 
+        mock_password_service.hash_password_async.assert_not_called()
+        mock_user_repository.create_unique.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_register_user_concurrent_duplicate(
+        self, auth_use_cases, mock_user_repository
+    ):
+        """Test that a duplicate inserted after the checks is still rejected."""
+        user_data = UserCreateDTO(
+            email="test@example.com", username="testuser", password="TestPassword123"
+        )
+
+        mock_user_repository.create_unique.side_effect = ValueError(
+            "User with this email already exists"
+        )
+
+        with pytest.raises(ValueError, match="User with this email already exists"):
+            await auth_use_cases.register_user(user_data)
+
     @pytest.mark.asyncio
     async def test_register_user_invalid_password(
         self, auth_use_cases, mock_user_repository
@@ -126,28 +179,29 @@ class TestAuthUseCases:
             password="weakpass123",  # Has minimum length but no uppercase
         )
 
-        mock_user_repository.exists_by_email.return_value = False
-        mock_user_repository.exists_by_username.return_value = False
-
         with pytest.raises(ValueError, match="Password must be at least"):
             await auth_use_cases.register_user(user_data)
 
+        mock_user_repository.create_unique.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_login_user_success(
-        self, auth_use_cases, mock_user_repository, sample_user
+        self, auth_use_cases, mock_user_repository, sample_credentials
     ):
         """Test successful user login."""
         login_data = UserLoginDTO(email="test@example.com", password="TestPassword123")
 
-        mock_user_repository.get_by_email.return_value = sample_user
+        mock_user_repository.get_credentials_by_email.return_value = sample_credentials
 
         result = await auth_use_cases.login_user(login_data)
 
         assert result["user"]["email"] == "test@example.com"
         assert result["tokens"].access_token == "access_token"
         assert result["tokens"].refresh_token == "refresh_token"
+        assert result["rehash_needed"] is False
 
-        mock_user_repository.get_by_email.assert_called_once()
+        mock_user_repository.get_credentials_by_email.assert_called_once()
+        mock_user_repository.get_by_email.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_login_user_not_found(self, auth_use_cases, mock_user_repository):
@@ -156,33 +210,38 @@ class TestAuthUseCases:
             email="nonexistent@example.com", password="TestPassword123"
         )
 
-        mock_user_repository.get_by_email.return_value = None
+        mock_user_repository.get_credentials_by_email.return_value = None
 
         with pytest.raises(ValueError, match="Invalid email or password"):
             await auth_use_cases.login_user(login_data)
 
     @pytest.mark.asyncio
     async def test_login_user_inactive(
-        self, auth_use_cases, mock_user_repository, sample_user
+        self, auth_use_cases, mock_user_repository, sample_credentials
     ):
         """Test login with inactive user."""
         login_data = UserLoginDTO(email="test@example.com", password="TestPassword123")
 
-        sample_user.deactivate()
-        mock_user_repository.get_by_email.return_value = sample_user
+        mock_user_repository.get_credentials_by_email.return_value = replace(
+            sample_credentials, is_active=False
+        )
 
         with pytest.raises(ValueError, match="Invalid email or password"):
             await auth_use_cases.login_user(login_data)
 
     @pytest.mark.asyncio
     async def test_login_user_wrong_password(
-        self, auth_use_cases, mock_user_repository, mock_password_service, sample_user
+        self,
+        auth_use_cases,
+        mock_user_repository,
+        mock_password_service,
+        sample_credentials,
     ):
         """Test login with wrong password."""
         login_data = UserLoginDTO(email="test@example.com", password="WrongPassword123")
 
-        mock_user_repository.get_by_email.return_value = sample_user
-        mock_password_service.verify_password.return_value = False
+        mock_user_repository.get_credentials_by_email.return_value = sample_credentials
+        mock_password_service.verify_password_async.return_value = False
 
         with pytest.raises(ValueError, match="Invalid email or password"):
             await auth_use_cases.login_user(login_data)
@@ -216,6 +275,22 @@ class TestAuthUseCases:
         with pytest.raises(ValueError, match="Invalid refresh token"):
             await auth_use_cases.refresh_token(refresh_token)
 
+    @pytest.mark.asyncio
+    async def test_refresh_token_after_logout_all(
+        self, auth_use_cases, mock_user_repository, mock_jwt_service, sample_user
+    ):
+        """Test that refresh tokens from before a token revocation are rejected."""
+        mock_jwt_service.verify_token.return_value = {
+            "sub": str(sample_user.id),
+            "ver": sample_user.token_version,
+        }
+        sample_user.revoke_tokens()
+        mock_user_repository.get_by_id.return_value = sample_user
+
+        with pytest.raises(ValueError, match="Invalid refresh token"):
+            await auth_use_cases.refresh_token("stale_refresh_token")
+        mock_jwt_service.create_access_token.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_refresh_token_user_not_found(
         self, auth_use_cases, mock_user_repository, mock_jwt_service
@@ -255,3 +330,86 @@ class TestAuthUseCases:
 
         assert result is None
         mock_user_repository.get_by_id.assert_called_once_with(user_id)
+
+    @pytest.mark.asyncio
+    async def test_revoke_all_tokens(
+        self, auth_use_cases, mock_user_repository, sample_user
+    ):
+        """Test revoking all tokens bumps and persists the token version."""
+        mock_user_repository.get_by_id.return_value = sample_user
+
+        await auth_use_cases.revoke_all_tokens(sample_user.id)
+
+        assert sample_user.token_version == 1
+        mock_user_repository.update.assert_called_once_with(sample_user)
+
+    @pytest.mark.asyncio
+    async def test_revoke_all_tokens_user_not_found(
+        self, auth_use_cases, mock_user_repository
+    ):
+        """Test revoking tokens for an unknown user."""
+        mock_user_repository.get_by_id.return_value = None
+
+        with pytest.raises(ValueError, match="User not found"):
+            await auth_use_cases.revoke_all_tokens(UserId.generate())
+
+    @pytest.mark.asyncio
+    async def test_logout_revokes_tokens(
+        self, auth_use_cases, mock_jwt_service, mock_revoked_token_repository
+    ):
+        """Test that logout records both presented tokens as revoked."""
+        user_id = UserId.generate()
+        mock_jwt_service.verify_token.side_effect = [
+            {"sub": str(user_id), "jti": "access-jti", "exp": 1900000000},
+            {"sub": str(user_id), "jti": "refresh-jti", "exp": 1900000000},
+        ]
+
+        revoked = await auth_use_cases.logout("access_token", "refresh_token")
+
+        assert revoked == 2
+        recorded = [
+            call.args[0] for call in mock_revoked_token_repository.add.call_args_list
+        ]
+        assert [token.jti for token in recorded] == ["access-jti", "refresh-jti"]
+        assert recorded[0].user_id == user_id
+
+    @pytest.mark.asyncio
+    async def test_logout_ignores_invalid_tokens(
+        self, auth_use_cases, mock_jwt_service, mock_revoked_token_repository
+    ):
+        """Test that logout without valid tokens revokes nothing."""
+        mock_jwt_service.verify_token.return_value = None
+
+        revoked = await auth_use_cases.logout("invalid_token", None)
+
+        assert revoked == 0
+        mock_revoked_token_repository.add.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_rehash_password(
+        self, auth_use_cases, mock_user_repository, mock_password_service, sample_user
+    ):
+        """Test that an outdated hash is replaced and persisted."""
+        mock_user_repository.get_by_id.return_value = sample_user
+        mock_password_service.needs_update.return_value = True
+        mock_password_service.verify_and_update_async = AsyncMock(
+            return_value=(True, "new_hashed_password")
+        )
+
+        result = await auth_use_cases.rehash_password(sample_user.id, "TestPassword123")
+
+        assert result is True
+        assert sample_user.hashed_password == "new_hashed_password"
+        mock_user_repository.update.assert_called_once_with(sample_user)
+
+    @pytest.mark.asyncio
+    async def test_rehash_password_not_needed(
+        self, auth_use_cases, mock_user_repository, sample_user
+    ):
+        """Test that up-to-date hashes are left alone."""
+        mock_user_repository.get_by_id.return_value = sample_user
+
+        result = await auth_use_cases.rehash_password(sample_user.id, "TestPassword123")
+
+        assert result is False
+        mock_user_repository.update.assert_not_called()
@@ -8,7 +8,7 @@ from unittest.mock import patch
 import pytest
 
 from domain.entities.task import Task
-from domain.entities.user import User
+from domain.entities.user import Principal, User
 from domain.value_objects.email import Email
 from domain.value_objects.task_id import TaskId
 from domain.value_objects.user_id import UserId
@@ -132,6 +132,29 @@ class TestUser:
             assert user.is_active is True
             assert user.updated_at == mock_now
 
+    def test_revoke_tokens(self):
+        """Test revoking tokens bumps the token version."""
+        email = Email("test@example.com")
+        user = User.create(email, "testuser", "hashed_password")
+        assert user.token_version == 0
+
+        user.revoke_tokens()
+        user.revoke_tokens()
+
+        assert user.token_version == 2
+        assert user.updated_at is not None
+
+    def test_principal_from_user(self):
+        """Test building a principal from a user."""
+        email = Email("test@example.com")
+        user = User.create(email, "testuser", "hashed_password")
+
+        principal = Principal.from_user(user)
+
+        assert principal.id == user.id
+        assert principal.username == "testuser"
+        assert principal.is_active is True
+
 
 class TestTask:
     """Tests for Task entity."""
@@ -216,6 +239,15 @@ class TestTask:
         with pytest.raises(ValueError, match="Task title cannot be empty"):
             task.update_title("")
 
+    def test_validate_title_normalizes(self):
+        """Test that title validation returns the stripped title."""
+        assert Task.validate_title("  Title  ") == "Title"
+
+    def test_validate_title_too_long(self):
+        """Test that title validation enforces the length limit."""
+        with pytest.raises(ValueError, match="cannot exceed 200 characters"):
+            Task.validate_title("x" * 201)
+
     def test_update_description(self):
         """Test updating task description."""
         user_id = UserId.generate()
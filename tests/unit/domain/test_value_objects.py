@@ -3,11 +3,16 @@ Unit tests for domain value objects.
 """
 
 import uuid
+from datetime import datetime, timezone
 
 import pytest
 
+from domain.entities.task import Task
 from domain.value_objects.email import Email
 from domain.value_objects.password import Password
+from domain.value_objects.task_changes import TaskChanges
+from domain.value_objects.task_counts import TaskCounts
+from domain.value_objects.task_cursor import TaskCursor, TaskSearchCursor
 from domain.value_objects.task_id import TaskId
 from domain.value_objects.user_id import UserId
 
@@ -179,3 +184,128 @@ class TestTaskId:
         assert task_id1 != task_id3
         assert task_id1 == uuid_str
         assert task_id1 != str(task_id3.value)
+
+
+class TestTaskCursor:
+    """Tests for TaskCursor value object."""
+
+    def test_cursor_after_task_uses_creation_time(self):
+        """Test that unfiltered and pending listings sort by creation time."""
+        task = Task.create(UserId.generate(), "Title")
+
+        cursor = TaskCursor.after(task, completed=False)
+
+        assert cursor.sort_key == task.created_at
+        assert cursor.task_id == str(task.id)
+        assert cursor.completed is False
+
+    def test_cursor_after_completed_task_uses_completion_time(self):
+        """Test that the completed listing sorts by the last update."""
+        task = Task.create(UserId.generate(), "Title")
+        task.mark_completed()
+
+        assert TaskCursor.after(task, completed=True).sort_key == task.updated_at
+
+    def test_cursor_after_completed_task_without_update_time(self):
+        """Test the fallback for completed tasks that were never updated."""
+        created_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        task = Task(
+            id=TaskId.generate(),
+            user_id=UserId.generate(),
+            title="Title",
+            completed=True,
+            created_at=created_at,
+        )
+
+        assert TaskCursor.after(task, completed=True).sort_key == created_at
+
+    def test_cursor_sort_defaults_to_filter_order(self):
+        """Test that a cursor without a sort records its listing's default."""
+        assert TaskCursor("key", "id").sort == "created_at"
+        assert TaskCursor("key", "id", completed=False).sort == "created_at"
+        assert TaskCursor("key", "id", completed=True).sort == "updated_at"
+
+    def test_cursor_after_task_by_title(self):
+        """Test that a title listing positions cursors by title."""
+        task = Task.create(UserId.generate(), "Title")
+
+        cursor = TaskCursor.after(task, sort="title")
+
+        assert cursor.sort_key == "Title"
+        assert cursor.sort == "title"
+
+    def test_cursor_rejects_unknown_sort(self):
+        """Test that only listing sorts are accepted."""
+        with pytest.raises(ValueError, match="Unknown task sort"):
+            TaskCursor("key", "id", sort="description")
+
+
+class TestTaskCounts:
+    """Tests for TaskCounts value object."""
+
+    def test_pending_is_derived(self):
+        """Test that pending tasks are the ones not completed."""
+        assert TaskCounts(total=5, completed=2).pending == 3
+
+    def test_matching_follows_filter(self):
+        """Test the count for each completed filter."""
+        counts = TaskCounts(total=5, completed=2)
+
+        assert counts.matching(None) == 5
+        assert counts.matching(True) == 2
+        assert counts.matching(False) == 3
+
+    def test_inconsistent_counts_rejected(self):
+        """Test that more completed than total tasks is rejected."""
+        with pytest.raises(ValueError):
+            TaskCounts(total=1, completed=2)
+
+
+class TestTaskChanges:
+    """Tests for TaskChanges value object."""
+
+    def test_fields_are_normalized_by_task_rules(self):
+        """Test that titles and descriptions are stripped like Task does."""
+        changes = TaskChanges.from_fields(
+            {"title": "  Title  ", "description": " Notes ", "completed": True}
+        )
+
+        assert changes.values == {
+            "title": "Title",
+            "description": "Notes",
+            "completed": True,
+        }
+
+    def test_invalid_title_rejected(self):
+        """Test that a blank title breaks the task rules."""
+        with pytest.raises(ValueError, match="Task title cannot be empty"):
+            TaskChanges.from_fields({"title": "   "})
+
+    def test_null_completion_rejected(self):
+        """Test that completion cannot be set to null."""
+        with pytest.raises(ValueError):
+            TaskChanges.from_fields({"completed": None})
+
+    def test_empty_changes_rejected(self):
+        """Test that at least one change is required."""
+        with pytest.raises(ValueError, match="No task changes given"):
+            TaskChanges.from_fields({})
+
+    def test_only_completion(self):
+        """Test detecting edits that only change completion."""
+        assert TaskChanges.from_fields({"completed": False}).only_completion
+        assert not TaskChanges.from_fields(
+            {"completed": True, "title": "Title"}
+        ).only_completion
+
+
+class TestTaskSearchCursor:
+    """Tests for TaskSearchCursor value object."""
+
+    def test_cursor_matches_its_search_text(self):
+        """Test that a cursor only resumes the search it was taken from."""
+        cursor = TaskSearchCursor.after(0.5, str(TaskId.generate()), "invoice")
+
+        assert cursor.matches("invoice")
+        assert not cursor.matches("invoices")
+        assert "invoice" not in cursor.query_digest
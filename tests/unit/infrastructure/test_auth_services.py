@@ -2,15 +2,25 @@
 Unit tests for infrastructure authentication services.
 """
 
-from datetime import datetime, timedelta
-from unittest.mock import patch
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
 
 import pytest
+from jose import jwt
 
+from domain.entities.revoked_token import RevokedToken
 from domain.value_objects.password import Password
 from domain.value_objects.user_id import UserId
+from infrastructure.auth.admission import AdmissionController, AdmissionRejectedError
 from infrastructure.auth.jwt_service import JWTService
 from infrastructure.auth.password_service import PasswordService
+from infrastructure.auth.revocation import TokenRevocationList
+from infrastructure.auth.signing_keys import (
+    KeyRing,
+    SigningKey,
+    generate_private_key_pem,
+)
 
 
 class TestPasswordService:
@@ -20,6 +30,10 @@ class TestPasswordService:
         """Setup method called before each test."""
         self.password_service = PasswordService()
 
+    def teardown_method(self):
+        """Teardown method called after each test."""
+        self.password_service.shutdown()
+
     def test_hash_password(self):
         """Test password hashing."""
         password = Password("TestPassword123")
@@ -71,6 +85,80 @@ class TestPasswordService:
         result = self.password_service.needs_update(hashed)
         assert result is False
 
+    async def test_hash_and_verify_password_async(self):
+        """Test hashing and verifying on the worker pool."""
+        password = Password("TestPassword123")
+
+        hashed = await self.password_service.hash_password_async(password)
+
+        assert hashed.startswith("$2b$")
+        assert await self.password_service.verify_password_async(
+            "TestPassword123", hashed
+        )
+        assert not await self.password_service.verify_password_async(
+            "WrongPassword", hashed
+        )
+
+    async def test_async_hashing_records_metrics(self):
+        """Test that pool work is reflected in the service statistics."""
+        password = Password("TestPassword123")
+
+        await self.password_service.hash_password_async(password)
+        stats = self.password_service.stats()
+
+        assert stats["completed"] == 1
+        assert stats["active"] == 0
+        assert stats["queue_depth"] == 0
+        assert stats["max_hash_ms"] > 0
+
+    def test_configure_rounds_flags_lower_costs(self):
+        """Test that configuring a cost marks only cheaper hashes outdated."""
+        password = Password("TestPassword123")
+        self.password_service.configure(rounds=4)
+        cheap_hash = self.password_service.hash_password(password)
+        self.password_service.configure(rounds=6)
+        costly_hash = self.password_service.hash_password(password)
+
+        self.password_service.configure(rounds=5)
+        new_hash = self.password_service.hash_password(password)
+
+        assert new_hash.startswith("$2b$05$")
+        assert self.password_service.needs_update(cheap_hash) is True
+        assert self.password_service.needs_update(costly_hash) is False
+        assert self.password_service.needs_update(new_hash) is False
+        assert self.password_service.verify_password("TestPassword123", cheap_hash)
+
+    def test_calibrate_respects_budget_floor(self):
+        """Test that calibration never goes below the configured floor."""
+        rounds = self.password_service.calibrate(target_ms=0.001, min_rounds=4)
+
+        assert rounds == 4
+        assert self.password_service.rounds == 4
+
+    def test_calibrate_increases_cost_within_budget(self):
+        """Test that calibration picks a higher cost when the budget allows."""
+        rounds = self.password_service.calibrate(target_ms=50, min_rounds=4)
+
+        assert rounds > 4
+
+    async def test_verify_and_update_async(self):
+        """Test that an outdated hash is verified and replaced."""
+        self.password_service.configure(rounds=4)
+        old_hash = self.password_service.hash_password(Password("TestPassword123"))
+        self.password_service.configure(rounds=5)
+
+        verified, new_hash = await self.password_service.verify_and_update_async(
+            "TestPassword123", old_hash
+        )
+
+        assert verified is True
+        assert new_hash.startswith("$2b$05$")
+
+    def test_invalid_executor_kind(self):
+        """Test that unknown executor kinds are rejected."""
+        with pytest.raises(ValueError, match="executor"):
+            PasswordService(executor_kind="fiber")
+
 
 class TestJWTService:
     """Tests for JWTService."""
@@ -86,6 +174,7 @@ class TestJWTService:
             },
         ):
             self.jwt_service = JWTService()
+        self.jwt_service.revocation_list = TokenRevocationList()
 
     def test_create_access_token(self):
         """Test creating access token."""
@@ -132,6 +221,96 @@ class TestJWTService:
         assert payload["sub"] == str(user_id)
         assert payload["type"] == "refresh"
 
+    def test_access_token_carries_token_version(self):
+        """Test that access tokens embed the user's token version."""
+        user_id = UserId.generate()
+
+        token = self.jwt_service.create_access_token(user_id, "testuser", 3)
+        payload = self.jwt_service.verify_token(token, "access")
+
+        assert payload["ver"] == 3
+
+    def test_refresh_token_carries_token_version(self):
+        """Test that refresh tokens embed the user's token version."""
+        user_id = UserId.generate()
+
+        token = self.jwt_service.create_refresh_token(user_id, 2)
+        payload = self.jwt_service.verify_token(token, "refresh")
+
+        assert payload["ver"] == 2
+
+    def test_stateless_mode_is_opt_in(self):
+        """Test that stateless access tokens are disabled by default."""
+        assert self.jwt_service.stateless_access_tokens is False
+
+        with patch.dict("os.environ", {"JWT_STATELESS_ACCESS_TOKENS": "true"}):
+            assert JWTService().stateless_access_tokens is True
+
+    def test_verify_token_uses_cache(self):
+        """Test that repeated verification of a token is served from cache."""
+        token = self.jwt_service.create_access_token(UserId.generate(), "testuser")
+
+        first = self.jwt_service.verify_token(token, "access")
+        second = self.jwt_service.verify_token(token, "access")
+
+        assert first == second
+        stats = self.jwt_service.cache_stats()
+        assert stats["misses"] == 1
+        assert stats["hits"] == 1
+
+    def test_cached_token_still_checks_type(self):
+        """Test that a cached access token is not accepted as a refresh token."""
+        token = self.jwt_service.create_access_token(UserId.generate(), "testuser")
+        self.jwt_service.verify_token(token, "access")
+
+        assert self.jwt_service.verify_token(token, "refresh") is None
+
+    def test_cached_payload_is_a_copy(self):
+        """Test that callers cannot mutate the cached payload."""
+        token = self.jwt_service.create_access_token(UserId.generate(), "testuser")
+        payload = self.jwt_service.verify_token(token, "access")
+        payload["username"] = "tampered"
+
+        assert self.jwt_service.verify_token(token, "access")["username"] == "testuser"
+
+    def test_cache_entry_expires_with_token(self):
+        """Test that cache entries do not outlive the token's exp claim."""
+        token = self.jwt_service.create_access_token(UserId.generate(), "testuser")
+        expires_at = jwt.get_unverified_claims(token)["exp"]
+
+        with patch(
+            "infrastructure.auth.jwt_service.time.time", return_value=expires_at - 5
+        ), patch("infrastructure.cache.ttl_cache.time.monotonic", return_value=1000.0):
+            self.jwt_service.verify_token(token, "access")
+        with patch(
+            "infrastructure.cache.ttl_cache.time.monotonic", return_value=1006.0
+        ):
+            self.jwt_service.verify_token(token, "access")
+
+        assert self.jwt_service.cache_stats()["misses"] == 2
+
+    def test_tokens_have_unique_jti(self):
+        """Test that every issued token carries its own token ID."""
+        user_id = UserId.generate()
+
+        first = self.jwt_service.create_access_token(user_id, "testuser")
+        second = self.jwt_service.create_access_token(user_id, "testuser")
+        refresh = self.jwt_service.create_refresh_token(user_id)
+
+        jtis = {jwt.get_unverified_claims(t)["jti"] for t in (first, second, refresh)}
+        assert len(jtis) == 3
+
+    def test_verify_token_revoked(self):
+        """Test that a revoked token is rejected even when cached."""
+        token = self.jwt_service.create_access_token(UserId.generate(), "testuser")
+        payload = self.jwt_service.verify_token(token, "access")
+
+        self.jwt_service.revocation_list.revoke(
+            payload["jti"], datetime.now(timezone.utc) + timedelta(minutes=30)
+        )
+
+        assert self.jwt_service.verify_token(token, "access") is None
+
     def test_verify_token_invalid(self):
         """Test verifying invalid token."""
         invalid_token = "invalid.token.here"
@@ -167,29 +346,6 @@ class TestJWTService:
 
         assert extracted_id is None
 
-    def test_refresh_access_token_valid(self):
-        """Test refreshing access token with valid refresh token."""
-        user_id = UserId.generate()
-        refresh_token = self.jwt_service.create_refresh_token(user_id)
-
-        new_access_token = self.jwt_service.refresh_access_token(refresh_token)
-
-        assert new_access_token is not None
-        assert isinstance(new_access_token, str)
-
-        # Verify the new access token
-        payload = self.jwt_service.verify_token(new_access_token, "access")
-        assert payload is not None
-        assert payload["sub"] == str(user_id)
-
-    def test_refresh_access_token_invalid(self):
-        """Test refreshing access token with invalid refresh token."""
-        invalid_refresh_token = "invalid.refresh.token"
-
-        new_access_token = self.jwt_service.refresh_access_token(invalid_refresh_token)
-
-        assert new_access_token is None
-
     @patch("infrastructure.auth.jwt_service.datetime")
     def test_token_expiration(self, mock_datetime):
         """Test token expiration handling."""
@@ -226,6 +382,8 @@ class TestJWTService:
         assert "exp" in access_payload
         assert "type" in access_payload
         assert access_payload["type"] == "access"
+        assert access_payload["active"] is True
+        assert access_payload["ver"] == 0
 
         # Check refresh token claims
         assert "sub" in refresh_payload
@@ -233,3 +391,222 @@ class TestJWTService:
         assert "type" in refresh_payload
         assert refresh_payload["type"] == "refresh"
         assert "username" not in refresh_payload  # Refresh tokens don't need username
+
+
+class TestAsymmetricSigning:
+    """Tests for JWTService with a KeyRing of asymmetric signing keys."""
+
+    def setup_method(self):
+        """Setup method called before each test."""
+        self.old_key = SigningKey.from_pem(
+            "2026-01", "RS256", generate_private_key_pem("RS256")
+        )
+        self.new_key = SigningKey.from_pem(
+            "2026-02", "RS256", generate_private_key_pem("RS256")
+        )
+
+    def _service(self, keys, active_kid):
+        service = JWTService(KeyRing({key.kid: key for key in keys}, active_kid))
+        service.revocation_list = TokenRevocationList()
+        return service
+
+    def test_tokens_carry_kid_and_verify(self):
+        """Test that tokens are signed with the active key and name it in the header."""
+        service = self._service([self.old_key], "2026-01")
+        user_id = UserId.generate()
+
+        token = service.create_access_token(user_id, "testuser")
+
+        assert jwt.get_unverified_header(token)["kid"] == "2026-01"
+        assert jwt.get_unverified_header(token)["alg"] == "RS256"
+        assert service.verify_token(token)["sub"] == str(user_id)
+
+    def test_rotation_keeps_old_tokens_valid(self):
+        """Test that tokens signed with a retired key still verify after rotation."""
+        before = self._service([self.old_key], "2026-01")
+        old_token = before.create_access_token(UserId.generate(), "testuser")
+
+        after = self._service([self.old_key, self.new_key], "2026-02")
+        new_token = after.create_access_token(UserId.generate(), "testuser")
+
+        assert jwt.get_unverified_header(new_token)["kid"] == "2026-02"
+        assert after.verify_token(old_token) is not None
+        assert after.verify_token(new_token) is not None
+
+    def test_unknown_kid_rejected(self):
+        """Test that tokens signed with a key outside the ring are rejected."""
+        other = self._service([self.new_key], "2026-02")
+        token = other.create_access_token(UserId.generate(), "testuser")
+
+        service = self._service([self.old_key], "2026-01")
+
+        assert service.verify_token(token) is None
+
+    def test_jwks_publishes_public_keys_only(self):
+        """Test that the JWKS lists every key without private material."""
+        service = self._service([self.old_key, self.new_key], "2026-02")
+
+        keys = service.jwks()["keys"]
+
+        assert [key["kid"] for key in keys] == ["2026-01", "2026-02"]
+        assert all(key["kty"] == "RSA" and key["use"] == "sig" for key in keys)
+        assert all("d" not in key for key in keys)
+
+    def test_es256_signing(self):
+        """Test signing with an elliptic curve key."""
+        key = SigningKey.from_pem("ec", "ES256", generate_private_key_pem("ES256"))
+        service = self._service([key], "ec")
+
+        token = service.create_access_token(UserId.generate(), "testuser")
+
+        assert jwt.get_unverified_header(token)["alg"] == "ES256"
+        assert service.verify_token(token) is not None
+
+    def test_shared_secret_publishes_no_keys(self):
+        """Test that HS256 mode never exposes key material."""
+        with patch.dict("os.environ", {"JWT_ALGORITHM": "HS256"}):
+            service = JWTService()
+
+        assert service.jwks() == {"keys": []}
+
+    def test_key_ring_from_directory(self, tmp_path):
+        """Test loading keys from a directory with the newest kid active."""
+        for kid in ("2026-01", "2026-02"):
+            (tmp_path / f"{kid}.pem").write_text(generate_private_key_pem("ES256"))
+
+        key_ring = KeyRing.from_directory(str(tmp_path), "ES256")
+
+        assert len(key_ring) == 2
+        assert key_ring.active.kid == "2026-02"
+        assert KeyRing.from_directory(str(tmp_path), "ES256", "2026-01").active.kid == (
+            "2026-01"
+        )
+
+    def test_key_ring_rejects_bad_configuration(self, tmp_path):
+        """Test that missing keys and unsupported algorithms are reported."""
+        with pytest.raises(ValueError, match="No signing keys"):
+            KeyRing.from_directory(str(tmp_path), "RS256")
+        with pytest.raises(ValueError, match="Signing algorithm"):
+            KeyRing.from_directory(str(tmp_path), "HS256")
+        with pytest.raises(ValueError, match="not loaded"):
+            KeyRing({self.old_key.kid: self.old_key}, "missing")
+
+
+class TestTokenRevocationList:
+    """Tests for TokenRevocationList."""
+
+    def setup_method(self):
+        """Setup method called before each test."""
+        self.revocation_list = TokenRevocationList(sync_interval_seconds=5)
+        self.future = datetime.now(timezone.utc) + timedelta(minutes=30)
+
+    def test_revoke_and_check(self):
+        """Test revoking a token ID."""
+        self.revocation_list.revoke("jti-1", self.future)
+
+        assert self.revocation_list.is_revoked("jti-1") is True
+        assert self.revocation_list.is_revoked("jti-2") is False
+        assert self.revocation_list.is_revoked(None) is False
+        assert self.revocation_list.stats()["rejections"] == 1
+
+    def test_prune_drops_expired_revocations(self):
+        """Test that revocations of expired tokens are forgotten."""
+        past = datetime.now(timezone.utc) - timedelta(minutes=1)
+        self.revocation_list.revoke("expired", past)
+        self.revocation_list.revoke("active", self.future)
+
+        self.revocation_list.prune(datetime.now(timezone.utc))
+
+        assert len(self.revocation_list) == 1
+        assert self.revocation_list.is_revoked("active") is True
+
+    async def test_sync_is_incremental(self):
+        """Test that sync loads everything once and then only newer revocations."""
+        revoked_at = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+        repository = AsyncMock()
+        repository.list_active.return_value = [
+            RevokedToken("jti-1", UserId.generate(), self.future, revoked_at)
+        ]
+
+        loaded = await self.revocation_list.sync(repository)
+        await self.revocation_list.sync(repository)
+
+        assert loaded == 1
+        assert self.revocation_list.is_revoked("jti-1") is True
+        first_call, second_call = repository.list_active.call_args_list
+        assert first_call.kwargs["revoked_since"] is None
+        assert second_call.kwargs["revoked_since"] == revoked_at - timedelta(seconds=5)
+
+
+class TestAdmissionController:
+    """Tests for AdmissionController."""
+
+    async def test_admits_within_capacity(self):
+        """Test that work within the concurrency limit is admitted."""
+        controller = AdmissionController(max_concurrent=2, max_waiting=0)
+
+        async with controller.admit():
+            assert controller.stats()["active"] == 1
+
+        stats = controller.stats()
+        assert stats["active"] == 0
+        assert stats["admitted"] == 1
+        assert stats["rejected"] == 0
+
+    async def test_sheds_when_queue_is_full(self):
+        """Test that callers are rejected at once when no slot or queue space is free."""
+        controller = AdmissionController(max_concurrent=1, max_waiting=0)
+
+        async with controller.admit():
+            with pytest.raises(AdmissionRejectedError) as exc_info:
+                async with controller.admit():
+                    pass
+
+        assert exc_info.value.retry_after >= 1
+        assert controller.stats()["rejected"] == 1
+
+    async def test_sheds_after_max_wait(self):
+        """Test that queued callers give up once the wait budget is spent."""
+        controller = AdmissionController(
+            max_concurrent=1, max_waiting=1, max_wait_seconds=0.01
+        )
+
+        async with controller.admit():
+            with pytest.raises(AdmissionRejectedError):
+                async with controller.admit():
+                    pass
+
+        assert controller.stats()["queue_depth"] == 0
+        assert controller.stats()["rejected"] == 1
+
+    async def test_queued_caller_is_admitted_when_slot_frees(self):
+        """Test that a queued caller runs once the active one finishes."""
+        controller = AdmissionController(max_concurrent=1, max_waiting=1)
+        release = asyncio.Event()
+
+        async def hold():
+            async with controller.admit():
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+
+        async def queued():
+            async with controller.admit():
+                return True
+
+        waiter = asyncio.create_task(queued())
+        await asyncio.sleep(0)
+        assert controller.stats()["queue_depth"] == 1
+
+        release.set()
+        assert await waiter is True
+        await holder
+        assert controller.stats()["admitted"] == 2
+
+    def test_invalid_limits_rejected(self):
+        """Test that nonsensical limits are rejected."""
+        with pytest.raises(ValueError):
+            AdmissionController(max_concurrent=0, max_waiting=1)
+        with pytest.raises(ValueError):
+            AdmissionController(max_concurrent=1, max_waiting=-1)
@@ -0,0 +1,135 @@
+"""
+Unit tests for infrastructure caches.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from domain.entities.user import User
+from domain.value_objects.email import Email
+from infrastructure.auth.principal_cache import PrincipalCache
+from infrastructure.cache.ttl_cache import TTLCache
+
+
+class TestTTLCache:
+    """Tests for TTLCache."""
+
+    def test_get_missing_counts_miss(self):
+        """Test that a lookup of an unknown key is a miss."""
+        cache = TTLCache(max_size=2, ttl_seconds=10)
+
+        assert cache.get("missing") is None
+        assert cache.misses == 1
+        assert cache.hits == 0
+
+    def test_set_and_get_counts_hit(self):
+        """Test that a stored value is returned and counted as a hit."""
+        cache = TTLCache(max_size=2, ttl_seconds=10)
+        cache.set("key", "value")
+
+        assert cache.get("key") == "value"
+        assert cache.hits == 1
+        assert cache.hit_rate == 1.0
+
+    def test_entries_expire(self):
+        """Test that entries are dropped once their TTL has passed."""
+        cache = TTLCache(max_size=2, ttl_seconds=10)
+        with patch("infrastructure.cache.ttl_cache.time.monotonic", return_value=100.0):
+            cache.set("key", "value")
+        with patch("infrastructure.cache.ttl_cache.time.monotonic", return_value=111.0):
+            assert cache.get("key") is None
+        assert len(cache) == 0
+
+    def test_per_entry_ttl_cannot_exceed_default(self):
+        """Test that a per-entry TTL only shortens the default TTL."""
+        cache = TTLCache(max_size=2, ttl_seconds=10)
+        with patch("infrastructure.cache.ttl_cache.time.monotonic", return_value=100.0):
+            cache.set("short", "value", ttl_seconds=1)
+            cache.set("long", "value", ttl_seconds=1000)
+        with patch("infrastructure.cache.ttl_cache.time.monotonic", return_value=105.0):
+            assert cache.get("short") is None
+            assert cache.get("long") == "value"
+        with patch("infrastructure.cache.ttl_cache.time.monotonic", return_value=111.0):
+            assert cache.get("long") is None
+
+    def test_non_positive_ttl_is_not_stored(self):
+        """Test that an already expired entry is not stored."""
+        cache = TTLCache(max_size=2, ttl_seconds=10)
+        cache.set("key", "value", ttl_seconds=0)
+
+        assert len(cache) == 0
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted when full."""
+        cache = TTLCache(max_size=2, ttl_seconds=10)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")  # "b" is now least recently used
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.evictions == 1
+
+    def test_invalidate(self):
+        """Test invalidating a single key."""
+        cache = TTLCache(max_size=2, ttl_seconds=10)
+        cache.set("key", "value")
+        cache.invalidate("key")
+        cache.invalidate("unknown")  # No error for unknown keys
+
+        assert cache.get("key") is None
+
+    def test_invalid_configuration(self):
+        """Test that invalid sizes and TTLs are rejected."""
+        with pytest.raises(ValueError, match="max_size"):
+            TTLCache(max_size=0)
+        with pytest.raises(ValueError, match="ttl_seconds"):
+            TTLCache(ttl_seconds=0)
+
+    def test_stats(self):
+        """Test cache statistics."""
+        cache = TTLCache(max_size=5, ttl_seconds=10)
+        cache.set("key", "value")
+        cache.get("key")
+        cache.get("missing")
+
+        stats = cache.stats()
+
+        assert stats["size"] == 1
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+
+class TestPrincipalCache:
+    """Tests for PrincipalCache."""
+
+    def setup_method(self):
+        """Setup method called before each test."""
+        self.cache = PrincipalCache(max_size=10, ttl_seconds=60)
+        self.user = User.create(Email("test@example.com"), "testuser", "hashed")
+
+    def test_put_and_get_active(self):
+        """Test caching an active user."""
+        self.cache.put(self.user)
+
+        assert self.cache.get_active(self.user.id) is self.user
+
+    def test_put_inactive_user_is_not_cached(self):
+        """Test that inactive users are never cached."""
+        self.cache.put(self.user)
+        self.user.deactivate()
+        self.cache.put(self.user)
+
+        assert len(self.cache) == 0
+
+    def test_deactivated_cached_user_is_dropped(self):
+        """Test that deactivating a cached user evicts it on next lookup."""
+        self.cache.put(self.user)
+        self.user.deactivate()
+
+        assert self.cache.get_active(self.user.id) is None
+        assert len(self.cache) == 0
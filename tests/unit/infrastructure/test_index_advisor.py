@@ -0,0 +1,97 @@
+"""
+Unit tests for the index advisor.
+"""
+
+from infrastructure.database.index_advisor import (
+    PlanFinding,
+    StatementRecorder,
+    find_plan_problems,
+)
+
+
+class TestFindPlanProblems:
+    """Tests for find_plan_problems."""
+
+    def test_index_scan_is_clean(self):
+        """Test that a plan served by an index has no findings."""
+        plan = {
+            "Plan": {
+                "Node Type": "Limit",
+                "Plans": [
+                    {
+                        "Node Type": "Index Scan",
+                        "Relation Name": "tasks",
+                        "Index Name": "ix_tasks_user_created_id",
+                    }
+                ],
+            }
+        }
+
+        assert find_plan_problems("get_page", plan) == []
+
+    def test_reports_nested_sort_and_seq_scan(self):
+        """Test that sorts and sequential scans are found at any depth."""
+        plan = {
+            "Plan": {
+                "Node Type": "Limit",
+                "Plans": [
+                    {
+                        "Node Type": "Sort",
+                        "Sort Key": ["tasks.created_at DESC", "tasks.id DESC"],
+                        "Plans": [{"Node Type": "Seq Scan", "Relation Name": "tasks"}],
+                    }
+                ],
+            }
+        }
+
+        assert find_plan_problems("get_page", plan) == [
+            PlanFinding("get_page", "Sort", "by tasks.created_at DESC, tasks.id DESC"),
+            PlanFinding("get_page", "Seq Scan", "on tasks"),
+        ]
+
+    def test_ranked_steps_only_flag_scans(self):
+        """Test that a relevance sort over index matches can be allowed."""
+        plan = {
+            "Plan": {
+                "Node Type": "Sort",
+                "Sort Key": ["(ts_rank_cd(search_vector, query)) DESC"],
+                "Plans": [
+                    {
+                        "Node Type": "Bitmap Heap Scan",
+                        "Relation Name": "tasks",
+                        "Plans": [
+                            {
+                                "Node Type": "Bitmap Index Scan",
+                                "Index Name": "ix_tasks_user_search_vector",
+                            }
+                        ],
+                    }
+                ],
+            }
+        }
+
+        assert find_plan_problems("search", plan, ("Seq Scan",)) == []
+        assert len(find_plan_problems("search", plan)) == 1
+
+    def test_finding_message(self):
+        """Test that findings print the statement label first."""
+        finding = PlanFinding("UserRepositoryImpl.list_all", "Seq Scan", "on users")
+
+        assert str(finding) == "UserRepositoryImpl.list_all: Seq Scan on users"
+
+
+class TestStatementRecorder:
+    """Tests for StatementRecorder."""
+
+    def test_records_only_labelled_single_statements(self):
+        """Test that statements outside a step and executemany are skipped."""
+        recorder = StatementRecorder()
+
+        recorder(None, None, "SELECT 1", (), None, False)
+        recorder.label = "step"
+        recorder(None, None, "SELECT $1", (2,), None, False)
+        recorder(None, None, "INSERT INTO t VALUES ($1)", [(1,), (2,)], None, True)
+
+        assert [(s.label, s.statement, s.parameters) for s in recorder.statements] == [
+            ("step", "SELECT $1", (2,))
+        ]
@@ -0,0 +1,92 @@
+"""
+Unit tests for pagination cursors.
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from domain.value_objects.task_cursor import TaskCursor, TaskSearchCursor
+from infrastructure.pagination.cursor import CursorCodec
+
+
+class TestCursorCodec:
+    """Tests for CursorCodec."""
+
+    def setup_method(self):
+        """Setup method called before each test."""
+        self.codec = CursorCodec("test-secret")
+        self.cursor = TaskCursor(
+            sort_key=datetime(2026, 3, 1, 12, 30, 15, 123456, tzinfo=timezone.utc),
+            task_id="4f1c7a3e-8b8e-4b8f-9d35-0a2c4b6d8e10",
+            completed=True,
+        )
+
+    def test_round_trip(self):
+        """Test that a cursor decodes to the same position."""
+        assert self.codec.decode(self.codec.encode(self.cursor)) == self.cursor
+
+    @pytest.mark.parametrize("completed", [None, True, False])
+    def test_round_trip_keeps_filter(self, completed):
+        """Test that the listing filter survives encoding."""
+        cursor = TaskCursor(self.cursor.sort_key, self.cursor.task_id, completed)
+
+        assert self.codec.decode(self.codec.encode(cursor)).completed is completed
+
+    def test_round_trip_title_cursor(self):
+        """Test that title cursors keep the sort and any separator in the key."""
+        cursor = TaskCursor("Q3 | budget", self.cursor.task_id, sort="title")
+
+        decoded = self.codec.decode(self.codec.encode(cursor))
+
+        assert decoded == cursor
+        assert decoded.sort == "title"
+
+    def test_cursor_is_opaque(self):
+        """Test that the encoded cursor does not expose the raw position."""
+        token = self.codec.encode(self.cursor)
+
+        assert self.cursor.task_id not in token
+        assert "2026" not in token
+
+    def test_tampered_cursor_rejected(self):
+        """Test that a modified payload fails signature verification."""
+        other = TaskCursor(self.cursor.sort_key, "another-id", True)
+        payload = self.codec.encode(other).split(".")[0]
+        signature = self.codec.encode(self.cursor).split(".")[1]
+
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            self.codec.decode(f"{payload}.{signature}")
+
+    def test_cursor_from_other_key_rejected(self):
+        """Test that cursors signed with another secret are rejected."""
+        token = CursorCodec("other-secret").encode(self.cursor)
+
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            self.codec.decode(token)
+
+    @pytest.mark.parametrize("token", ["", "garbage", "a.b.c", "!!!.???"])
+    def test_malformed_cursor_rejected(self, token):
+        """Test that malformed cursors raise ValueError."""
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            self.codec.decode(token)
+
+    def test_search_cursor_round_trip(self):
+        """Test that a search cursor keeps its exact rank."""
+        cursor = TaskSearchCursor.after(0.1 + 0.2, self.cursor.task_id, "invoice")
+
+        decoded = self.codec.decode_search(self.codec.encode_search(cursor))
+
+        assert decoded == cursor
+        assert decoded.matches("invoice")
+
+    def test_cursor_kinds_are_not_interchangeable(self):
+        """Test that listing and search cursors are rejected by the other."""
+        search_token = self.codec.encode_search(
+            TaskSearchCursor.after(0.5, self.cursor.task_id, "invoice")
+        )
+
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            self.codec.decode(search_token)
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            self.codec.decode_search(self.codec.encode(self.cursor))
@@ -0,0 +1,142 @@
+"""
+Unit tests for read replica routing.
+"""
+
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from infrastructure.database.models import TaskModel
+from infrastructure.database.replicas import (
+    ReplicaPool,
+    RoutingSession,
+    make_consistency_token,
+    parse_consistency_token,
+)
+
+
+@pytest.fixture
+async def engines():
+    """Primary and two replica engines; nothing connects in these tests."""
+    created = [
+        create_async_engine(f"postgresql+asyncpg://user:secret@{host}/tasks")
+        for host in ("primary", "replica-1", "replica-2")
+    ]
+    yield created
+    for engine in created:
+        await engine.dispose()
+
+
+def mark_healthy(pool, replayed_lsn=0):
+    """Record a successful probe on every replica of the pool."""
+    for replica in pool.replicas:
+        replica.healthy = True
+        replica.replayed_lsn = replayed_lsn
+
+
+class TestReplicaPool:
+    """Tests for ReplicaPool."""
+
+    def test_no_healthy_replica_falls_back_to_primary(self, engines):
+        """Test that unprobed replicas are not used."""
+        pool = ReplicaPool(engines[1:])
+
+        assert pool.choose() is None
+        assert pool.stats()["primary_fallbacks"] == 1
+
+    def test_round_robin_over_healthy_replicas(self, engines):
+        """Test that reads are spread across healthy replicas."""
+        pool = ReplicaPool(engines[1:])
+        mark_healthy(pool)
+
+        chosen = {pool.choose().name for _ in range(4)}
+
+        assert len(chosen) == 2
+        assert all("secret" not in name for name in chosen)
+
+    def test_consistency_token_excludes_lagging_replicas(self, engines):
+        """Test that a recent write keeps reads off replicas that may miss it."""
+        pool = ReplicaPool(engines[1:])
+        mark_healthy(pool, replayed_lsn=1000)
+
+        assert pool.choose(consistency_token=1000) is not None
+        assert pool.choose(consistency_token=1001) is None
+
+    async def test_failed_probe_marks_replica_unhealthy(self, engines):
+        """Test that a replica that cannot be reached is taken out of rotation."""
+        pool = ReplicaPool(engines[1:2], probe_timeout_seconds=0.1)
+        mark_healthy(pool)
+
+        with patch.object(type(engines[1]), "connect", side_effect=OSError("down")):
+            await pool.probe()
+
+        assert pool.replicas[0].healthy is False
+        assert pool.stats()["replicas"][0]["failures"] == 1
+
+
+class TestConsistencyToken:
+    """Tests for consistency token parsing."""
+
+    def test_parse_valid_token(self):
+        """Test parsing a WAL position token."""
+        assert parse_consistency_token("16/B374D848") == (0x16 << 32) + 0xB374D848
+
+    def test_token_round_trip(self):
+        """Test that tokens are written in pg_lsn notation."""
+        lsn = (0x16 << 32) + 0xB374D848
+
+        assert make_consistency_token(lsn) == "16/B374D848"
+        assert parse_consistency_token(make_consistency_token(lsn)) == lsn
+
+    @pytest.mark.parametrize(
+        "value", [None, "", "not-an-lsn", "1700000000.5", "-1/0", "1/100000000"]
+    )
+    def test_malformed_tokens_ignored(self, value):
+        """Test that missing or malformed tokens impose no constraint."""
+        assert parse_consistency_token(value) is None
+
+
+class TestRoutingSession:
+    """Tests for RoutingSession bind selection."""
+
+    def make_session(self, engines, **info):
+        pool = ReplicaPool(engines[1:])
+        mark_healthy(pool)
+        session = RoutingSession(bind=engines[0].sync_engine)
+        session.info.update(replicas=pool, **info)
+        return session
+
+    def test_reads_go_to_one_replica(self, engines):
+        """Test that selects in a session use the same replica."""
+        session = self.make_session(engines)
+        stmt = select(TaskModel)
+
+        first = session.get_bind(clause=stmt)
+        second = session.get_bind(clause=stmt)
+
+        assert first is second
+        assert first is not engines[0].sync_engine
+
+    def test_writes_pin_session_to_primary(self, engines):
+        """Test that after a write every statement goes to the primary."""
+        session = self.make_session(engines)
+
+        write_bind = session.get_bind(clause=update(TaskModel).values(title="x"))
+        read_bind = session.get_bind(clause=select(TaskModel))
+
+        assert write_bind is engines[0].sync_engine
+        assert read_bind is engines[0].sync_engine
+
+    def test_sessions_without_pool_use_primary(self, engines):
+        """Test that routing is opt-in."""
+        session = RoutingSession(bind=engines[0].sync_engine)
+
+        assert session.get_bind(clause=select(TaskModel)) is engines[0].sync_engine
+
+    def test_unsatisfiable_token_uses_primary(self, engines):
+        """Test that a token no replica has caught up with routes to the primary."""
+        session = self.make_session(engines, consistency_token=1)
+
+        assert session.get_bind(clause=select(TaskModel)) is engines[0].sync_engine
@@ -0,0 +1,62 @@
+"""
+Unit tests for the revoked token repository.
+"""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy.orm import Session
+
+from domain.entities.revoked_token import RevokedToken
+from domain.value_objects.user_id import UserId
+from infrastructure.auth.revocation import TokenRevocationList
+from infrastructure.repositories.revoked_token_repository_impl import (
+    RevokedTokenRepositoryImpl,
+)
+
+
+@pytest.fixture
+def revocation_list():
+    """A fresh revocation list in place of the process-wide one."""
+    revocation_list = TokenRevocationList()
+    with patch(
+        "infrastructure.repositories.revoked_token_repository_impl.revocation_list",
+        revocation_list,
+    ):
+        yield revocation_list
+
+
+class TestRevokedTokenRepository:
+    """Tests for RevokedTokenRepositoryImpl."""
+
+    def setup_method(self):
+        """Setup method called before each test."""
+        self.sync_session = Session()
+        self.repository = RevokedTokenRepositoryImpl(
+            AsyncMock(info=self.sync_session.info)
+        )
+        self.token = RevokedToken(
+            "jti-1",
+            UserId.generate(),
+            datetime.now(timezone.utc) + timedelta(minutes=30),
+        )
+
+    async def test_revocation_applies_after_commit(self, revocation_list):
+        """Test that the token is rejected locally once the revocation commits."""
+        await self.repository.add(self.token)
+        assert revocation_list.is_revoked("jti-1") is False
+
+        self.sync_session.commit()
+
+        assert revocation_list.is_revoked("jti-1") is True
+
+    async def test_rolled_back_revocation_not_applied(self, revocation_list):
+        """Test that a revocation whose transaction fails is not applied."""
+        self.sync_session.begin()
+        await self.repository.add(self.token)
+
+        self.sync_session.rollback()
+        self.sync_session.commit()
+
+        assert revocation_list.is_revoked("jti-1") is False
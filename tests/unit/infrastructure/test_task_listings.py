@@ -0,0 +1,50 @@
+"""
+Unit tests for the task listings GET /tasks may run.
+"""
+
+import pytest
+
+from infrastructure.repositories.task_repository_impl import (
+    INDEXED_LISTINGS,
+    check_listing,
+)
+
+
+class TestCheckListing:
+    """Tests for check_listing."""
+
+    @pytest.mark.parametrize("sort, completed", sorted(INDEXED_LISTINGS, key=str))
+    def test_indexed_listings_allowed(self, sort, completed):
+        """Test that every indexed listing is accepted."""
+        check_listing(sort, completed)
+
+    @pytest.mark.parametrize(
+        "sort, completed, message",
+        [
+            ("created_at", True, "Sorting completed tasks by created_at"),
+            ("updated_at", False, "Sorting pending tasks by updated_at"),
+            ("title", True, "Sorting completed tasks by title"),
+        ],
+    )
+    def test_unindexed_listings_rejected(self, sort, completed, message):
+        """Test that listings without a matching index are rejected."""
+        with pytest.raises(ValueError, match=message):
+            check_listing(sort, completed)
+
+    def test_range_filters_on_sort_key_allowed(self):
+        """Test that range filters are accepted with their own sort."""
+        check_listing("created_at", False, ["created_after", "created_before"])
+        check_listing("updated_at", True, ["updated_since"])
+
+    @pytest.mark.parametrize(
+        "sort, range_filter",
+        [
+            ("updated_at", "created_after"),
+            ("title", "created_before"),
+            ("created_at", "updated_since"),
+        ],
+    )
+    def test_range_filters_on_other_keys_rejected(self, sort, range_filter):
+        """Test that a range filter cannot be combined with another sort."""
+        with pytest.raises(ValueError, match=f"{range_filter} requires sort="):
+            check_listing(sort, None, [range_filter])
@@ -0,0 +1,42 @@
+"""
+Unit tests for LIKE pattern helpers.
+"""
+
+import pytest
+
+from infrastructure.database.text_match import contains_pattern, trigram_pattern
+
+
+class TestContainsPattern:
+    """Tests for contains_pattern."""
+
+    def test_wraps_fragment(self):
+        """Test that plain text matches anywhere in the value."""
+        assert contains_pattern("alice") == "%alice%"
+
+    @pytest.mark.parametrize(
+        "fragment, expected",
+        [
+            ("50%", "%50\\%%"),
+            ("user_1", "%user\\_1%"),
+            ("a\\b", "%a\\\\b%"),
+        ],
+    )
+    def test_escapes_wildcards(self, fragment, expected):
+        """Test that wildcards and the escape character match literally."""
+        assert contains_pattern(fragment) == expected
+
+
+class TestTrigramPattern:
+    """Tests for trigram_pattern."""
+
+    @pytest.mark.parametrize("fragment", ["ali", "ave 50%", "user_123"])
+    def test_accepts_indexable_fragments(self, fragment):
+        """Test that fragments with a trigram get a contains pattern."""
+        assert trigram_pattern(fragment) == contains_pattern(fragment)
+
+    @pytest.mark.parametrize("fragment", ["", "al", "50%", "a_b_c", "on 5"])
+    def test_rejects_fragments_without_trigrams(self, fragment):
+        """Test that fragments no trigram index can serve are rejected."""
+        with pytest.raises(ValueError, match="at least 3 letters or digits"):
+            trigram_pattern(fragment)
@@ -0,0 +1,69 @@
+"""
+Unit tests for the consistency token middleware.
+"""
+
+from presentation.middleware.consistency import ConsistencyTokenMiddleware
+
+
+def make_app(token=None, status=200, events=None):
+    """An app whose session dependency has committed before it responds,
+    followed by background work."""
+
+    async def app(scope, receive, send):
+        if token is not None:
+            scope.setdefault("state", {})["consistency_token"] = token
+        await send({"type": "http.response.start", "status": status, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+        if events is not None:
+            events.append("background")
+
+    return app
+
+
+async def call(app, method, events=None):
+    """Run the middleware around an app and collect what it sends."""
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+        if events is not None:
+            events.append(message["type"])
+
+    scope = {"type": "http", "method": method, "headers": []}
+    await ConsistencyTokenMiddleware(app)(scope, None, send)
+    return sent
+
+
+class TestConsistencyTokenMiddleware:
+    """Tests for ConsistencyTokenMiddleware."""
+
+    async def test_write_stamped(self):
+        """Test that a committed write carries the token."""
+        sent = await call(make_app("16/B374D848"), "POST")
+
+        assert (b"x-consistency-token", b"16/B374D848") in sent[0]["headers"]
+        assert sent[1]["body"] == b"{}"
+
+    async def test_response_not_held_for_background_work(self):
+        """Test that the response is sent before work that follows it."""
+        events = []
+
+        await call(make_app("16/B374D848", events=events), "POST", events)
+
+        assert events == [
+            "http.response.start",
+            "http.response.body",
+            "background",
+        ]
+
+    async def test_failed_write_not_stamped(self):
+        """Test that error responses carry no token."""
+        sent = await call(make_app("16/B374D848", status=400), "POST")
+
+        assert sent[0]["headers"] == []
+
+    async def test_reads_pass_through(self):
+        """Test that safe methods are not stamped."""
+        sent = await call(make_app("16/B374D848"), "GET")
+
+        assert sent[0]["headers"] == []
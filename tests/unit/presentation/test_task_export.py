@@ -0,0 +1,85 @@
+"""
+Unit tests for task export formats.
+"""
+
+import csv
+import io
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from application.dto.task_dto import TaskResponseDTO
+from presentation.api.task_export import CsvExportFormat, NdjsonExportFormat
+
+
+def make_task(**kwargs) -> TaskResponseDTO:
+    fields = {
+        "id": "4f1c7a3e-8b8e-4b8f-9d35-0a2c4b6d8e10",
+        "title": "Write report",
+        "description": None,
+        "completed": False,
+        "created_at": datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc),
+        "updated_at": None,
+    }
+    fields.update(kwargs)
+    return TaskResponseDTO(**fields)
+
+
+class TestNdjsonExportFormat:
+    """Tests for NdjsonExportFormat."""
+
+    def test_one_json_object_per_line(self):
+        """Test that each task is written as its own JSON line."""
+        chunk = NdjsonExportFormat().chunk(
+            [make_task(), make_task(title="Second", completed=True)]
+        )
+
+        lines = chunk.decode().splitlines()
+        assert [json.loads(line)["title"] for line in lines] == [
+            "Write report",
+            "Second",
+        ]
+        assert chunk.endswith(b"\n")
+
+    def test_no_header(self):
+        """Test that NDJSON exports start straight with the rows."""
+        assert NdjsonExportFormat().header() == b""
+
+
+class TestCsvExportFormat:
+    """Tests for CsvExportFormat."""
+
+    def test_header_lists_fields(self):
+        """Test the CSV header row."""
+        assert CsvExportFormat().header() == (
+            b"id,title,description,completed,created_at,updated_at\n"
+        )
+
+    def test_row_values(self):
+        """Test that values are quoted and nulls left empty."""
+        chunk = CsvExportFormat().chunk(
+            [make_task(description='Say "hi", then leave', completed=True)]
+        )
+
+        assert chunk.decode() == (
+            "4f1c7a3e-8b8e-4b8f-9d35-0a2c4b6d8e10,Write report,"
+            '"Say ""hi"", then leave",true,2026-03-01T12:00:00Z,\n'
+        )
+
+    @pytest.mark.parametrize(
+        "title",
+        ["=HYPERLINK(1)", "@SUM(1)", "\t=1+1", "-2+3+cmd|' /C calc'!A0", "+SUM(1)"],
+    )
+    def test_formulas_are_neutralized(self, title):
+        """Test that cells a spreadsheet would evaluate are escaped."""
+        chunk = CsvExportFormat().chunk([make_task(title=title)])
+
+        assert next(csv.reader(io.StringIO(chunk.decode())))[1] == f"'{title}"
+
+    @pytest.mark.parametrize("title", ["-5 items", "+12", "- buy milk", "-1.5"])
+    def test_signed_values_kept(self, title):
+        """Test that numbers and text starting with a sign export unchanged."""
+        chunk = CsvExportFormat().chunk([make_task(title=title)])
+
+        assert next(csv.reader(io.StringIO(chunk.decode())))[1] == title
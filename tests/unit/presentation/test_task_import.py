@@ -0,0 +1,160 @@
+"""
+Unit tests for streamed task imports.
+"""
+
+import pytest
+
+from domain.value_objects.user_id import UserId
+from presentation.api.task_import import (
+    ImportReport,
+    ParsedRow,
+    _csv_records,
+    iter_lines,
+    parse_csv,
+    parse_ndjson,
+    task_from_row,
+)
+
+
+async def chunked(data: bytes, size: int = 5):
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+async def parse(parser, data: bytes):
+    return [row async for row in parser(iter_lines(chunked(data)))]
+
+
+class TestIterLines:
+    """Tests for iter_lines."""
+
+    async def test_lines_split_across_chunks(self):
+        """Test that lines and multi-byte characters survive chunk borders."""
+        lines = [line async for line in iter_lines(chunked("é1\r\nü2\nlast".encode()))]
+
+        assert lines == ["é1", "ü2", "last"]
+
+    @pytest.mark.parametrize("data", [b"x" * 40, b"short\n" + b"x" * 40 + b"\nok\n"])
+    async def test_long_line_rejected(self, data):
+        """Test that a line over the limit raises instead of being buffered."""
+        with pytest.raises(ValueError, match="at most 16 characters"):
+            [line async for line in iter_lines(chunked(data), max_length=16)]
+
+    async def test_invalid_utf8_rejected(self):
+        """Test that a body that is not UTF-8 raises ValueError."""
+        with pytest.raises(ValueError):
+            [line async for line in iter_lines(chunked(b"\xff\xfe\n"))]
+
+
+class TestParseNdjson:
+    """Tests for parse_ndjson."""
+
+    async def test_rows_numbered_by_line(self):
+        """Test that rows and errors carry their line numbers."""
+        rows = await parse(parse_ndjson, b'{"title": "A"}\n\nnot json\n[1]\n')
+
+        assert rows == [
+            ParsedRow(1, {"title": "A"}),
+            ParsedRow(3, error="Invalid JSON"),
+            ParsedRow(4, error="Expected a JSON object"),
+        ]
+
+
+class TestParseCsv:
+    """Tests for parse_csv."""
+
+    async def test_quoted_fields_span_lines(self):
+        """Test that quoted newlines and quotes stay within one record."""
+        rows = await parse(
+            parse_csv, b'title,description\nA,"two\nlines, ""quoted"""\nB,\n'
+        )
+
+        assert rows == [
+            ParsedRow(1, {"title": "A", "description": 'two\nlines, "quoted"'}),
+            ParsedRow(2, {"title": "B", "description": ""}),
+        ]
+
+    async def test_quote_inside_unquoted_field(self):
+        """Test that a quote within an unquoted value does not join records."""
+        rows = await parse(parse_csv, b'title,description\nNails,5" nail\nB,\n')
+
+        assert rows == [
+            ParsedRow(1, {"title": "Nails", "description": '5" nail'}),
+            ParsedRow(2, {"title": "B", "description": ""}),
+        ]
+
+    async def test_unterminated_record_limited(self):
+        """Test that an open quoted field cannot swallow the rest of the body."""
+        lines = iter_lines(chunked(b'title\n"open\n' + b"row\n" * 20))
+
+        with pytest.raises(ValueError, match="at most 32 characters"):
+            [record async for record in _csv_records(lines, max_length=32)]
+
+    async def test_extra_columns_reported(self):
+        """Test that a row wider than the header is reported."""
+        rows = await parse(parse_csv, b"title\nA,B\n")
+
+        assert rows == [ParsedRow(1, error="Row has more columns than the header")]
+
+    async def test_unterminated_quote_reported(self):
+        """Test that an unterminated quote at the end is reported."""
+        rows = await parse(parse_csv, b'title\n"A\n')
+
+        assert rows[0].error.startswith("Invalid CSV")
+
+    async def test_header_requires_title(self):
+        """Test that a header without a title column rejects the body."""
+        with pytest.raises(ValueError, match="title column"):
+            await parse(parse_csv, b"name\nA\n")
+
+
+class TestTaskFromRow:
+    """Tests for task_from_row."""
+
+    def setup_method(self):
+        """Setup method called before each test."""
+        self.user_id = UserId.generate()
+
+    def test_builds_task_with_task_rules(self):
+        """Test that rows are normalized like Task.create does."""
+        task = task_from_row(
+            self.user_id,
+            ParsedRow(1, {"title": "  Title ", "description": "", "completed": "true"}),
+        )
+
+        assert task.title == "Title"
+        assert task.description is None
+        assert task.completed is True
+        assert task.user_id == self.user_id
+
+    @pytest.mark.parametrize(
+        "fields, error",
+        [
+            ({"title": "  "}, "Task title cannot be empty"),
+            ({"title": 3}, "Task title must be a string"),
+            ({"title": "A", "completed": "maybe"}, "must be true or false"),
+        ],
+    )
+    def test_invalid_rows_rejected(self, fields, error):
+        """Test that invalid rows raise ValueError with the reason."""
+        with pytest.raises(ValueError, match=error):
+            task_from_row(self.user_id, ParsedRow(1, fields))
+
+    def test_parse_error_raised(self):
+        """Test that a row that failed to parse raises its error."""
+        with pytest.raises(ValueError, match="Invalid JSON"):
+            task_from_row(self.user_id, ParsedRow(1, error="Invalid JSON"))
+
+
+class TestImportReport:
+    """Tests for ImportReport."""
+
+    def test_errors_capped_but_counted(self):
+        """Test that only the first errors are kept while all are counted."""
+        report = ImportReport(max_errors=2)
+
+        for row in range(1, 5):
+            report.add_error(row, "bad")
+
+        assert report.error_count == 4
+        assert [error["row"] for error in report.errors] == [1, 2]